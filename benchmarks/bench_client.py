@@ -0,0 +1,252 @@
+"""
+End-to-end benchmark of `Client` against a local fake App Store Connect server.
+
+The fake server (`fake_asc_server.py`) runs in its own process so that its
+threads and memory do not count towards the client's. Every stage is run
+untraced for its wall time and then once more under `tracemalloc` for its
+peak Python memory. Reported per stage:
+
+- `seconds`, `rows`, `rows_per_second` and `mib_per_second` (segment bytes),
+- `requests` and `bytes` served per endpoint (from the server's counters),
+- `tracemalloc_peak_mib` (Python allocations of the stage only),
+- `rss_mib` after the stage and `max_rss_mib` of the process so far,
+- with `--metrics`, the client's `RunStats` summary of the timed run
+  (time per download / decompress / parse / deduplicate stage).
+
+Results are written as JSON (`--output`) and can be compared with an earlier
+run (`--compare`) to spot regressions across versions.
+
+Usage:
+    python benchmarks/bench_client.py [--rows 10000] [--columns 14] [--days 30]
+        [--segments 1] [--latency 0.0] [--workers 1] [--metadata-workers 1]
+        [--transport requests|httpx] [--stages discovery,get_data,iter_data,reviews]
+        [--repeat 1] [--log-level WARNING] [--metrics] [--output results.json] [--compare baseline.json]
+"""
+import argparse
+import datetime
+import gc
+import json
+import logging
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from urllib.request import urlopen
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from bench_credentials import generate_pem  # noqa: E402
+from surquest.utils.appstoreconnect.credentials import Credentials  # noqa: E402
+from surquest.utils.appstoreconnect.analyticsreports.client import Client  # noqa: E402
+from surquest.utils.appstoreconnect.analyticsreports.connection import ConnectionSettings  # noqa: E402
+from surquest.utils.appstoreconnect.analyticsreports.enums.granularity import Granularity  # noqa: E402
+from surquest.utils.appstoreconnect.analyticsreports.enums.report_name import ReportName  # noqa: E402
+from surquest.utils.appstoreconnect.analyticsreports.logger import logger  # noqa: E402
+from surquest.utils.appstoreconnect.analyticsreports.metrics import RunStats  # noqa: E402
+
+
+APP_ID = "950949627"
+REPORT_NAME = ReportName.APP_STORE_INSTALLATION_AND_DELETION_STANDARD
+
+STAGES = {
+    "discovery": lambda client: len(
+        client._discover_segments(APP_ID, REPORT_NAME, Granularity.DAILY, None, "ONGOING")
+    ),
+    "get_data": lambda client: len(client.get_data(APP_ID, REPORT_NAME)),
+    "iter_data": lambda client: sum(1 for _ in client.iter_data(APP_ID, REPORT_NAME)),
+    "reviews": lambda client: len(client.fetch_customer_reviews(APP_ID)),
+}
+
+
+class FakeServerProcess:
+    """Runs `fake_asc_server.py` in a child process."""
+
+    def __init__(self, args: argparse.Namespace):
+        command = [
+            sys.executable, str(ROOT / "benchmarks" / "fake_asc_server.py"),
+            "--rows", str(args.rows), "--columns", str(args.columns), "--days", str(args.days),
+            "--segments", str(args.segments), "--latency", str(args.latency),
+            "--page-size", str(args.page_size), "--reviews", str(args.reviews),
+        ]
+        self.process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+        self.base_url = self.process.stdout.readline().strip()
+        if not self.base_url:
+            raise RuntimeError("The fake App Store Connect server did not start.")
+        self.root = self.base_url[: -len("/v1")]
+
+    def call(self, path: str) -> dict:
+        with urlopen(f"{self.root}{path}") as response:
+            body = response.read()
+        return json.loads(body) if body else {}
+
+    def close(self) -> None:
+        self.process.terminate()
+        self.process.wait()
+
+
+def rss_mib() -> float:
+    """Current resident set size (Linux), falling back to the peak."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * resource.getpagesize() / 1024 ** 2
+    except OSError:
+        return max_rss_mib()
+
+
+def max_rss_mib() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024
+
+
+def create_client(args: argparse.Namespace, base_url: str, metrics: RunStats = None) -> Client:
+    credentials = Credentials(issuer_id="bench-issuer", key_id="BENCHKEYID", private_key=generate_pem())
+    options = {}
+    if args.transport == "httpx":
+        from surquest.utils.appstoreconnect.analyticsreports.transport import HttpxTransport
+
+        options["transport"] = HttpxTransport(ConnectionSettings.for_api(max(10, args.metadata_workers)))
+        options["download_transport"] = HttpxTransport(ConnectionSettings.for_downloads(max(10, args.workers)))
+    return Client(
+        credentials,
+        max_workers=args.workers,
+        max_metadata_workers=args.metadata_workers,
+        base_url=base_url,
+        metrics=metrics,
+        **options,
+    )
+
+
+def run_stage(name: str, args: argparse.Namespace, server: FakeServerProcess) -> dict:
+    stage = STAGES[name]
+    stats = RunStats() if args.metrics else None
+    client = create_client(args, server.base_url, stats)
+
+    seconds = None
+    for _ in range(args.repeat):
+        if stats is not None:
+            stats.reset()
+        server.call("/__reset")
+        gc.collect()
+        started = time.perf_counter()
+        rows = stage(client)
+        elapsed = time.perf_counter() - started
+        seconds = elapsed if seconds is None else min(seconds, elapsed)
+        served = server.call("/__stats")
+        summary = stats.summary() if stats is not None else None
+
+    gc.collect()
+    tracemalloc.start()
+    stage(client)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    client.close()
+
+    downloaded = served["bytes"].get("download", 0)
+    result = {
+        "seconds": round(seconds, 4),
+        "rows": rows,
+        "rows_per_second": round(rows / seconds, 1) if seconds else None,
+        "mib_per_second": round(downloaded / 1024 ** 2 / seconds, 2) if seconds else None,
+        "requests": served["requests"],
+        "total_requests": sum(served["requests"].values()),
+        "bytes": served["bytes"],
+        "tracemalloc_peak_mib": round(peak / 1024 ** 2, 2),
+        "rss_mib": round(rss_mib(), 1),
+        "max_rss_mib": round(max_rss_mib(), 1),
+    }
+    if summary is not None:
+        result["metrics"] = summary
+    return result
+
+
+def version() -> dict:
+    try:
+        from importlib.metadata import version as package_version
+
+        package = package_version("surquest-utils-appstoreconnect-analyticsreports")
+    except Exception:
+        package = None
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {"package": package, "commit": commit}
+
+
+def compare(results: dict, baseline_path: str) -> None:
+    baseline = json.loads(Path(baseline_path).read_text())
+    print(f"\ncompared with {baseline_path} ({baseline.get('version', {}).get('commit')}):")
+    for name, stage in results["stages"].items():
+        before = baseline.get("stages", {}).get(name)
+        if not before:
+            continue
+        ratios = []
+        for key in ("seconds", "tracemalloc_peak_mib", "total_requests"):
+            if before.get(key):
+                ratios.append(f"{key}={stage[key] / before[key]:.2f}x")
+        print(f"  {name:<10} " + " ".join(ratios))
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10_000, help="rows per instance")
+    parser.add_argument("--columns", type=int, default=14)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--segments", type=int, default=1, help="segments per instance")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added by the server to every response")
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--reviews", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=1, help="Client max_workers")
+    parser.add_argument("--metadata-workers", type=int, default=1, help="Client max_metadata_workers")
+    parser.add_argument("--transport", choices=("requests", "httpx"), default="requests")
+    parser.add_argument("--stages", default=",".join(STAGES))
+    parser.add_argument("--repeat", type=int, default=1, help="timed runs per stage (best is kept)")
+    parser.add_argument("--log-level", default="WARNING", help="client log level (logging costs time per request)")
+    parser.add_argument("--metrics", action="store_true", help="collect the client's RunStats per stage")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="JSON results of an earlier run")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> dict:
+    args = parse_args(argv)
+    logger.setLevel(getattr(logging, args.log_level.upper()))
+    config = {key: value for key, value in vars(args).items() if key not in ("output", "compare")}
+    results = {
+        "benchmark": "client",
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "version": version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": config,
+        "stages": {},
+    }
+    server = FakeServerProcess(args)
+    try:
+        for name in args.stages.split(","):
+            stage = results["stages"][name] = run_stage(name, args, server)
+            print(
+                f"{name:<10} rows={stage['rows']:>9} time={stage['seconds']:8.3f}s "
+                f"rows/s={stage['rows_per_second'] or 0:>11.0f} requests={stage['total_requests']:>5} "
+                f"traced={stage['tracemalloc_peak_mib']:8.1f} MiB rss={stage['rss_mib']:7.1f} MiB"
+            )
+    finally:
+        server.close()
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2) + "\n")
+        print(f"results written to {args.output}")
+    if args.compare:
+        compare(results, args.compare)
+    return results
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
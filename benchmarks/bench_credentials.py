@@ -0,0 +1,51 @@
+"""
+Micro-benchmark comparing JWT signing with a PEM string against a pre-parsed EC key.
+
+Usage:
+    python benchmarks/bench_credentials.py [iterations]
+"""
+import sys
+import timeit
+from pathlib import Path
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from surquest.utils.appstoreconnect.credentials import Credentials  # noqa: E402
+
+
+PAYLOAD = {"iss": "bench-issuer", "iat": 0, "exp": 1200, "aud": "appstoreconnect-v1"}
+HEADERS = {"alg": "ES256", "kid": "BENCHKEYID", "typ": "JWT"}
+
+
+def generate_pem() -> str:
+    key = ec.generate_private_key(ec.SECP256R1())
+    return key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode("utf-8")
+
+
+def main(iterations: int = 2000) -> None:
+    pem = generate_pem()
+    key = Credentials.load_private_key(pem)
+
+    pem_time = timeit.timeit(
+        lambda: jwt.encode(PAYLOAD, pem, algorithm="ES256", headers=HEADERS), number=iterations
+    )
+    key_time = timeit.timeit(
+        lambda: jwt.encode(PAYLOAD, key, algorithm="ES256", headers=HEADERS), number=iterations
+    )
+
+    print(f"iterations:        {iterations}")
+    print(f"PEM string:        {pem_time / iterations * 1e6:8.1f} us/token")
+    print(f"Parsed EC key:     {key_time / iterations * 1e6:8.1f} us/token")
+    print(f"Speedup:           {pem_time / key_time:8.2f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,66 @@
+"""
+Benchmark of the deduplication memory: full row tuples versus fixed-size row digests.
+
+Every row is consumed from the stream and dropped, so the traced peak is the
+memory held by the deduplication keys.
+
+Usage:
+    python benchmarks/bench_dedup.py [rows]
+"""
+import csv
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from surquest.utils.appstoreconnect.analyticsreports.handler import Handler  # noqa: E402
+
+
+TERRITORIES = ["US", "GB", "DE", "CZ", "FR", "JP", "BR", "IN"]
+DEVICES = ["iPhone", "iPad", "Mac", "Apple TV"]
+
+
+def synthetic_rows(count: int):
+    """Rows parsed from generated TSV lines, so every cell is its own string like in a real report."""
+    header = [
+        "date", "app_name", "app_apple_identifier", "territory",
+        "device", "source_info", "counts", "unique_devices",
+    ]
+    lines = (
+        "\t".join((
+            f"2025-07-{n % 28 + 1:02d}", "Benchmark App", "950949627",
+            TERRITORIES[n % len(TERRITORIES)], DEVICES[n % len(DEVICES)],
+            f"https://example.com/campaign/{n}", str(n % 1000), str(n % 97),
+        ))
+        for n in range(count)
+    )
+    rows = (dict(zip(header, row)) for row in csv.reader(lines, delimiter="\t"))
+    return Handler.iter_converted(rows)
+
+
+def measure(count: int, digest_size):
+    tracemalloc.start()
+    started = time.perf_counter()
+    unique = 0
+    for _ in Handler.iter_deduplicated(synthetic_rows(count), digest_size=digest_size):
+        unique += 1
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return unique, elapsed, peak
+
+
+def main(count: int = 200_000) -> None:
+    print(f"rows: {count}")
+    results = {}
+    for label, digest_size in (("tuples", None), ("blake2b-16", 16)):
+        unique, elapsed, peak = measure(count, digest_size)
+        results[label] = peak
+        print(f"{label:<12} unique={unique} time={elapsed:6.2f}s peak={peak / 1024 ** 2:8.1f} MiB")
+    print(f"memory reduction: {results['tuples'] / results['blake2b-16']:.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
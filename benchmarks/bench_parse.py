@@ -0,0 +1,92 @@
+"""
+Benchmark of TSV row parsing: per-row key normalization (the previous parser)
+versus a header normalized once, as dicts and as compact `Row` records, with
+and without interning repeated values through a `ValueDictionary`.
+
+Parse time is measured over a streamed report; memory per row is the traced
+size of all parsed rows held in a list.
+
+Usage:
+    python benchmarks/bench_parse.py [rows]
+"""
+import csv
+import io
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from surquest.utils.appstoreconnect.analyticsreports.client import Client  # noqa: E402
+from surquest.utils.appstoreconnect.analyticsreports.rows import ValueDictionary  # noqa: E402
+
+
+HEADER = [
+    "Date", "App Name", "App Apple Identifier", "Event", "Download Type",
+    "App Version", "Device", "Platform Version", "Source Type", "Source Info",
+    "Page Type", "Territory", "Counts", "Unique Devices",
+]
+
+
+def synthetic_report(count: int) -> str:
+    lines = ["\t".join(HEADER)]
+    for n in range(count):
+        lines.append("\t".join((
+            f"2025-07-{n % 28 + 1:02d}", "Benchmark App", "950949627", "Install",
+            "First-time download", "1.2.3", "iPhone", "iOS 18.5", "App Store search",
+            f"https://example.com/campaign/{n % 5000}", "Store sheet", "US",
+            str(n % 1000), str(n % 97),
+        )))
+    return "\n".join(lines) + "\n"
+
+
+def per_row_normalization(lines):
+    """The parser before header-level normalization."""
+    for row in csv.DictReader(lines, delimiter="\t"):
+        yield {key.lower().replace(" ", "_").replace("-", "_"): value for key, value in row.items()}
+
+
+PARSERS = {
+    "per-row keys": per_row_normalization,
+    "header once": lambda lines: Client._iter_csv_rows(lines, normalize=True),
+    "compact rows": lambda lines: Client._iter_csv_rows(lines, normalize=True, compact=True),
+    "interned": lambda lines: Client._iter_csv_rows(lines, normalize=True, dictionary=ValueDictionary()),
+    "compact+int.": lambda lines: Client._iter_csv_rows(
+        lines, normalize=True, compact=True, dictionary=ValueDictionary()
+    ),
+}
+
+
+def measure_time(parser, text: str) -> float:
+    started = time.perf_counter()
+    for _ in parser(io.StringIO(text)):
+        pass
+    return time.perf_counter() - started
+
+
+def measure_memory(parser, text: str) -> float:
+    lines = io.StringIO(text)
+    tracemalloc.start()
+    rows = list(parser(lines))
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current / len(rows)
+
+
+def main(count: int = 200_000) -> None:
+    text = synthetic_report(count)
+    print(f"rows: {count}, columns: {len(HEADER)}")
+    baseline = None
+    for label, parser in PARSERS.items():
+        elapsed = measure_time(parser, text)
+        per_row = measure_memory(parser, text)
+        baseline = baseline or (elapsed, per_row)
+        print(
+            f"{label:<14} time={elapsed:6.2f}s ({baseline[0] / elapsed:4.1f}x) "
+            f"memory/row={per_row:6.0f} B ({baseline[1] / per_row:4.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,284 @@
+"""
+Local stand-in of the App Store Connect API for benchmarks.
+
+Serves the `analyticsReportRequests -> reports -> instances -> segments`
+graph of any app, paginated customer reviews and synthetic gzipped TSV
+segments (one instance per processing date, `segments` segments each). Every
+response can be delayed by `latency` seconds to imitate a remote host.
+
+`GET /__stats` returns the number of requests and body bytes served per
+endpoint since the last `GET /__reset`.
+
+Usage:
+    python benchmarks/fake_asc_server.py [--port 8080] [--rows 10000] [--columns 14]
+        [--days 30] [--segments 1] [--latency 0.05] [--page-size 50] [--reviews 1000]
+
+The server prints its API root (e.g. `http://127.0.0.1:8080/v1`) on the
+first line of stdout once it accepts connections.
+"""
+import argparse
+import datetime
+import gzip
+import hashlib
+import json
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlparse
+
+
+COLUMNS = [
+    "Date", "App Name", "App Apple Identifier", "Event", "Download Type",
+    "App Version", "Device", "Platform Version", "Source Type", "Source Info",
+    "Page Type", "Territory", "Counts", "Unique Devices",
+]
+TERRITORIES = ["US", "GB", "DE", "CZ", "FR", "JP", "BR", "IN"]
+DEVICES = ["iPhone", "iPad", "Mac", "Apple TV"]
+LAST_DATE = datetime.date(2025, 7, 31)
+
+ROUTES = [
+    ("report_requests", re.compile(r"^/v1/apps/(?P<app_id>[^/]+)/analyticsReportRequests$")),
+    ("reports", re.compile(r"^/v1/analyticsReportRequests/(?P<request_id>[^/]+)/reports$")),
+    ("instances", re.compile(r"^/v1/analyticsReports/(?P<report_id>[^/]+)/instances$")),
+    ("segments", re.compile(r"^/v1/analyticsReportInstances/instance-(?P<day>\d+)/segments$")),
+    ("reviews", re.compile(r"^/v1/apps/(?P<app_id>[^/]+)/customerReviews$")),
+    ("download", re.compile(r"^/download/instance-(?P<day>\d+)/(?P<segment>\d+)\.gz$")),
+]
+
+
+class SyntheticReports:
+    """Deterministic report graph and segment bodies of the fake server."""
+
+    def __init__(
+        self,
+        rows: int = 10_000,
+        columns: int = 14,
+        days: int = 30,
+        segments: int = 1,
+        page_size: int = 50,
+        reviews: int = 1000,
+    ):
+        if rows < 0 or columns < 1 or days < 1 or segments < 1 or page_size < 1:
+            raise ValueError("rows must not be negative, the other sizes must be positive.")
+        self.rows = rows
+        self.columns = columns
+        self.days = days
+        self.segments = segments
+        self.page_size = page_size
+        self.reviews = reviews
+        self._bodies = {}
+        self._lock = threading.Lock()
+
+    @property
+    def header(self):
+        return (COLUMNS + [f"Metric {n}" for n in range(len(COLUMNS), self.columns)])[:self.columns]
+
+    def date(self, day: int) -> str:
+        return (LAST_DATE - datetime.timedelta(days=self.days - 1 - day)).isoformat()
+
+    def segment(self, day: int, segment: int) -> bytes:
+        """Gzipped TSV of one segment, generated on first request and kept in memory."""
+        key = (day, segment)
+        with self._lock:
+            body = self._bodies.get(key)
+        if body is None:
+            body = gzip.compress(self._segment_text(day, segment).encode("utf-8"), compresslevel=6)
+            with self._lock:
+                self._bodies[key] = body
+        return body
+
+    def _segment_text(self, day: int, segment: int) -> str:
+        date = self.date(day)
+        rows = self.rows // self.segments + (segment < self.rows % self.segments)
+        lines = ["\t".join(self.header)]
+        for n in range(segment, segment + rows * self.segments, self.segments):
+            values = [
+                date, "Benchmark App", "950949627", "Install", "First-time download",
+                "1.2.3", DEVICES[n % len(DEVICES)], "iOS 18.5", "App Store search",
+                f"https://example.com/campaign/{n % 5000}", "Store sheet",
+                TERRITORIES[n % len(TERRITORIES)], str(n % 1000), str(n % 97),
+            ]
+            values += [str((n * (column + 1)) % 10_000) for column in range(len(values), self.columns)]
+            lines.append("\t".join(values[:self.columns]))
+        return "\n".join(lines) + "\n"
+
+    def instances(self, report_id: str):
+        return [
+            {
+                "type": "analyticsReportInstances",
+                "id": f"instance-{day}",
+                "attributes": {"granularity": "DAILY", "processingDate": self.date(day)},
+            }
+            for day in range(self.days)
+        ]
+
+    def segment_items(self, base_url: str, day: int):
+        items = []
+        for segment in range(self.segments):
+            body = self.segment(day, segment)
+            items.append({
+                "type": "analyticsReportSegments",
+                "id": f"segment-{day}-{segment}",
+                "attributes": {
+                    "checksum": hashlib.md5(body).hexdigest(),
+                    "sizeInBytes": len(body),
+                    "url": f"{base_url}/download/instance-{day}/{segment}.gz?signature={day}-{segment}",
+                },
+            })
+        return items
+
+    def review_items(self):
+        return [
+            {
+                "type": "customerReviews",
+                "id": f"review-{n}",
+                "attributes": {
+                    "rating": n % 5 + 1,
+                    "title": f"Review {n}",
+                    "body": "Synthetic review body " * 8,
+                    "reviewerNickname": f"reviewer-{n}",
+                    "createdDate": f"{self.date(n % self.days)}T12:00:00-07:00",
+                    "territory": "USA",
+                },
+            }
+            for n in range(self.reviews)
+        ]
+
+
+class FakeAppStoreConnectHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes: without TCP_NODELAY every keep-alive
+    # response would wait for the client's delayed ACK (~40 ms)
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        server = self.server
+        if url.path == "/__stats":
+            return self._send(200, json.dumps(server.snapshot()).encode("utf-8"), "application/json")
+        if url.path == "/__reset":
+            server.reset()
+            return self._send(204, b"")
+
+        for kind, pattern in ROUTES:
+            match = pattern.match(url.path)
+            if match:
+                break
+        else:
+            kind, match = "not_found", None
+
+        if server.latency:
+            time.sleep(server.latency)
+
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        reports = server.reports
+        if kind == "download":
+            body, content_type = reports.segment(int(match["day"]), int(match["segment"])), "application/a-gzip"
+        elif kind == "not_found":
+            body, content_type = b"", "text/plain"
+        else:
+            if kind == "report_requests":
+                items = [{"type": "analyticsReportRequests", "id": "request-0",
+                          "attributes": {"accessType": query.get("filter[accessType]", "ONGOING")}}]
+            elif kind == "reports":
+                items = [{"type": "analyticsReports", "id": "report-0",
+                          "attributes": {"name": query.get("filter[name]", "Synthetic"),
+                                         "category": query.get("filter[category]", "APP_USAGE")}}]
+            elif kind == "instances":
+                items = reports.instances(match["report_id"])
+            elif kind == "segments":
+                items = reports.segment_items(server.root, int(match["day"]))
+            else:
+                items = reports.review_items()
+            body, content_type = self._page(url.path, query, items), "application/json"
+
+        server.record(kind, len(body))
+        self._send(404 if kind == "not_found" else 200, body, content_type)
+
+    def _page(self, path: str, query: dict, items: list) -> bytes:
+        """One page of `items` with a `links.next` cursor like the real API."""
+        size = min(int(query.get("limit", self.server.reports.page_size)), 200)
+        start = int(query.get("cursor", 0))
+        links = {"self": f"{self.server.root}{path}?{urlencode(query)}"}
+        if start + size < len(items):
+            links["next"] = f"{self.server.root}{path}?{urlencode(dict(query, cursor=start + size))}"
+        return json.dumps({"data": items[start:start + size], "links": links}).encode("utf-8")
+
+    def _send(self, status: int, body: bytes, content_type: str = "text/plain"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("X-Rate-Limit", "user-hour-lim:1000000;user-hour-rem:1000000;")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class FakeAppStoreConnect(ThreadingHTTPServer):
+    """Threaded HTTP server serving `SyntheticReports`, optionally with latency."""
+
+    daemon_threads = True
+
+    def __init__(self, reports: SyntheticReports, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0):
+        super().__init__((host, port), FakeAppStoreConnectHandler)
+        self.reports = reports
+        self.latency = latency
+        self.root = f"http://{host}:{self.server_port}"
+        self._counts = Counter()
+        self._bytes = Counter()
+        self._stats_lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        """API root to pass to `Client(base_url=...)`."""
+        return f"{self.root}/v1"
+
+    def record(self, kind: str, size: int) -> None:
+        with self._stats_lock:
+            self._counts[kind] += 1
+            self._bytes[kind] += size
+
+    def snapshot(self) -> dict:
+        with self._stats_lock:
+            return {"requests": dict(self._counts), "bytes": dict(self._bytes)}
+
+    def reset(self) -> None:
+        with self._stats_lock:
+            self._counts.clear()
+            self._bytes.clear()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--rows", type=int, default=10_000, help="rows per instance (split across its segments)")
+    parser.add_argument("--columns", type=int, default=14)
+    parser.add_argument("--days", type=int, default=30, help="instances (processing dates) per report")
+    parser.add_argument("--segments", type=int, default=1, help="segments per instance")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--reviews", type=int, default=1000)
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    reports = SyntheticReports(args.rows, args.columns, args.days, args.segments, args.page_size, args.reviews)
+    server = FakeAppStoreConnect(reports, args.host, args.port, args.latency)
+    print(server.base_url, flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
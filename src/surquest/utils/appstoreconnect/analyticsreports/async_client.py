@@ -0,0 +1,461 @@
+import queue
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from ..credentials import Credentials
+from .client import APIClientError, Client
+from .enums.category import Category
+from .enums.granularity import Granularity
+from .enums.report_name import ReportName
+from .errors import IncompleteListingError, NoValidUrlsError
+from .handler import Handler
+from .logger import logger
+from .rate_limit import RateLimiter
+from .schemas import SchemaRegistry
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - optional dependency
+    aiohttp = None
+
+
+class AsyncClient:
+    """
+    asyncio counterpart of `Client` built on aiohttp.
+
+    Metadata requests and segment downloads run concurrently, bounded by one
+    semaphore of `max_concurrency` requests. Tokens come from the same
+    `Credentials.get_token` cache, API requests are paced by the `RateLimiter`
+    shared with synchronous clients of the same credentials (waiting for it
+    does not hold a slot of the semaphore), and segments are decompressed and
+    parsed by the `Client` parser on a thread pool of `max_concurrency`
+    workers while they download, so the event loop is not blocked. At most
+    `PARSE_QUEUE_CHUNKS` downloaded chunks wait for the parser; a download
+    waits when its parser falls behind. Results match `Client`: `get_data`
+    keeps the newest segment per date and deduplicates like
+    `Handler.deduplicate_data`.
+
+    Use it as an async context manager (or call `close`) to release connections.
+    """
+
+    BASE_URL = Client.BASE_URL
+    DOWNLOAD_CHUNK_SIZE = Client.DOWNLOAD_CHUNK_SIZE
+    PARSE_QUEUE_CHUNKS = 4
+    RETRY_STATUSES = (500, 502, 503, 504)
+    MAX_RETRIES = 3
+
+    def __init__(
+        self,
+        credentials: Credentials,
+        max_concurrency: int = 64,
+        base_url: Optional[str] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        api_timeout: float = 60.0,
+        download_timeout: float = 300.0,
+    ):
+        """
+        Initializes the client; the HTTP session is created on first use.
+
+        Args:
+            credentials (Credentials): Credentials providing `get_token`.
+            max_concurrency (int): Maximum number of requests in flight.
+            base_url (Optional[str]): API root, `BASE_URL` by default (e.g. a local stand-in).
+            rate_limiter (Optional[RateLimiter]): Paces API requests, shared per credentials by default.
+            api_timeout (float): Total seconds allowed per API request.
+            download_timeout (float): Total seconds allowed per segment download.
+        """
+        if aiohttp is None:
+            raise ImportError(
+                "aiohttp is required for AsyncClient: "
+                "pip install surquest-utils-appstoreconnect-analyticsreports[async]"
+            )
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be a positive integer.")
+        self.credentials = credentials
+        self.max_concurrency = max_concurrency
+        self.base_url = (base_url or self.BASE_URL).rstrip("/")
+        self.rate_limiter = rate_limiter or RateLimiter.shared(credentials)
+        self.api_timeout = api_timeout
+        self.download_timeout = download_timeout
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._session: Optional["aiohttp.ClientSession"] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    async def __aenter__(self) -> "AsyncClient":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Closes the HTTP session and the parser threads."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _get_session(self) -> "aiohttp.ClientSession":
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_concurrency)
+            )
+        return self._session
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # One parser thread per download that can be in flight
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency)
+        return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # Created on first use, inside the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    def _get_headers(self) -> Dict[str, str]:
+        """Generates the authorization headers for API requests."""
+        token = self.credentials.get_token()
+        return {
+            "Authorization": f"Bearer {token}",
+            "Content-Type": "application/json",
+        }
+
+    async def _get_request(
+        self, url: str, params: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Performs a GET request and returns JSON response or None."""
+        logger.debug(f"GET {url} | Params: {params}")
+        timeout = aiohttp.ClientTimeout(total=self.api_timeout)
+        try:
+            for attempt in range(self.MAX_RETRIES + 1):
+                # Requests waiting for the rate limiter must not hold a concurrency slot
+                await asyncio.sleep(self.rate_limiter.reserve())
+                async with self._get_semaphore():
+                    async with self._get_session().get(
+                        url, headers=self._get_headers(), params=params, timeout=timeout
+                    ) as response:
+                        self.rate_limiter.update(response.headers, response.status)
+                        status = response.status
+                        retry = status == 429 or status in self.RETRY_STATUSES
+                        if not retry or attempt == self.MAX_RETRIES:
+                            if status >= 400:
+                                logger.error(f"HTTP Error: {status} - {await response.text()}")
+                                return None
+                            return await response.json(content_type=None)
+                if status != 429:
+                    await asyncio.sleep(2 ** attempt)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Request Error: {e}")
+        return None
+
+    async def _paginate(
+        self, resource_path: str, params: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Handles pagination and returns full list of data items.
+
+        Like `Client._paginate`, a failing later page raises
+        `IncompleteListingError` instead of returning a partial listing.
+        """
+        results = []
+        url = f"{self.base_url}/{resource_path}"
+        pages = 0
+        while url:
+            response = await self._get_request(url, params)
+            if not response:
+                if pages:
+                    raise IncompleteListingError(
+                        f"Page {pages + 1} of {resource_path} failed after {len(results)} items."
+                    )
+                break
+            pages += 1
+            if "data" in response:
+                results.extend(response["data"])
+            url = response.get("links", {}).get("next")
+            params = None  # subsequent pages include params in URL
+        return results
+
+    # ----------------- Public API Methods -----------------
+
+    async def read_report_requests(
+        self,
+        app_id: str,
+        access_type: str = "ONGOING",
+        params: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        params = dict(params or {})
+        params["filter[accessType]"] = access_type
+        return await self._paginate(f"apps/{app_id}/analyticsReportRequests", params)
+
+    async def read_report_for_specific_request(
+        self, request_id: str, params: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        return await self._paginate(f"analyticsReportRequests/{request_id}/reports", params)
+
+    async def read_list_of_instances_of_report(
+        self, report_id: str, params: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        return await self._paginate(f"analyticsReports/{report_id}/instances", params)
+
+    async def read_segments_for_report(
+        self, instance_id: str, params: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        return await self._paginate(f"analyticsReportInstances/{instance_id}/segments", params)
+
+    async def list_reports(
+        self,
+        app_id: str,
+        category: Optional[Category] = None,
+        report_name: Optional[ReportName] = None,
+        access_type: str = "ONGOING",
+    ) -> List[Dict[str, Any]]:
+        query_params = {}
+        if category:
+            query_params["filter[category]"] = category.value
+        if report_name:
+            query_params["filter[name]"] = report_name.value
+
+        report_requests = await self.read_report_requests(app_id=app_id, access_type=access_type)
+        report_ids = Handler.extract_ids(report_requests)
+        if not report_ids:
+            raise APIClientError(f"No report requests found for app: {app_id}")
+
+        listings = await asyncio.gather(*(
+            self.read_report_for_specific_request(request_id, params=query_params)
+            for request_id in report_ids
+        ))
+        return [report for listing in listings for report in listing]
+
+    async def list_report_dates(
+        self,
+        report_name: ReportName,
+        app_id: Optional[str] = None,
+        report_ids: Optional[List[str]] = None,
+        granularity: Granularity = Granularity.DAILY,
+    ) -> List[str]:
+        if not app_id and not report_ids:
+            raise APIClientError("Either 'app_id' or 'report_ids' must be provided.")
+
+        if not report_ids:
+            response = await self.list_reports(
+                app_id=app_id, report_name=report_name, category=report_name.category
+            )
+            report_ids = Handler.extract_ids(response)
+
+        instances = await self._list_instances(report_ids, granularity)
+        return Client._instance_dates(instances)
+
+    async def download_report_to_dicts(
+        self, report_url: str, normalize: bool = True
+    ) -> Optional[List[Dict[str, str]]]:
+        """
+        Downloads a gzipped CSV report and parses it into a list of dictionaries.
+
+        Chunks are handed to a parser thread as they arrive, which decompresses
+        and parses them while the download continues; the download waits while
+        `PARSE_QUEUE_CHUNKS` chunks are queued.
+        """
+        timeout = aiohttp.ClientTimeout(total=self.download_timeout)
+        loop = asyncio.get_running_loop()
+        chunks: "queue.Queue[Optional[bytes]]" = queue.Queue(maxsize=self.PARSE_QUEUE_CHUNKS)
+        parsing: Optional[Future] = None
+        try:
+            async with self._get_semaphore():
+                # Segment URLs are pre-signed: no Authorization header on the download host
+                async with self._get_session().get(
+                    report_url, headers={"Accept-Encoding": "gzip"}, timeout=timeout
+                ) as response:
+                    response.raise_for_status()
+                    parsing = self._get_executor().submit(
+                        self._parse_chunks, iter(chunks.get, None), normalize
+                    )
+                    try:
+                        async for chunk in response.content.iter_chunked(self.DOWNLOAD_CHUNK_SIZE):
+                            if not await self._put_chunk(loop, chunks, chunk, parsing):
+                                break  # the parser failed, its error is raised below
+                    finally:
+                        # ends the parser, also when the download fails
+                        await self._put_chunk(loop, chunks, None, parsing)
+            return await asyncio.wrap_future(parsing)
+        except Exception:
+            logger.exception("Failed to download or parse report")
+            return None
+
+    @staticmethod
+    async def _put_chunk(
+        loop: asyncio.AbstractEventLoop, chunks: queue.Queue, chunk: Optional[bytes], parsing: Future
+    ) -> bool:
+        """Queues a chunk for the parser, waiting in a thread while the queue is full."""
+        try:
+            chunks.put_nowait(chunk)
+            return True
+        except queue.Full:
+            return await loop.run_in_executor(None, AsyncClient._put_while_parsing, chunks, chunk, parsing)
+
+    @staticmethod
+    def _put_while_parsing(chunks: queue.Queue, chunk: Optional[bytes], parsing: Future) -> bool:
+        # Gives up once the parser has stopped, so a failed parse cannot block the download
+        while not parsing.done():
+            try:
+                chunks.put(chunk, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    @staticmethod
+    def _parse_chunks(chunks: Iterable[bytes], normalize: bool) -> List[Dict[str, str]]:
+        return list(Client._iter_csv_rows(Client._iter_decompressed_lines(chunks), normalize))
+
+    async def get_data(
+        self,
+        app_id: str,
+        report_name: ReportName,
+        granularity: Granularity = Granularity.DAILY,
+        dates: Optional[Set[str]] = None,
+        access_type: str = "ONGOING",
+        convert_types: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """Async counterpart of `Client.get_data`; all segments are downloaded concurrently."""
+        segments = await self._discover_segments(app_id, report_name, granularity, dates, access_type)
+        logger.info(f"Fetching for {len(segments.keys())} segments.")
+
+        downloads = await asyncio.gather(*(
+            self.download_report_to_dicts(segment["url"]) for segment in segments.values()
+        ))
+
+        data: List[Dict[str, Any]] = []
+        date_slices: Dict[str, List[Dict[str, Any]]] = {}
+        for url_key, segment_data in zip(segments, downloads):  # older are processed before newer
+            logger.info(f"Count of rows: {len(segment_data or [])}")
+            if access_type == "ONGOING":
+                if segment_data:
+                    date_slices.update(Handler.group_by(segment_data, "date"))
+                logger.info(f"Data processed for url: {url_key}")
+            else:
+                data.extend(segment_data)
+        del downloads
+
+        for data_slice in date_slices.values():
+            data.extend(data_slice)
+
+        return Handler.deduplicate_data(
+            data,
+            convert_types=convert_types,
+            column_types=SchemaRegistry.get(report_name),
+        )
+
+    async def fetch_customer_reviews(
+        self,
+        app_id: str,
+        last_known_customer_review_id: Optional[str] = None,
+        params: Optional[Dict[str, Any]] = None,
+        max_iterations: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Async counterpart of `Client.fetch_customer_reviews` (pages are followed sequentially)."""
+        results = []
+        seen_ids = set()
+        found_last_known = False
+        iterations = 0
+
+        query_params = {
+            "limit": 200,
+            "sort": "-createdDate",
+            "include": "response",
+            "fields[customerReviewResponses]": "responseBody,lastModifiedDate,state,review",
+            "fields[customerReviews]": "rating,title,body,reviewerNickname,createdDate,territory,response",
+        }
+        if params:
+            query_params.update(params)
+
+        url = f"{self.base_url}/apps/{app_id}/customerReviews"
+
+        while url and not found_last_known:
+            if max_iterations is not None and iterations >= max_iterations:
+                logger.info(f"Reached max iteration limit: {max_iterations}")
+                break
+
+            response = await self._get_request(url, query_params)
+            if not response:
+                break
+
+            results, seen_ids, found_last_known = Handler.get_customer_reviews(
+                api_response_payload=response,
+                app_id=app_id,
+                results=results,
+                seen_ids=seen_ids,
+                last_known_customer_review_id=last_known_customer_review_id,
+            )
+
+            url = response.get("links", {}).get("next")
+            query_params = None  # Only pass params on the first request
+            iterations += 1
+
+        return results
+
+    # ----------------- Helper Methods -----------------
+
+    async def _discover_segments(
+        self,
+        app_id: str,
+        report_name: ReportName,
+        granularity: Granularity,
+        dates: Optional[Set[str]],
+        access_type: str,
+    ) -> dict:
+        reports = await self.list_reports(
+            app_id, category=report_name.category, report_name=report_name, access_type=access_type
+        )
+        report_ids = Handler.extract_ids(reports)
+        instances = await self._list_instances(report_ids, granularity)
+        if not dates:
+            dates = Client._instance_dates(instances)
+        instance_ids = Client._select_instance_ids(instances, dates)
+        return await self._fetch_segments(instance_ids)
+
+    async def _list_instances(
+        self, report_ids: List[str], granularity: Granularity
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Lists all instances of every report concurrently."""
+        listings = await asyncio.gather(*(
+            self.read_list_of_instances_of_report(
+                report_id, params={"filter[granularity]": granularity.value}
+            )
+            for report_id in report_ids
+        ))
+        instances: Dict[str, List[Dict[str, Any]]] = {}
+        for report_id, listing in zip(report_ids, listings):
+            if not listing:
+                raise APIClientError(f"No instances found for report: {report_id}")
+            instances[report_id] = listing
+        return instances
+
+    async def _fetch_segments(self, instance_ids: List[str]) -> dict:
+        """Returns the attributes (url, checksum, size) of all segments keyed by unsigned URL."""
+        async def fetch(instance_id: str) -> List[Dict[str, Any]]:
+            try:
+                segments = await self.read_segments_for_report(instance_id)
+                with_urls = [
+                    attributes
+                    for attributes in Handler.extract_attribute_values(segments)
+                    if attributes.get("url")
+                ]
+                if not with_urls:
+                    raise NoValidUrlsError("No valid `url` found in the payload.")
+                return with_urls
+            except Exception as e:
+                logger.warning(e)
+                return []
+
+        segments: dict = {}
+        for instance_segments in await asyncio.gather(*(fetch(instance_id) for instance_id in instance_ids)):
+            for segment in instance_segments:
+                segments[segment["url"].split("?")[0]] = segment
+
+        if not segments:
+            raise ValueError("No segments URL available")
+        return segments
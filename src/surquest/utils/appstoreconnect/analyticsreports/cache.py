@@ -0,0 +1,138 @@
+import json
+import time
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional
+
+from .logger import logger
+
+
+class MetadataCache:
+    """
+    Persistent SQLite cache for App Store Connect report metadata.
+
+    Listings are stored per level (`report_requests`, `reports`, `instances`,
+    `segments`) under a key built from the resource path and query parameters.
+    Each level has its own time-to-live in seconds; `None` means the entry
+    never expires.
+
+    Segment metadata of a processed instance never changes, so segment entries
+    are kept forever. Their download URLs are signed and expire, so the client
+    only uses them as the index of its `SegmentStore` (to skip listing
+    instances whose segments are all stored) and lists segments fresh otherwise.
+    """
+
+    LEVELS = ("report_requests", "reports", "instances", "segments")
+
+    DEFAULT_TTLS: Dict[str, Optional[float]] = {
+        "report_requests": 24 * 60 * 60,
+        "reports": 24 * 60 * 60,
+        "instances": 60 * 60,
+        "segments": None,
+    }
+
+    def __init__(
+        self,
+        path: str,
+        ttls: Optional[Dict[str, Optional[float]]] = None,
+    ):
+        """
+        Opens (and creates if needed) the cache database.
+
+        Args:
+            path (str): Path to the SQLite file (`:memory:` for a process local cache).
+            ttls (Optional[Dict[str, Optional[float]]]): Per level TTL overrides in seconds.
+        """
+        unknown = set(ttls or {}) - set(self.LEVELS)
+        if unknown:
+            raise ValueError(f"Unknown cache levels: {sorted(unknown)}. Use one of: {list(self.LEVELS)}")
+
+        self.path = path
+        self.ttls = {**self.DEFAULT_TTLS, **(ttls or {})}
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS metadata (
+                    level TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    PRIMARY KEY (level, key)
+                )
+                """
+            )
+
+    @staticmethod
+    def make_key(resource_path: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Builds a stable cache key from a resource path and its query parameters."""
+        return f"{resource_path}?{json.dumps(params or {}, sort_keys=True)}"
+
+    def get(
+        self, level: str, key: str, max_age: Optional[float] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Returns a cached listing or None when it is missing or expired.
+
+        Args:
+            level (str): Cache level of the entry.
+            key (str): Entry key (see `make_key`).
+            max_age (Optional[float]): Maximal age in seconds, overrides the level TTL.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value, fetched_at FROM metadata WHERE level = ? AND key = ?",
+                (level, key),
+            ).fetchone()
+        if row is None:
+            return None
+
+        value, fetched_at = row
+        ttl = max_age if max_age is not None else self.ttls[level]
+        if ttl is not None and time.time() - fetched_at > ttl:
+            logger.debug(f"Cache expired: {level} | {key}")
+            return None
+        logger.debug(f"Cache hit: {level} | {key}")
+        return json.loads(value)
+
+    def set(self, level: str, key: str, value: List[Dict[str, Any]]) -> None:
+        """Stores a listing, replacing any previous entry."""
+        if level not in self.LEVELS:
+            raise ValueError(f"Unknown cache level '{level}'. Use one of: {list(self.LEVELS)}")
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO metadata (level, key, value, fetched_at) VALUES (?, ?, ?, ?)",
+                (level, key, json.dumps(value), time.time()),
+            )
+
+    def invalidate(self, level: Optional[str] = None, key: Optional[str] = None) -> None:
+        """Removes one entry, a whole level, or everything when called without arguments."""
+        query, args = "DELETE FROM metadata", []
+        if level is not None:
+            query, args = query + " WHERE level = ?", [level]
+            if key is not None:
+                query, args = query + " AND key = ?", args + [key]
+        with self._lock, self._connection:
+            self._connection.execute(query, args)
+
+    def prune(self) -> int:
+        """Deletes expired entries and returns how many were removed."""
+        removed = 0
+        now = time.time()
+        with self._lock, self._connection:
+            for level, ttl in self.ttls.items():
+                if ttl is None:
+                    continue
+                cursor = self._connection.execute(
+                    "DELETE FROM metadata WHERE level = ? AND fetched_at < ?",
+                    (level, now - ttl),
+                )
+                removed += cursor.rowcount
+        return removed
+
+    def close(self) -> None:
+        """Closes the underlying database connection."""
+        with self._lock:
+            self._connection.close()
@@ -1,18 +1,34 @@
 import requests
 import warnings
-from typing import Dict, Any, Optional, List, Set
+import os
+import json
+import tempfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Set, Iterable, Iterator, Callable
 import csv
-import gzip
 import io
+import zlib
+import codecs
+import time
+from contextlib import nullcontext
 
 from ..credentials import Credentials
 from .handler import Handler
+from .rows import Header, Row, ValueDictionary
+from .cache import MetadataCache
+from .connection import ConnectionSettings
+from .rate_limit import RateLimiter
+from .metrics import Metrics, TimedIterator
+from .transport import Transport
+from .segment_store import SegmentStore
+from .state import SyncState
+from .schemas import SchemaRegistry
 from .enums.category import Category
 from .enums.granularity import Granularity
 from .enums.report_name import ReportName
+from .errors import IncompleteListingError, NoValidUrlsError
 from .logger import logger
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 
 
 class APIClientError(Exception):
@@ -27,39 +43,144 @@ class Client:
     """
 
     BASE_URL = "https://api.appstoreconnect.apple.com/v1"
+    DOWNLOAD_CHUNK_SIZE = 64 * 1024
 
-    def __init__(self, credentials: Credentials):
+    DEFAULT_POOL_SIZE = 10
+    RATE_LIMIT_RETRIES = 3
+
+    def __init__(
+        self,
+        credentials: Credentials,
+        max_workers: int = 1,
+        max_metadata_workers: int = 1,
+        cache: Optional[MetadataCache] = None,
+        segment_store: Optional[SegmentStore] = None,
+        value_dictionary: Optional[ValueDictionary] = None,
+        api_settings: Optional[ConnectionSettings] = None,
+        download_settings: Optional[ConnectionSettings] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        transport: Optional[Transport] = None,
+        download_transport: Optional[Transport] = None,
+        base_url: Optional[str] = None,
+        metrics: Optional[Metrics] = None,
+    ):
         """
         Initializes the API client.
 
         Args:
             credentials (Credentials): An instance of a credentials class
-                                       that provides a `generate_token` method.
+                                       that provides a `get_token` method.
+            max_workers (int): Number of segments `get_data` downloads in parallel.
+                               The download connection pool is sized to match. Defaults to 1.
+            max_metadata_workers (int): Number of concurrent metadata requests (reports,
+                                        instances and segments lookups). The API connection
+                                        pool is sized to match. Defaults to 1.
+            cache (Optional[MetadataCache]): Persistent cache for report requests, reports,
+                                             instances and segments listings. Disabled by default.
+            segment_store (Optional[SegmentStore]): Local store of downloaded segments keyed by
+                                                    checksum; stored segments skip the network.
+            value_dictionary (Optional[ValueDictionary]): Interns repeated values of downloaded
+                                                          reports per column. Disabled by default.
+            api_settings (Optional[ConnectionSettings]): Pool, timeouts and retries of the API host.
+            download_settings (Optional[ConnectionSettings]): Pool, timeouts and retries of the
+                                                              segment download host.
+            rate_limiter (Optional[RateLimiter]): Paces API requests; by default one limiter
+                                                  is shared by all clients of the same credentials.
+            transport (Optional[Transport]): HTTP transport of the API calls (e.g. `HttpxTransport`
+                                             or an offline fake). Defaults to a `requests` session
+                                             built from `api_settings`.
+            download_transport (Optional[Transport]): HTTP transport of the segment downloads.
+                                                      Defaults to `transport.derive(download_settings)`
+                                                      when `transport` is given, else to a `requests`
+                                                      session built from `download_settings`.
+            base_url (Optional[str]): API root, `BASE_URL` by default (e.g. a local stand-in).
+            metrics (Optional[Metrics]): Receives counters and timings of requests, segments
+                                         and stages (e.g. `RunStats`). Disabled by default.
         """
+        if max_workers < 1 or max_metadata_workers < 1:
+            raise ValueError("max_workers and max_metadata_workers must be positive integers.")
         self.credentials = credentials
-        self.session = requests.Session()
+        self.base_url = (base_url or self.BASE_URL).rstrip("/")
+        self.max_workers = max_workers
+        self.max_metadata_workers = max_metadata_workers
+        self.cache = cache
+        self.segment_store = segment_store
+        self.value_dictionary = value_dictionary
+        self.metrics = metrics
+        self.api_settings = api_settings or ConnectionSettings.for_api(
+            max(self.DEFAULT_POOL_SIZE, max_metadata_workers)
+        )
+        self.download_settings = download_settings or ConnectionSettings.for_downloads(
+            max(self.DEFAULT_POOL_SIZE, max_workers)
+        )
+        self.rate_limiter = rate_limiter or RateLimiter.shared(credentials)
+        self.transport = transport
+        if download_transport is None and transport is not None:
+            download_transport = transport.derive(self.download_settings)
+        self.download_transport = download_transport
         self._configure_retries()
         logger.info("Initialized Client with provided credentials")
 
     def _configure_retries(self):
-        """Configures retries for HTTP requests to handle transient errors."""
-        retry_strategy = Retry(
-            total=3,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["GET"],
-        )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        self.session.mount("https://", adapter)
+        """
+        Creates the HTTP sessions with their pools and retries for transient errors.
+
+        `session` serves the authenticated API calls, `download_session` the
+        segment downloads; the latter never carries the `Authorization` header.
+        Transports passed to the constructor are used as they are.
+        """
+        self.session = self.transport or self.api_settings.create_session()
+        self.download_session = self.download_transport or self.download_settings.create_session()
+
+    def close(self) -> None:
+        """Closes the HTTP sessions."""
+        self.session.close()
+        if self.download_session is not self.session:
+            self.download_session.close()
 
     def _get_headers(self) -> Dict[str, str]:
         """Generates the authorization headers for API requests."""
-        token = self.credentials.generate_token()
+        token = self.credentials.get_token()
         return {
             "Authorization": f"Bearer {token}",
             "Content-Type": "application/json",
         }
 
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Sends an API request paced by the rate limiter.
+
+        Every response updates the limiter from its rate-limit headers; a 429
+        pauses all requests sharing the limiter and is retried up to
+        `RATE_LIMIT_RETRIES` times.
+        """
+        send = self.session.get if method == "GET" else self.session.post
+        for attempt in range(self.RATE_LIMIT_RETRIES + 1):
+            self.rate_limiter.acquire()
+            started = time.perf_counter()
+            try:
+                response = send(url, timeout=self.api_settings.timeout, **kwargs)
+            except requests.exceptions.RequestException:
+                self._record_request("api", "error", started)
+                raise
+            self._record_request("api", response.status_code, started)
+            self.rate_limiter.update(response.headers, response.status_code)
+            if response.status_code != 429:
+                break
+            logger.warning(f"Rate limited on {url} (attempt {attempt + 1})")
+        return response
+
+    def _record_request(self, host: str, status: Any, started: float) -> None:
+        if self.metrics is not None:
+            self.metrics.observe("http_request_seconds", time.perf_counter() - started, host=host)
+            self.metrics.increment("http_requests", host=host, status=str(status))
+
+    def _stage(self, name: str):
+        """Context manager timing a stage when metrics are enabled."""
+        if self.metrics is None:
+            return nullcontext()
+        return self.metrics.time("stage_seconds", stage=name)
+
     def _get_request(
         self, url: str, params: Optional[Dict[str, Any]] = None
     ) -> Optional[Dict[str, Any]]:
@@ -67,7 +188,7 @@ class Client:
         headers = self._get_headers()
         logger.debug(f"GET {url} | Params: {params}")
         try:
-            response = self.session.get(url, headers=headers, params=params)
+            response = self._send("GET", url, headers=headers, params=params)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.HTTPError as e:
@@ -83,7 +204,7 @@ class Client:
         headers = self._get_headers()
         logger.debug(f"POST {url} | Data: {data}")
         try:
-            response = self.session.post(url, headers=headers, json=data)
+            response = self._send("POST", url, headers=headers, json=data)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.HTTPError as e:
@@ -96,32 +217,85 @@ class Client:
         self, resource_path: str, params: Optional[Dict[str, Any]] = None
     ) -> Optional[Dict[str, Any]]:
         """Builds URL and fetches resource."""
-        return self._get_request(f"{self.BASE_URL}/{resource_path}", params)
+        return self._get_request(f"{self.base_url}/{resource_path}", params)
 
     def _paginate(
         self, resource_path: str, params: Optional[Dict[str, Any]] = None
     ) -> List[Dict[str, Any]]:
-        """Handles pagination and returns full list of data items."""
+        """
+        Handles pagination and returns full list of data items.
+
+        A failing first page returns an empty list (the error is logged); a
+        failing later page raises `IncompleteListingError` instead of returning
+        the items fetched so far as if they were the whole listing.
+        """
         results = []
-        url = f"{self.BASE_URL}/{resource_path}"
+        url = f"{self.base_url}/{resource_path}"
+        pages = 0
         while url:
             response = self._get_request(url, params)
-            if response and "data" in response:
+            if not response:
+                if pages:
+                    raise IncompleteListingError(
+                        f"Page {pages + 1} of {resource_path} failed after {len(results)} items."
+                    )
+                break
+            pages += 1
+            if "data" in response:
                 results.extend(response["data"])
-            if response:
-                url = response.get("links", {}).get("next")
-            else:
-                url = None
+                if self.metrics is not None:
+                    self.metrics.increment("pages")
+            url = response.get("links", {}).get("next")
             params = None  # subsequent pages include params in URL
         return results
 
+    def _paginate_cached(
+        self,
+        level: str,
+        resource_path: str,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Serves a paginated listing from the metadata cache, fetching it on a miss.
+
+        Only complete listings are cached: a listing whose later page fails
+        raises (see `_paginate`) and an empty one may be a failed first page.
+        """
+        if self.cache is None:
+            return self._paginate(resource_path, params)
+
+        key = MetadataCache.make_key(resource_path, params)
+        cached = self.cache.get(level, key)
+        if cached is not None:
+            return cached
+
+        results = self._paginate(resource_path, params)
+        if results:  # empty listings may be failed requests, do not cache them
+            self.cache.set(level, key, results)
+        return results
+
+    def _map_metadata(self, func: Callable[[Any], Any], items: List[Any]) -> List[Any]:
+        """
+        Applies `func` to every item using up to `max_metadata_workers` threads.
+
+        Results are returned in the order of `items`. If calls fail, the exception
+        of the first failing item (in input order) is raised, exactly as a serial
+        loop would raise it.
+        """
+        if self.max_metadata_workers == 1 or len(items) < 2:
+            return [func(item) for item in items]
+        with ThreadPoolExecutor(
+            max_workers=min(self.max_metadata_workers, len(items))
+        ) as executor:
+            return list(executor.map(func, items))
+
     # ----------------- Public API Methods -----------------
 
     def create_reports_request(
         self, app_id: str, access_type: str = "ONGOING" # or ONE_TIME_SNAPSHOT
     ) -> Dict[str, Any]:
 
-        url = f"{self.BASE_URL}/analyticsReportRequests"
+        url = f"{self.base_url}/analyticsReportRequests"
 
         return self._post_request(
             url,
@@ -147,67 +321,202 @@ class Client:
             }
         else:
             params["filter[accessType]"] = access_type
-        return self._paginate(f"apps/{app_id}/analyticsReportRequests", params)
+        return self._paginate_cached(
+            "report_requests", f"apps/{app_id}/analyticsReportRequests", params
+        )
 
     def read_report_for_specific_request(
         self, request_id: str, params: Optional[Dict[str, Any]] = None
     ) -> List[Dict[str, Any]]:
-        return self._paginate(f"analyticsReportRequests/{request_id}/reports", params)
+        return self._paginate_cached(
+            "reports", f"analyticsReportRequests/{request_id}/reports", params
+        )
 
     def read_list_of_instances_of_report(
         self, report_id: str, params: Optional[Dict[str, Any]] = None
     ) -> List[Dict[str, Any]]:
-        return self._paginate(f"analyticsReports/{report_id}/instances", params)
+        return self._paginate_cached(
+            "instances", f"analyticsReports/{report_id}/instances", params
+        )
 
     def read_segments_for_report(
         self, instance_id: str, params: Optional[Dict[str, Any]] = None
     ) -> List[Dict[str, Any]]:
-        return self._paginate(
-            f"analyticsReportInstances/{instance_id}/segments", params
-        )
+        # Always listed fresh: the download URLs are signed and expire
+        return self._paginate(self._segments_path(instance_id), params)
+
+    def iter_report_rows(
+        self,
+        report_url: str,
+        normalize: bool = True,
+        checksum: Optional[str] = None,
+        compact: bool = False,
+        dictionary: Optional[ValueDictionary] = None,
+    ) -> Iterator[Any]:
+        """
+        Streams a gzipped TSV report and yields its rows as dictionaries.
+
+        The response body is decompressed chunk by chunk, so peak memory stays
+        bounded by the chunk size and a single row regardless of the report size.
+        With a `segment_store` and the segment `checksum`, stored segments are read
+        locally and downloaded ones are saved to the store. With `compact`, rows
+        are read-only `Row` records sharing one header (`row.to_dict()` builds a dict).
+        Repeated values are interned through `dictionary` (the client's
+        `value_dictionary` by default).
+        """
+        if dictionary is None:
+            dictionary = self.value_dictionary
+        if self.metrics is None:
+            yield from self._iter_csv_rows(
+                self._iter_gzipped_lines(report_url, checksum), normalize, compact, dictionary
+            )
+            return
+
+        # Each wrapper accumulates the time spent in its stage and the ones below it
+        chunks = TimedIterator(self._iter_segment_chunks(report_url, checksum), sized=True)
+        lines = TimedIterator(self._iter_decompressed_lines(chunks))
+        rows = TimedIterator(self._iter_csv_rows(lines, normalize, compact, dictionary))
+        try:
+            yield from rows
+        finally:
+            self.metrics.increment("segment_bytes", chunks.size)
+            self.metrics.increment("rows_parsed", rows.items)
+            self.metrics.observe("stage_seconds", chunks.seconds, stage="download")
+            self.metrics.observe("stage_seconds", lines.seconds - chunks.seconds, stage="decompress")
+            self.metrics.observe("stage_seconds", rows.seconds - lines.seconds, stage="parse")
 
     def download_report_to_dicts(
-        self, report_url: str, normalize: bool = True
+        self, report_url: str, normalize: bool = True, checksum: Optional[str] = None
     ) -> Optional[List[Dict[str, str]]]:
         """Downloads a gzipped CSV report and parses it into a list of dictionaries."""
         try:
-            csv_content = self._download_gzipped_csv(report_url)
-            data = self._parse_csv_to_dicts(csv_content, normalize)
-            out = []
-            for item in data:
-                # item.update({"url": report_url})
-                out.append(item)
-            return out
+            return list(self.iter_report_rows(report_url, normalize, checksum))
         except Exception:
             logger.exception("Failed to download or parse report")
             return None
 
     # ----------------- Helper Methods -----------------
 
-    def _download_gzipped_csv(self, url: str) -> str:
-        """Downloads gzipped CSV and returns as string."""
-        response = self.session.get(
-            url, headers={"Accept-Encoding": "gzip"}, stream=True
-        )
-        response.raise_for_status()
-        decompressed_content = gzip.decompress(response.content)
-        return decompressed_content.decode("utf-8")
+    def _iter_gzipped_lines(self, url: str, checksum: Optional[str] = None) -> Iterator[str]:
+        """Downloads gzipped CSV and yields its decoded lines as they arrive."""
+        return self._iter_decompressed_lines(self._iter_segment_chunks(url, checksum))
+
+    def _iter_segment_chunks(self, url: str, checksum: Optional[str] = None) -> Iterator[bytes]:
+        """
+        Yields the compressed chunks of a segment, from the local store when it
+        has them. Segments whose checksum the store cannot hold are streamed as-is.
+        """
+        store = self.segment_store
+        if store is not None and not store.accepts(checksum):
+            store = None
+        if store is not None and store.contains(checksum):
+            logger.info(f"Segment {checksum} read from local store")
+            if self.metrics is not None:
+                self.metrics.increment("segments", source="store")
+            yield from store.iter_chunks(checksum, self.DOWNLOAD_CHUNK_SIZE)
+            return
+
+        # Segment URLs are pre-signed: no Authorization header on the download host
+        started = time.perf_counter()
+        try:
+            response = self.download_session.get(
+                url,
+                headers={"Accept-Encoding": "gzip"},
+                stream=True,
+                timeout=self.download_settings.timeout,
+            )
+        except requests.exceptions.RequestException:
+            self._record_request("download", "error", started)
+            raise
+        self._record_request("download", response.status_code, started)
+        with response:
+            response.raise_for_status()
+            if self.metrics is not None:
+                self.metrics.increment("segments", source="network")
+            chunks = response.iter_content(chunk_size=self.DOWNLOAD_CHUNK_SIZE)
+            if store is not None:
+                chunks = store.write(checksum, chunks)
+            yield from chunks
+
+    @staticmethod
+    def _iter_decompressed_lines(chunks: Iterable[bytes]) -> Iterator[str]:
+        """Incrementally gunzips and decodes byte chunks into lines (line endings kept)."""
+        decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        pending = ""
+        in_member = False
+        for chunk in chunks:
+            while chunk:
+                in_member = True
+                text = decoder.decode(decompressor.decompress(chunk))
+                if decompressor.eof:
+                    # Concatenated gzip members are valid, continue with the next one
+                    chunk = decompressor.unused_data
+                    decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+                    in_member = False
+                else:
+                    chunk = b""
+                if not text:
+                    continue
+                lines = (pending + text).split("\n")
+                pending = lines.pop()
+                for line in lines:
+                    yield line + "\n"
+        if in_member:
+            raise EOFError("Compressed file ended before the end-of-stream marker was reached")
+        pending += decoder.decode(b"", final=True)
+        if pending:
+            yield pending
 
     def _parse_csv_to_dicts(
         self, csv_content: str, normalize: bool
     ) -> List[Dict[str, str]]:
         """Parses CSV content into list of dictionaries."""
-        csv_file = io.StringIO(csv_content)
-        reader = csv.DictReader(csv_file, delimiter="\t")
-        if normalize:
-            return [
-                {
-                    key.lower().replace(" ", "_").replace("-", "_"): value
-                    for key, value in row.items()
-                }
-                for row in reader
-            ]
-        return list(reader)
+        return list(self._iter_csv_rows(io.StringIO(csv_content), normalize))
+
+    @staticmethod
+    def _iter_csv_rows(
+        lines: Iterable[str],
+        normalize: bool,
+        compact: bool = False,
+        dictionary: Optional[ValueDictionary] = None,
+    ) -> Iterator[Any]:
+        """
+        Parses tab separated lines into rows, one row at a time.
+
+        The header is normalized once. Rows are dictionaries (with `csv.DictReader`
+        semantics for short and long rows), or `Row` records sharing one `Header`
+        when `compact` is set (short rows are padded with None, extra cells dropped).
+        With a `dictionary`, repeated values share one string instance per column.
+        """
+        reader = csv.reader(lines, delimiter="\t")
+        names = next(reader, None)
+        if names is None:
+            return
+        header = Header(names, normalize)
+        keys = header.names
+        width = len(keys)
+        lookups = dictionary.lookups(header) if dictionary is not None else None
+
+        for values in reader:
+            if not values:
+                continue
+            if len(values) < width:
+                values = values + [None] * (width - len(values))
+            if lookups:
+                dictionary.intern_values(values, lookups)
+            if len(values) > width:
+                if compact:
+                    values = values[:width]
+                else:
+                    row = dict(zip(keys, values))
+                    row[None] = values[width:]
+                    yield row
+                    continue
+            if compact:
+                yield Row(header, tuple(values))
+            else:
+                yield dict(zip(keys, values))
 
     def list_report_dates(
         self,
@@ -225,19 +534,8 @@ class Client:
             )
             report_ids = Handler.extract_ids(response)
 
-        dates: Set[str] = set()
-        for report_id in report_ids:
-            instances = self.read_list_of_instances_of_report(
-                report_id, params={"filter[granularity]": granularity.value}
-            )
-            if not instances:
-                raise APIClientError(f"No instances found for report: {report_id}")
-            available_dates = Handler.extract_attribute_values(
-                instances, attribute="processingDate"
-            )
-            if available_dates:
-                dates.update(available_dates)
-        return sorted(dates)
+        instances = self._list_instances(report_ids, granularity)
+        return self._instance_dates(instances)
 
     def list_reports(
         self,
@@ -258,10 +556,13 @@ class Client:
             raise APIClientError(f"No report requests found for app: {app_id}")
 
         reports = []
-        for request_id in report_ids:
-            reports.extend(
-                self.read_report_for_specific_request(request_id, params=query_params)
-            )
+        for request_reports in self._map_metadata(
+            lambda request_id: self.read_report_for_specific_request(
+                request_id, params=query_params
+            ),
+            report_ids,
+        ):
+            reports.extend(request_reports)
         return reports
 
     def get_data(
@@ -271,65 +572,176 @@ class Client:
         granularity: Granularity = Granularity.DAILY,
         dates: Optional[Set[str]] = None,
         access_type: str = "ONGOING", # or ONE_TIME_SNAPSHOT
+        convert_types: bool = True,
     ) -> List[Dict[str, str]]:
-        dates = dates or set()
         data: List[Dict[str, str]] = []
 
-        report_ids = self._fetch_report_ids(app_id, report_name, access_type=access_type)
-        
-        if not dates:
-            dates = set(
-                self.list_report_dates(
-                    report_name, report_ids=report_ids, granularity=granularity
-                )
-            )
-
-        instance_ids = self._fetch_instance_ids(report_ids, granularity, dates)
-        urls = self._fetch_segment_urls(instance_ids)
-        segments_data = dict()
+        segments = self._discover_segments(
+            app_id, report_name, granularity, dates, access_type
+        )
         date_slices = dict()
 
-        logger.info(f"Fetching for {len(urls.keys())} segments.")
+        logger.info(f"Fetching for {len(segments.keys())} segments.")
 
-        for url_key, url in urls.items():  # URLs are sorted older are processed before newer
+        # URLs are sorted older are processed before newer; every segment is
+        # bucketed by date in one pass and dropped right after (a newer
+        # segment's bucket replaces the rows of an older one for that date)
+        for url_key, segment_data in self._download_segments(segments):
 
-            logger.info(f"Data downloaded from {url}")            
-            segments_data[url_key] = self.download_report_to_dicts(url)
+            logger.info(f"Count of rows: {len(segment_data or [])}")
 
-            logger.info(f"Count of rows: {len(segments_data[url_key])}")
+            if access_type == "ONGOING":
 
-        if access_type == "ONGOING":
+                if segment_data:
+                    date_slices.update(Handler.group_by(segment_data, "date"))
 
-            for key, segment_data in segments_data.items():
+                logger.info(f"Data processed for url: {url_key}")
 
-                if segment_data:
+            else:
+                data.extend(segment_data)
 
-                    available_dates = Handler.get_distinct_values(
-                        data=segment_data, key="date"
-                    )
+            del segment_data
 
-                    for available_date in available_dates:
+        for data_slice in date_slices.values():
+            data.extend(data_slice)
+        del date_slices
 
-                        data_slice = Handler.filter_list_of_dicts(
-                            data=segment_data,
-                            attribute="date",
-                            value=available_date,
-                            comparator="==",
-                        )
+        with self._stage("deduplicate"):
+            unique_data = Handler.deduplicate_data(
+                data,
+                convert_types=convert_types,
+                column_types=SchemaRegistry.get(report_name),
+            )
+        if self.metrics is not None:
+            self.metrics.increment("dedup_input_rows", len(data))
+            self.metrics.increment("rows_emitted", len(unique_data))
+        return unique_data
 
-                        date_slices[available_date] = data_slice
+    def iter_data(
+        self,
+        app_id: str,
+        report_name: ReportName,
+        granularity: Granularity = Granularity.DAILY,
+        dates: Optional[Set[str]] = None,
+        access_type: str = "ONGOING", # or ONE_TIME_SNAPSHOT
+        batch_size: Optional[int] = None,
+        spool_dir: Optional[str] = None,
+        convert_types: bool = True,
+        digest_size: Optional[int] = None,
+        deduplicate: bool = True,
+    ) -> Iterator[Any]:
+        """
+        Streaming counterpart of `get_data` yielding rows while segments are downloaded.
 
-                logger.info(f"Data processed for url: {key}")
+        The output has the same content and order as `get_data`: values are type
+        converted, duplicates are dropped and for `ONGOING` reports the rows of a
+        date come from the newest segment containing that date. Because a later
+        segment may still replace a date, `ONGOING` rows are spooled to temporary
+        files (one per date) and emitted once all segments are processed, so
+        memory stays constant apart from the deduplication keys.
 
-            for date, data_slice in date_slices.items():
-                data.extend(data_slice)
+        Args:
+            app_id (str): The ID of the app.
+            report_name (ReportName): Report to fetch.
+            granularity (Granularity): Granularity of the report instances.
+            dates (Optional[Set[str]]): Processing dates to fetch, all available dates by default.
+            access_type (str): `ONGOING` or `ONE_TIME_SNAPSHOT`.
+            batch_size (Optional[int]): If set, yield lists of up to `batch_size` rows instead of single rows.
+            spool_dir (Optional[str]): Directory for the temporary per-date files (system default otherwise).
+            convert_types (bool): Convert numeric strings to numbers (column types are inferred once).
+            digest_size (Optional[int]): Deduplicate by fixed-size row digests (e.g. 16 bytes)
+                instead of full rows, cutting the memory of the deduplication keys.
+            deduplicate (bool): Drop duplicated rows. Disable it to deduplicate downstream
+                (e.g. with `ExternalDeduplicator`), so no keys are held in memory here.
+
+        Yields:
+            Dict[str, Any] | List[Dict[str, Any]]: Rows, or batches of rows when `batch_size` is set.
+        """
+        segments = self._discover_segments(
+            app_id, report_name, granularity, dates, access_type
+        )
+        logger.info(f"Streaming {len(segments.keys())} segments.")
 
-        else:
-            
-            for segment_data in segments_data.values():
-                data.extend(segment_data)
+        yield from self._iter_rows(
+            segments, access_type, batch_size, spool_dir, convert_types, report_name,
+            digest_size, deduplicate,
+        )
 
-        return Handler.deduplicate_data(data)
+    def sync_data(
+        self,
+        app_id: str,
+        report_name: ReportName,
+        state: SyncState,
+        granularity: Granularity = Granularity.DAILY,
+        access_type: str = "ONGOING", # or ONE_TIME_SNAPSHOT
+        batch_size: Optional[int] = None,
+        spool_dir: Optional[str] = None,
+        convert_types: bool = True,
+        digest_size: Optional[int] = None,
+    ) -> Iterator[Any]:
+        """
+        Incrementally streams rows of report instances processed since the last sync.
+
+        The watermark (last processing date and the instance ids processed on it)
+        is read from `state` for `(app_id, report_name, granularity, access_type)`.
+        Only instances with a newer processing date, or not yet seen ids on the
+        watermark date, are downloaded. The new watermark is saved once all rows
+        were consumed, so an interrupted sync is repeated on the next run. An
+        instance whose segments cannot be listed or downloaded raises instead of
+        being skipped, so the watermark never moves past missing data.
+
+        Args:
+            app_id (str): The ID of the app.
+            report_name (ReportName): Report to fetch.
+            state (SyncState): Persisted sync watermarks.
+            granularity (Granularity): Granularity of the report instances.
+            access_type (str): `ONGOING` or `ONE_TIME_SNAPSHOT`.
+            batch_size (Optional[int]): If set, yield lists of up to `batch_size` rows instead of single rows.
+            spool_dir (Optional[str]): Directory for the temporary per-date files (system default otherwise).
+            convert_types (bool): Convert numeric strings to numbers (column types are inferred once).
+            digest_size (Optional[int]): Deduplicate by fixed-size row digests (e.g. 16 bytes)
+                instead of full rows, cutting the memory of the deduplication keys.
+
+        Yields:
+            Dict[str, Any] | List[Dict[str, Any]]: Rows, or batches of rows when `batch_size` is set.
+        """
+        key = SyncState.make_key(app_id, report_name, granularity, access_type)
+        watermark = state.get(key)
+        last_date = watermark["last_processing_date"]
+        known_ids = set(watermark["instance_ids"])
+
+        report_ids = self._fetch_report_ids(app_id, report_name, access_type=access_type)
+        instances = self._list_instances(report_ids, granularity)
+
+        new_instances = [
+            (instance["id"], date)
+            for instance, date in self._iter_instances_by_date(instances)
+            if last_date is None
+            or date > last_date
+            or (date == last_date and instance["id"] not in known_ids)
+        ]
+        if not new_instances:
+            logger.info(f"No new instances since {last_date} for {key}")
+            return
+
+        segments = self._fetch_segments(
+            [instance_id for instance_id, _ in new_instances], strict=True
+        )
+        logger.info(
+            f"Syncing {len(new_instances)} new instances ({len(segments.keys())} segments) for {key}"
+        )
+        yield from self._iter_rows(
+            segments, access_type, batch_size, spool_dir, convert_types, report_name,
+            digest_size,
+        )
+
+        new_last_date = max(date for _, date in new_instances)
+        new_ids = {instance_id for instance_id, date in new_instances if date == new_last_date}
+        if new_last_date == last_date:
+            new_ids |= known_ids
+        state.update(key, new_last_date, new_ids)
+        state.save()
+        logger.info(f"Sync watermark for {key} moved to {new_last_date}")
 
     def fetch_customer_reviews(
         self,
@@ -365,7 +777,7 @@ class Client:
         if params:
             query_params.update(params)
 
-        url = f"{self.BASE_URL}/apps/{app_id}/customerReviews"
+        url = f"{self.base_url}/apps/{app_id}/customerReviews"
 
         while url and not found_last_known:
             if max_iterations is not None and iterations >= max_iterations:
@@ -394,46 +806,308 @@ class Client:
 
     # ----------------- Private Steps for get_data -----------------
 
-    def _fetch_report_ids(self, app_id: str, report_name: ReportName, access_type: str = "ONGOING") -> List[str]:
-        reports = self.list_reports(
-            app_id, category=report_name.category, report_name=report_name, access_type=access_type
+    def _discover_segments(
+        self,
+        app_id: str,
+        report_name: ReportName,
+        granularity: Granularity,
+        dates: Optional[Set[str]],
+        access_type: str,
+    ) -> dict:
+        with self._stage("discovery"):
+            report_ids = self._fetch_report_ids(app_id, report_name, access_type=access_type)
+
+            # One listing per report answers both "which dates exist" and
+            # "which instances belong to the requested dates"
+            instances = self._list_instances(report_ids, granularity)
+
+            if not dates:
+                dates = self._instance_dates(instances)
+
+            instance_ids = self._select_instance_ids(instances, dates)
+            return self._fetch_segments(instance_ids)
+
+    def _iter_rows(
+        self,
+        segments: dict,
+        access_type: str,
+        batch_size: Optional[int] = None,
+        spool_dir: Optional[str] = None,
+        convert_types: bool = True,
+        report_name: Optional[ReportName] = None,
+        digest_size: Optional[int] = None,
+        deduplicate: bool = True,
+    ) -> Iterator[Any]:
+        """Streams type converted, deduplicated (unless disabled) rows (or batches) of the segments."""
+        if access_type == "ONGOING":
+            rows = self._iter_latest_rows_per_date(segments, spool_dir)
+        else:
+            rows = self._iter_segments_rows(segments)
+
+        if convert_types:
+            rows = Handler.iter_converted(
+                rows, column_types=SchemaRegistry.get(report_name) if report_name else None
+            )
+        if deduplicate:
+            if self.metrics is not None:
+                rows = self._iter_counted(rows, "dedup_input_rows")
+            rows = Handler.iter_deduplicated(rows, digest_size=digest_size)
+        if self.metrics is not None:
+            rows = self._iter_counted(rows, "rows_emitted")
+        if batch_size:
+            yield from Handler.batched(rows, batch_size)
+        else:
+            yield from rows
+
+    def _iter_counted(self, rows: Iterable[Any], name: str) -> Iterator[Any]:
+        """Passes rows through, adding their number to the `name` counter once they are consumed."""
+        count = 0
+        try:
+            for row in rows:
+                count += 1
+                yield row
+        finally:
+            self.metrics.increment(name, count)
+
+    def _download_segment(self, segment: Dict[str, Any]) -> Optional[List[Dict[str, str]]]:
+        return self.download_report_to_dicts(
+            segment["url"], checksum=segment.get("checksum")
         )
-        return Handler.extract_ids(reports)
+
+    def _iter_segment(self, segment: Dict[str, Any]) -> Iterator[Dict[str, str]]:
+        return self.iter_report_rows(segment["url"], checksum=segment.get("checksum"))
+
+    def _download_segments(self, segments: dict) -> Iterator[tuple]:
+        """
+        Downloads segments, in parallel when `max_workers` > 1.
+
+        Results are yielded as `(url_key, rows)` pairs in the original URL order
+        regardless of which download finishes first. At most `max_workers`
+        segments are submitted ahead of the one being yielded, so finished
+        segments waiting for an earlier one stay bounded.
+        """
+        if self.max_workers == 1 or len(segments) < 2:
+            for url_key, segment in segments.items():
+                logger.info(f"Data downloaded from {segment['url']}")
+                yield url_key, self._download_segment(segment)
+            return
+
+        pending = iter(segments.items())
+        in_flight: deque = deque()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            def submit_next() -> None:
+                item = next(pending, None)
+                if item is not None:
+                    in_flight.append((*item, executor.submit(self._download_segment, item[1])))
+
+            for _ in range(self.max_workers):
+                submit_next()
+            while in_flight:
+                url_key, segment, future = in_flight.popleft()
+                segment_data = future.result()
+                submit_next()
+                logger.info(f"Data downloaded from {segment['url']}")
+                yield url_key, segment_data
+                del segment_data  # not kept while the next segment downloads
+
+    def _iter_segments_rows(self, segments: dict) -> Iterator[Dict[str, str]]:
+        """Streams the rows of all segments in URL order."""
+        for url_key, segment in segments.items():
+            logger.info(f"Streaming data from {segment['url']}")
+            yield from self._iter_segment(segment)
+
+    def _iter_latest_rows_per_date(
+        self, segments: dict, spool_dir: Optional[str] = None
+    ) -> Iterator[Dict[str, str]]:
+        """
+        Streams rows keeping, for every date, only the rows of the newest segment.
+
+        Each segment is split into one temporary JSON Lines file per date; a later
+        segment containing the same date replaces the earlier file. Dates are
+        emitted in order of their first appearance.
+        """
+        with tempfile.TemporaryDirectory(dir=spool_dir) as spool:
+            date_files: Dict[str, str] = {}
+
+            for index, (url_key, segment) in enumerate(segments.items()):  # older are processed before newer
+                logger.info(f"Streaming data from {segment['url']}")
+                segment_files: Dict[str, str] = {}
+                handles: Dict[str, Any] = {}
+                try:
+                    for row in self._iter_segment(segment):
+                        date = row.get("date")
+                        if date is None:
+                            continue
+                        handle = handles.get(date)
+                        if handle is None:
+                            path = os.path.join(spool, f"{index}-{len(handles)}.jsonl")
+                            handle = handles[date] = open(path, "w", encoding="utf-8")
+                            segment_files[date] = path
+                        handle.write(json.dumps(row, ensure_ascii=False) + "\n")
+                finally:
+                    for handle in handles.values():
+                        handle.close()
+
+                for date, path in segment_files.items():
+                    if date in date_files:
+                        os.remove(date_files[date])
+                    date_files[date] = path
+
+                logger.info(f"Data processed for url: {url_key}")
+
+            for path in date_files.values():
+                with open(path, encoding="utf-8") as f:
+                    for line in f:
+                        yield json.loads(line)
+                os.remove(path)
+
+    def _fetch_report_ids(self, app_id: str, report_name: ReportName, access_type: str = "ONGOING") -> List[str]:
+        with self._stage("report_ids"):
+            reports = self.list_reports(
+                app_id, category=report_name.category, report_name=report_name, access_type=access_type
+            )
+            return Handler.extract_ids(reports)
 
     def _fetch_instance_ids(
         self, report_ids: List[str], granularity: Granularity, dates: Set[str]
     ) -> List[str]:
+        instances = self._list_instances(report_ids, granularity)
+        return self._select_instance_ids(instances, dates)
+
+    def _list_instances(
+        self, report_ids: List[str], granularity: Granularity
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Lists all instances of every report (one paginated listing per report)."""
+        with self._stage("instances"):
+            listings = self._map_metadata(
+                lambda report_id: self.read_list_of_instances_of_report(
+                    report_id, params={"filter[granularity]": granularity.value}
+                ),
+                report_ids,
+            )
+        instances: Dict[str, List[Dict[str, Any]]] = {}
+        for report_id, listing in zip(report_ids, listings):
+            if not listing:
+                raise APIClientError(f"No instances found for report: {report_id}")
+            instances[report_id] = listing
+        return instances
+
+    @staticmethod
+    def _instance_dates(instances: Dict[str, List[Dict[str, Any]]]) -> List[str]:
+        """Returns the sorted processing dates available across report instances."""
+        dates: Set[str] = set()
+        for listing in instances.values():
+            available_dates = Handler.extract_attribute_values(
+                listing, attribute="processingDate"
+            )
+            if available_dates:
+                dates.update(available_dates)
+        return sorted(dates)
+
+    @staticmethod
+    def _select_instance_ids(
+        instances: Dict[str, List[Dict[str, Any]]], dates: Iterable[str]
+    ) -> List[str]:
+        """
+        Picks the ids of instances processed on the given dates.
+
+        Ids are ordered by report and then by processing date (oldest first).
+        A date without any instance raises `NoValidIdsError`.
+        """
         instance_ids: List[str] = []
-        for report_id in report_ids:
-            for date in dates:
-                instances = self.read_list_of_instances_of_report(
-                    report_id,
-                    params={
-                        "filter[granularity]": granularity.value,
-                        "filter[processingDate]": date,
-                    },
-                )
-                ids = Handler.extract_ids(instances)
-                instance_ids.extend(ids)
+        for listing in instances.values():
+            by_date: Dict[str, List[Dict[str, Any]]] = {}
+            for instance in listing:
+                date = (instance.get("attributes") or {}).get("processingDate")
+                by_date.setdefault(date, []).append(instance)
+            for date in sorted(dates):
+                instance_ids.extend(Handler.extract_ids(by_date.get(date, [])))
         return instance_ids
 
-    def _fetch_segment_urls(self, instance_ids: List[str]) -> dict:
-        urls: dict = {}
+    @staticmethod
+    def _iter_instances_by_date(
+        instances: Dict[str, List[Dict[str, Any]]]
+    ) -> Iterator[tuple]:
+        """Yields `(instance, processing_date)` per report, oldest date first."""
+        for listing in instances.values():
+            dated = [
+                (instance, (instance.get("attributes") or {}).get("processingDate"))
+                for instance in listing
+                if isinstance(instance, dict) and instance.get("id")
+            ]
+            dated = [(instance, date) for instance, date in dated if date]
+            yield from sorted(dated, key=lambda item: item[1])
 
-        for instance_id in instance_ids:
-            
-            try:
-                segments = self.read_segments_for_report(instance_id)
-                segment_urls = Handler.extract_attribute_values(segments, attribute="url")
-                
-                for segment_url in segment_urls:
+    def _fetch_segment_urls(self, instance_ids: List[str]) -> dict:
+        return {
+            url_key: segment["url"]
+            for url_key, segment in self._fetch_segments(instance_ids).items()
+        }
 
-                    url_key = segment_url.split("?")[0]
-                    urls[url_key] = segment_url
-            except BaseException as e:
-                logger.warn(e)
+    def _fetch_segments(self, instance_ids: List[str], strict: bool = False) -> dict:
+        """
+        Returns the attributes (url, checksum, size) of all segments keyed by unsigned URL.
 
-        if len(urls.keys()) < 1:
+        Instances whose segments cannot be listed are logged and skipped, or
+        raise the error of the first such instance when `strict` is set.
+        """
+        def fetch(instance_id: str) -> List[Dict[str, Any]]:
+            try:
+                segments = self._read_segments_preferring_store(instance_id)
+                with_urls = [
+                    attributes
+                    for attributes in Handler.extract_attribute_values(segments)
+                    if attributes.get("url")
+                ]
+                if not with_urls:
+                    raise NoValidUrlsError("No valid `url` found in the payload.")
+                return with_urls
+            except Exception as e:
+                if strict:
+                    raise
+                logger.warning(e)
+                return []
+
+        segments: dict = {}
+
+        with self._stage("segments"):
+            listings = self._map_metadata(fetch, instance_ids)
+
+        for instance_segments in listings:
+
+            for segment in instance_segments:
+
+                url_key = segment["url"].split("?")[0]
+                segments[url_key] = segment
+
+        if len(segments.keys()) < 1:
             raise ValueError("No segments URL available")
             
-        return urls
+        return segments
+
+    def _read_segments_preferring_store(self, instance_id: str) -> List[Dict[str, Any]]:
+        """
+        Reads the segments of an instance, skipping the listing request when
+        every segment of its cached listing is already in the segment store.
+
+        The `segments` cache level is the index of the segment store: its
+        expired URLs are never downloaded, so it is only used with a store.
+        """
+        if self.cache is None or self.segment_store is None:
+            return self.read_segments_for_report(instance_id)
+
+        key = MetadataCache.make_key(self._segments_path(instance_id))
+        cached = self.cache.get("segments", key)
+        if cached and all(
+            self.segment_store.contains((item.get("attributes") or {}).get("checksum"))
+            for item in cached
+        ):
+            return cached
+        segments = self.read_segments_for_report(instance_id)
+        if segments:
+            self.cache.set("segments", key, segments)
+        return segments
+
+    @staticmethod
+    def _segments_path(instance_id: str) -> str:
+        return f"analyticsReportInstances/{instance_id}/segments"
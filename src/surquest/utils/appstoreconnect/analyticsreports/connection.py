@@ -0,0 +1,80 @@
+from typing import Iterable, Optional, Tuple
+
+from urllib3.util.retry import Retry
+
+from .transport import RequestsTransport
+
+
+class ConnectionSettings:
+    """
+    Connection pool, timeout and retry settings of one HTTP host.
+
+    The client keeps one session per host: the App Store Connect API (small
+    JSON pages, authenticated) and the segment download host (large gzip
+    bodies, never authenticated), so each can be tuned separately and long
+    downloads never starve metadata calls of pooled connections.
+    """
+
+    DEFAULT_STATUS_FORCELIST = (429, 500, 502, 503, 504)
+
+    def __init__(
+        self,
+        pool_size: int = 10,
+        connect_timeout: Optional[float] = 10.0,
+        read_timeout: Optional[float] = 60.0,
+        retries: int = 3,
+        backoff_factor: float = 1.0,
+        status_forcelist: Iterable[int] = DEFAULT_STATUS_FORCELIST,
+    ):
+        """
+        Initializes the settings.
+
+        Args:
+            pool_size (int): Maximum number of pooled connections to the host.
+            connect_timeout (Optional[float]): Seconds to establish a connection (None waits forever).
+            read_timeout (Optional[float]): Seconds to wait for data between bytes (None waits forever).
+            retries (int): Retries of failed GET requests (connection errors and `status_forcelist`).
+            backoff_factor (float): Exponential backoff factor between retries.
+            status_forcelist (Iterable[int]): Status codes that are retried.
+        """
+        if pool_size < 1 or retries < 0:
+            raise ValueError("pool_size must be positive and retries not negative.")
+        self.pool_size = pool_size
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.status_forcelist = tuple(status_forcelist)
+
+    @classmethod
+    def for_api(cls, pool_size: int = 10) -> "ConnectionSettings":
+        """
+        Defaults of the App Store Connect API host.
+
+        429 responses are left to the client's `RateLimiter`, which pauses every
+        request sharing the quota instead of retrying this one blindly.
+        """
+        return cls(pool_size=pool_size, read_timeout=60.0, status_forcelist=(500, 502, 503, 504))
+
+    @classmethod
+    def for_downloads(cls, pool_size: int = 10) -> "ConnectionSettings":
+        """Defaults of the segment download host (long reads of large bodies)."""
+        return cls(pool_size=pool_size, read_timeout=300.0)
+
+    @property
+    def timeout(self) -> Tuple[Optional[float], Optional[float]]:
+        """`(connect, read)` timeout passed to `requests`."""
+        return self.connect_timeout, self.read_timeout
+
+    def retry(self) -> Retry:
+        """Retry policy of the host."""
+        return Retry(
+            total=self.retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=list(self.status_forcelist),
+            allowed_methods=["GET"],
+        )
+
+    def create_session(self) -> RequestsTransport:
+        """Creates a `requests` session with a connection pool and retry policy for the host."""
+        return RequestsTransport(self)
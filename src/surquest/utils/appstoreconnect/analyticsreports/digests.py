@@ -0,0 +1,91 @@
+class DigestSet:
+    """
+    Compact set of fixed-size digests.
+
+    Digests are stored back to back in one `bytearray` used as an open
+    addressing hash table with linear probing, so every entry costs its
+    `digest_size` bytes (plus free slots) instead of a Python `bytes` object
+    and a set slot, roughly 100 bytes per entry.
+    """
+
+    MAX_LOAD = 0.7
+
+    def __init__(self, digest_size: int = 16, capacity: int = 1024):
+        """
+        Initializes an empty set.
+
+        Args:
+            digest_size (int): Length of the stored digests in bytes (at least 8).
+            capacity (int): Initial number of slots, rounded up to a power of two.
+        """
+        if digest_size < 8:
+            raise ValueError("digest_size must be at least 8 bytes.")
+        self.digest_size = digest_size
+        self._capacity = 1 << max(capacity - 1, 1).bit_length()
+        self._table = bytearray(self._capacity * digest_size)
+        self._empty = bytes(digest_size)
+        self._has_empty = False
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, digest: bytes) -> bool:
+        if digest == self._empty:
+            return self._has_empty
+        return self._find(digest)[1]
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the hash table in bytes."""
+        return len(self._table)
+
+    def add(self, digest: bytes) -> bool:
+        """
+        Adds a digest.
+
+        Returns:
+            bool: True if the digest was not in the set yet.
+        """
+        if len(digest) != self.digest_size:
+            raise ValueError(f"Expected a {self.digest_size} byte digest, got {len(digest)} bytes.")
+        if digest == self._empty:
+            added = not self._has_empty
+            self._has_empty = True
+            self._count += added
+            return added
+
+        offset, found = self._find(digest)
+        if found:
+            return False
+        self._table[offset:offset + self.digest_size] = digest
+        self._count += 1
+        if self._count > self._capacity * self.MAX_LOAD:
+            self._resize(self._capacity * 2)
+        return True
+
+    def _find(self, digest: bytes) -> tuple:
+        """Returns the offset of the digest's slot (or of the free slot to use) and whether it was found."""
+        size = self.digest_size
+        mask = self._capacity - 1
+        table = self._table
+        index = int.from_bytes(digest[:8], "little") & mask
+        while True:
+            offset = index * size
+            slot = table[offset:offset + size]
+            if slot == digest:
+                return offset, True
+            if slot == self._empty:
+                return offset, False
+            index = (index + 1) & mask
+
+    def _resize(self, capacity: int) -> None:
+        size = self.digest_size
+        old_table = self._table
+        self._capacity = capacity
+        self._table = bytearray(capacity * size)
+        for offset in range(0, len(old_table), size):
+            digest = bytes(old_table[offset:offset + size])
+            if digest != self._empty:
+                new_offset, _ = self._find(digest)
+                self._table[new_offset:new_offset + size] = digest
@@ -11,3 +11,13 @@ class NoValidIdsError(ValueError):
 class NoValidUrlsError(ValueError):
     """Raised when no valid URLs are found in the payload."""
     pass
+
+
+class SpillLimitError(RuntimeError):
+    """Raised when temporary files of an external operation exceed their size limit."""
+    pass
+
+
+class IncompleteListingError(RuntimeError):
+    """Raised when a page of a paginated listing fails after earlier pages were fetched."""
+    pass
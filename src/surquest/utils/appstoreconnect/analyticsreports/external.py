@@ -0,0 +1,241 @@
+import os
+import heapq
+import pickle
+import tempfile
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from .errors import SpillLimitError
+from .handler import Handler
+from .logger import logger
+
+
+class ExternalDeduplicator:
+    """
+    Disk-backed deduplication (and optional sort) for reports larger than memory.
+
+    Produces exactly the rows of `Handler.deduplicate_data`, in the same order,
+    with bounded memory:
+
+    1. Inputs up to `max_rows_in_memory` rows are deduplicated in memory.
+    2. Larger inputs are numbered and spilled into `partitions` temporary files
+       by a hash of the row, so duplicates always land in the same partition.
+    3. Every partition is deduplicated on its own (partitions that are still too
+       large are split again) and written to a run file ordered by first
+       occurrence, or by `sort_by` and then first occurrence.
+    4. The runs are merged into one ordered stream, in passes of at most
+       `partitions` runs so the number of open files stays bounded.
+    """
+
+    MAX_SPLIT_DEPTH = 4
+
+    def __init__(
+        self,
+        max_rows_in_memory: int = 1_000_000,
+        partitions: int = 64,
+        temp_dir: Optional[str] = None,
+        max_temp_bytes: Optional[int] = None,
+        sort_by: Optional[str] = None,
+    ):
+        """
+        Initializes the engine.
+
+        Args:
+            max_rows_in_memory (int): Rows held in memory at once (input buffer or one partition).
+            partitions (int): Number of hash partitions created per split.
+            temp_dir (Optional[str]): Directory for the run files (system default otherwise).
+            max_temp_bytes (Optional[int]): Fail with `SpillLimitError` as soon as the temporary files
+                on disk would exceed this size (checked on every record written).
+            sort_by (Optional[str]): Column to order the output by (e.g. `date`); first occurrence order otherwise.
+        """
+        if max_rows_in_memory < 1 or partitions < 2:
+            raise ValueError("max_rows_in_memory must be positive and partitions at least 2.")
+        self.max_rows_in_memory = max_rows_in_memory
+        self.partitions = partitions
+        self.temp_dir = temp_dir
+        self.max_temp_bytes = max_temp_bytes
+        self.sort_by = sort_by
+        self._temp_bytes = 0
+
+    def deduplicate(
+        self,
+        data: Iterable[Dict[str, Any]],
+        convert_types: bool = True,
+        column_types: Optional[Dict[str, type]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yields the unique rows of `data`.
+
+        Args:
+            data (Iterable[dict]): Rows to deduplicate, e.g. the stream of `Client.iter_data(convert_types=False)`.
+            convert_types (bool): Convert numeric strings like `Handler.deduplicate_data` does.
+            column_types (Optional[Dict[str, type]]): Known column types, others are inferred from a sample.
+
+        Yields:
+            dict: Unique rows with the key order of the first row.
+        """
+        rows = iter(data)
+        if convert_types:
+            rows = Handler.iter_converted(rows, column_types)
+
+        buffer = []
+        for row in rows:
+            buffer.append(row)
+            if len(buffer) >= self.max_rows_in_memory:
+                break
+        else:
+            yield from self._deduplicate_in_memory(buffer)
+            return
+
+        key_order = list(buffer[0].keys())
+        sort_index = key_order.index(self.sort_by) if self.sort_by in key_order else None
+        self._temp_bytes = 0
+        with tempfile.TemporaryDirectory(dir=self.temp_dir) as directory:
+            records = self._number(buffer, rows, key_order)
+            del buffer
+            partitions = self._split(records, directory, "p", depth=0)
+            total = sum(count for _, count in partitions)
+
+            runs: List[str] = []
+            for path, count in partitions:
+                runs.extend(self._deduplicate_partition(path, count, directory, 0, sort_index))
+
+            unique = 0
+            key = self._record_key(sort_index)
+            merged = heapq.merge(*(self._read(path) for path in self._reduce_runs(runs, directory, key)), key=key)
+            for _, values in merged:
+                unique += 1
+                yield dict(zip(key_order, values))
+
+        logger.info(
+            f"Entries: duplicated {total - unique}, "
+            f"original: {total}, "
+            f"deduplicated: {unique} (external, {len(runs)} runs)"
+        )
+
+    def _deduplicate_in_memory(self, rows: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        unique = list(Handler.iter_deduplicated(rows))
+        if self.sort_by is not None:
+            unique.sort(key=lambda row: self._sort_value(row.get(self.sort_by)))
+        yield from unique
+
+    @staticmethod
+    def _number(buffer: List[dict], rows: Iterator[dict], key_order: List[str]) -> Iterator[tuple]:
+        seq = 0
+        for source in (buffer, rows):
+            for row in source:
+                yield seq, tuple(row.get(k) for k in key_order)
+                seq += 1
+
+    def _split(self, records: Iterable[tuple], directory: str, prefix: str, depth: int) -> List[tuple]:
+        """Distributes records over hash partitions; returns `(path, count)` per partition."""
+        paths = [os.path.join(directory, f"{prefix}-{depth}-{n}.bin") for n in range(self.partitions)]
+        counts = [0] * self.partitions
+        handles = [open(path, "wb") for path in paths]
+        try:
+            for record in records:
+                digest = Handler.row_digest(record[1], 16)
+                index = int.from_bytes(digest[depth * 4:depth * 4 + 4], "little") % self.partitions
+                self._write(handles[index], record)
+                counts[index] += 1
+        finally:
+            for handle in handles:
+                handle.close()
+
+        partitions = []
+        for path, count in zip(paths, counts):
+            if count:
+                partitions.append((path, count))
+            else:
+                os.remove(path)
+        return partitions
+
+    def _deduplicate_partition(
+        self, path: str, count: int, directory: str, depth: int, sort_index: Optional[int]
+    ) -> List[str]:
+        """Deduplicates one partition into run files (splitting it again when too large)."""
+        if count > self.max_rows_in_memory and depth + 1 < self.MAX_SPLIT_DEPTH:
+            name = os.path.splitext(os.path.basename(path))[0]
+            sub_partitions = self._split(self._read(path), directory, name, depth + 1)
+            self._remove(path)
+            runs = []
+            for sub_path, sub_count in sub_partitions:
+                runs.extend(self._deduplicate_partition(sub_path, sub_count, directory, depth + 1, sort_index))
+            return runs
+        if count > self.max_rows_in_memory:
+            logger.warning(f"Partition with {count} rows exceeds max_rows_in_memory, processing anyway")
+
+        seen = set()
+        survivors = []
+        for seq, values in self._read(path):
+            if values not in seen:
+                seen.add(values)
+                survivors.append((seq, values))
+        del seen
+        self._remove(path)
+
+        if sort_index is not None:
+            survivors.sort(key=self._record_key(sort_index))
+
+        run_path = f"{os.path.splitext(path)[0]}.run"
+        with open(run_path, "wb") as f:
+            for record in survivors:
+                self._write(f, record)
+        return [run_path]
+
+    def _reduce_runs(self, runs: List[str], directory: str, key: Callable[[tuple], Any]) -> List[str]:
+        """Merges runs in passes of `partitions` files until at most `partitions` runs remain."""
+        depth = 0
+        while len(runs) > self.partitions:
+            merged_runs = []
+            for n, start in enumerate(range(0, len(runs), self.partitions)):
+                group = runs[start:start + self.partitions]
+                run_path = os.path.join(directory, f"m-{depth}-{n}.run")
+                with open(run_path, "wb") as f:
+                    for record in heapq.merge(*(self._read(path) for path in group), key=key):
+                        self._write(f, record)
+                for path in group:
+                    self._remove(path)
+                merged_runs.append(run_path)
+            runs = merged_runs
+            depth += 1
+        return runs
+
+    @classmethod
+    def _record_key(cls, sort_index: Optional[int]) -> Callable[[tuple], Any]:
+        """Order of `(seq, values)` records: by sort column (if any), then first occurrence."""
+        if sort_index is None:
+            return lambda record: record[0]
+        return lambda record: (cls._sort_value(record[1][sort_index]), record[0])
+
+    @staticmethod
+    def _sort_value(value: Any) -> tuple:
+        """Sort key placing None last and keeping mixed types comparable."""
+        if value is None:
+            return (2, "")
+        if isinstance(value, (int, float)):
+            return (0, value)
+        return (1, str(value))
+
+    def _write(self, handle: Any, record: tuple) -> None:
+        """Appends a record to a temporary file, enforcing `max_temp_bytes` before writing it."""
+        data = pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL)
+        self._temp_bytes += len(data)
+        if self.max_temp_bytes is not None and self._temp_bytes > self.max_temp_bytes:
+            raise SpillLimitError(
+                f"Spilled {self._temp_bytes} bytes, exceeding max_temp_bytes={self.max_temp_bytes}."
+            )
+        handle.write(data)
+
+    def _remove(self, path: str) -> None:
+        """Deletes a consumed temporary file and releases its bytes from the spill total."""
+        self._temp_bytes -= os.path.getsize(path)
+        os.remove(path)
+
+    @staticmethod
+    def _read(path: str) -> Iterator[tuple]:
+        with open(path, "rb") as f:
+            while True:
+                try:
+                    yield pickle.load(f)
+                except EOFError:
+                    return
@@ -1,15 +1,29 @@
 import os
-import csv
-import json
 import warnings
 import operator
-from typing import Any, List, Dict
+import hashlib
+from typing import Any, Callable, List, Dict, Iterable, Iterator
 
+from .digests import DigestSet
 from .errors import PayloadFormatError, NoValidIdsError, NoValidUrlsError
 from .logger import logger
+from .rows import Row
 
 
 class Handler:
+
+    # Supported comparators of `filter_list_of_dicts` and `RowIndex.query`
+    COMPARATORS: Dict[str, Callable[[Any, Any], bool]] = {
+        '==': operator.eq,
+        '!=': operator.ne,
+        '>': operator.gt,
+        '<': operator.lt,
+        '>=': operator.ge,
+        '<=': operator.le,
+        'in': lambda a, b: a in b,
+        'not in': lambda a, b: a not in b,
+    }
+
     @staticmethod
     def extract_ids(payload: dict) -> list[str]:
         """
@@ -80,12 +94,325 @@ class Handler:
         return out
 
     @staticmethod
-    def deduplicate_data(data: list[dict]) -> list[dict]:
+    def convert_values(item: dict) -> dict:
+        """
+        Convert string representations of numbers to actual numbers (in place).
+
+        Empty strings are converted to None.
+
+        Args:
+            item (dict): Row to convert
+
+        Returns:
+            dict: The same row with converted values
+        """
+        for key, value in item.items():
+            item[key] = Handler.convert_value(value)
+        return item
+
+    @staticmethod
+    def convert_value(value: Any) -> Any:
+        """
+        Convert one string value to a number when it is numeric.
+
+        Strings with a decimal point become floats, other numeric strings
+        integers, empty strings None; anything else is returned as is.
+        """
+        if not isinstance(value, str):
+            return value
+        if value == "":
+            return None
+        try:
+            return float(value) if "." in value else int(value)
+        except ValueError:
+            # Not a numeric string, keep as is
+            return value
+
+    @staticmethod
+    def infer_column_types(data: Iterable[dict], sample_size: int = 1000) -> Dict[str, type]:
+        """
+        Infer the type of every column once from a sample of rows.
+
+        A column is `int` when all its sampled non-empty values are integers,
+        `float` when they are numbers and at least one has a decimal point, and
+        `str` otherwise. Columns without any non-empty sampled value are not
+        settled by the sample and map to None (converted value by value).
+
+        Args:
+            data (Iterable[dict]): Rows to sample
+            sample_size (int): Maximal number of rows to inspect
+
+        Returns:
+            dict: Column name to `int`, `float`, `str` or None
+        """
+        kinds: Dict[str, set] = {}
+        for index, item in enumerate(data):
+            if index >= sample_size:
+                break
+            for key, value in item.items():
+                column = kinds.setdefault(key, set())
+                if str in column or value is None or value == "":
+                    continue
+                if isinstance(value, str):
+                    column.add(Handler._numeric_kind(value))
+                elif isinstance(value, (int, float)):
+                    column.add(float if isinstance(value, float) else int)
+                else:
+                    column.add(str)
+
+        column_types = {}
+        for key, column in kinds.items():
+            if not column:
+                column_types[key] = None
+            elif str in column:
+                column_types[key] = str
+            elif float in column:
+                column_types[key] = float
+            else:
+                column_types[key] = int
+        return column_types
+
+    @staticmethod
+    def _numeric_kind(value: str) -> type:
+        """Classifies a string as `int`, `float` or `str` (used on samples only)."""
+        try:
+            if "." in value:
+                float(value)
+                return float
+            int(value)
+            return int
+        except ValueError:
+            return str
+
+    @staticmethod
+    def _to_int(value: Any) -> Any:
+        if not isinstance(value, str):
+            return value
+        if value == "":
+            return None
+        try:
+            return int(value)
+        except ValueError:
+            return Handler._to_float(value)
+
+    @staticmethod
+    def _to_float(value: Any) -> Any:
+        if not isinstance(value, str):
+            return value
+        if value == "":
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            # Value does not fit the column type, keep as is
+            return value
+
+    @staticmethod
+    def _to_str(value: Any) -> Any:
+        return None if value == "" else value
+
+    @staticmethod
+    def column_converters(column_types: Dict[str, type | None]) -> Dict[str, Any]:
+        """
+        Map column types to specialised converters.
+
+        Args:
+            column_types (dict): Column name to `int`, `float`, `str` or None
+                                 (unsettled, converted value by value)
+
+        Returns:
+            dict: Column name to a single-value converter
+        """
+        converters = {
+            int: Handler._to_int, float: Handler._to_float, str: Handler._to_str, None: Handler.convert_value
+        }
+        return {key: converters.get(type_, Handler._to_str) for key, type_ in column_types.items()}
+
+    @staticmethod
+    def _row_converter(
+        sample: list[dict], column_types: Dict[str, type] | None, sample_size: int
+    ) -> Callable[[dict], dict]:
+        """
+        Builds the row conversion used by `convert_columns` and `iter_converted`.
+
+        Known `column_types` take precedence over the types inferred from
+        `sample`. Columns left unsettled by both, and columns first seen after
+        the sample, fall back to `convert_value`. Dicts are converted in place;
+        read-only `Row`s are returned as new rows sharing their header.
+        """
+        types = Handler.infer_column_types(sample, sample_size)
+        types.update({key: type_ for key, type_ in (column_types or {}).items() if type_ is not None})
+        converters = Handler.column_converters(types)
+        get_converter = converters.get
+        convert_value = Handler.convert_value
+
+        def convert(item: dict) -> dict:
+            if isinstance(item, Row):
+                return Row(item.header, tuple(get_converter(key, convert_value)(value) for key, value in item.items()))
+            for key, value in item.items():
+                item[key] = get_converter(key, convert_value)(value)
+            return item
+
+        return convert
+
+    @staticmethod
+    def convert_columns(
+        data: list[dict],
+        column_types: Dict[str, type] | None = None,
+        sample_size: int = 1000,
+    ) -> list[dict]:
+        """
+        Convert values column by column (in place) using types inferred once.
+
+        Unlike `convert_values`, the type of a column is decided once (from
+        `column_types` or a sample of `data`), so string columns are never parsed.
+        Columns mixing numbers and text are therefore kept as strings. Empty
+        strings are converted to None. Columns missing from `column_types` are
+        inferred from the sample; columns the sample does not settle (only empty
+        values, or absent from it) are converted value by value. Compact `Row`s
+        are read-only, so they are replaced in `data` by converted rows.
+
+        Args:
+            data (list[dict]): Rows to convert
+            column_types (dict, optional): Known column types, e.g. from `SchemaRegistry`
+            sample_size (int): Number of rows used to infer unknown column types
+
+        Returns:
+            list[dict]: The same list with converted values
+        """
+        if not data:
+            return data
+
+        convert = Handler._row_converter(data, column_types, sample_size)
+        for index, item in enumerate(data):
+            data[index] = convert(item)
+        return data
+
+    @staticmethod
+    def iter_converted(
+        data: Iterable[dict],
+        column_types: Dict[str, type] | None = None,
+        sample_size: int = 1000,
+    ) -> Iterator[dict]:
+        """
+        Streaming variant of `convert_columns`.
+
+        The first `sample_size` rows are buffered to infer the column types, then
+        every row is converted as it passes through (compact `Row`s as new rows).
+        """
+        iterator = iter(data)
+        sample = []
+        for item in iterator:
+            sample.append(item)
+            if len(sample) >= sample_size:
+                break
+
+        convert = Handler._row_converter(sample, column_types, sample_size)
+        for item in sample:
+            yield convert(item)
+        for item in iterator:
+            yield convert(item)
+
+    @staticmethod
+    def row_digest(values: Iterable[Any], digest_size: int = 16) -> bytes:
+        """
+        Fixed-size blake2b digest of a row's canonical encoding.
+
+        Values that compare equal in a tuple (e.g. `25` and `25.0`) get the same
+        encoding, so deduplicating by digest matches deduplicating by tuple.
+
+        Args:
+            values (Iterable): Row values in key order
+            digest_size (int): Digest length in bytes (1-64)
+
+        Returns:
+            bytes: The digest
+        """
+        canonical = tuple(
+            int(value)
+            if value.__class__ is bool or (value.__class__ is float and value.is_integer())
+            else value
+            for value in values
+        )
+        encoded = repr(canonical).encode("utf-8", "surrogatepass")
+        return hashlib.blake2b(encoded, digest_size=digest_size).digest()
+
+    @staticmethod
+    def iter_deduplicated(
+        data: Iterable[dict],
+        key_order: list | None = None,
+        digest_size: int | None = None,
+    ) -> Iterator[dict]:
+        """
+        Lazily yield unique entries (dictionaries) with consistent key order.
+
+        Args:
+            data (Iterable[dict]): Rows to deduplicate, already type converted
+            key_order (list, optional): Key order of the output. Defaults to the keys of the first row.
+            digest_size (int, optional): Remember a fixed-size digest of every row (see `row_digest`)
+                in a compact `DigestSet` instead of the full row values; 16 bytes keep
+                collisions negligible.
+
+        Yields:
+            dict: First occurrence of every distinct row
+        """
+        if digest_size:
+            seen = DigestSet(digest_size)
+            for d in data:
+                if key_order is None:
+                    key_order = list(d.keys())
+                if seen.add(Handler.row_digest((d.get(k) for k in key_order), digest_size)):
+                    yield {k: d.get(k) for k in key_order}
+            return
+
+        seen = set()
+        for d in data:
+            if key_order is None:
+                key_order = list(d.keys())
+            # Ensure dictionary has all keys (fill missing with None)
+            normalized = tuple(d.get(k) for k in key_order)
+            if normalized not in seen:
+                seen.add(normalized)
+                yield {k: d.get(k) for k in key_order}
+
+    @staticmethod
+    def batched(data: Iterable[Any], size: int) -> Iterator[list]:
+        """
+        Group an iterable into lists of at most `size` items.
+
+        Args:
+            data (Iterable): Items to group
+            size (int): Maximal batch size
+
+        Yields:
+            list: Consecutive batches of items
+        """
+        if size < 1:
+            raise ValueError("Batch size must be a positive integer.")
+        batch = []
+        for item in data:
+            batch.append(item)
+            if len(batch) >= size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    @staticmethod
+    def deduplicate_data(
+        data: list[dict],
+        convert_types: bool = True,
+        column_types: Dict[str, type] | None = None,
+        digest_size: int | None = None,
+    ) -> list[dict]:
         """
         Remove duplicated entries (dictionaries) and ensure consistent key order.
 
         Args:
             data (list): List of dictionaries
+            convert_types (bool): Convert numeric strings column-wise before deduplication (see `convert_columns`)
+            column_types (dict, optional): Known column types, others are inferred from a sample
+            digest_size (int, optional): Track rows by a fixed-size digest instead of their values
 
         Returns:
             list: Deduplicated list of dictionaries with consistent key order
@@ -94,40 +421,13 @@ class Handler:
             return []
 
         # Convert string representations of numbers to actual numbers
-        for item in data:
-            for key, value in item.items():
-                if isinstance(value, str):
-                    if "." in value:
-                        try:
-                            # Try converting to float first (handles integers too)
-                            num_value = float(value)
-                            item[key] = num_value
-                        except ValueError:
-                            # Not a numeric string, keep as is
-                            pass
-                    elif value in [""]:
-                        item[key] = None
-                    else:
-                        try:
-                            # Try converting to integer
-                            num_value = int(value)
-                            item[key] = num_value
-                        except ValueError:
-                            # Not an integer, keep as is
-                            pass
+        if convert_types:
+            Handler.convert_columns(data, column_types)
 
         # Determine consistent key order (from the first dictionary)
         key_order = list(data[0].keys())
 
-        # Deduplicate using tuple representation
-        seen = set()
-        unique_data = []
-        for d in data:
-            # Ensure dictionary has all keys (fill missing with None)
-            normalized = tuple((k, d.get(k)) for k in key_order)
-            if normalized not in seen:
-                seen.add(normalized)
-                unique_data.append({k: d.get(k) for k in key_order})
+        unique_data = list(Handler.iter_deduplicated(data, key_order, digest_size))
 
         logger.info(
             f"Entries: duplicated {len(data) - len(unique_data)}, "
@@ -151,45 +451,67 @@ class Handler:
             os.makedirs(directory)
 
     @staticmethod
-    def list_of_dicts_to_jsonl(data: list[dict], file_path: str) -> None:
+    def list_of_dicts_to_jsonl(data: Iterable[dict], file_path: str, **kwargs) -> None:
         """
         Converts a list of dictionaries to JSON Lines format and writes to a file.
 
         Args:
-            data (list[dict]): List of dictionaries to convert.
+            data (Iterable[dict]): List (or any iterable) of dictionaries to convert.
             file_path (str): Path to the output .jsonl file.
+            **kwargs: Options of `writers.JsonlWriter` (compression, partition_by, buffer_size).
         """
+        from .writers import JsonlWriter
 
-        # Create the directory if it doesn't exist
-        Handler.create_directory(file_path)
+        with JsonlWriter(file_path, **kwargs) as writer:
+            written = writer.write_rows(data)
 
-        with open(file_path, 'w', encoding='utf-8') as f:
-            for item in data:
-                json_line = json.dumps(item, ensure_ascii=False)
-                f.write(json_line + '\n')
+        if not written and not kwargs.get("partition_by"):
+            # An empty input still produces an (empty) file
+            Handler.create_directory(file_path)
+            open(file_path, 'w', encoding='utf-8').close()
 
     @staticmethod
-    def list_of_dicts_to_csv(data: list[dict], file_path: str) -> None:
+    def list_of_dicts_to_csv(data: Iterable[dict], file_path: str, **kwargs) -> None:
         """
         Converts a list of dictionaries to CSV format and writes to a file.
 
+        The header is the union of the keys of the first rows (see `writers.CsvWriter`).
+
         Args:
-            data (list[dict]): List of dictionaries to convert.
+            data (Iterable[dict]): List (or any iterable) of dictionaries to convert.
             file_path (str): Path to the output .csv file.
+            **kwargs: Options of `writers.CsvWriter` (fieldnames, lookahead, compression, partition_by, ...).
         """
-        if not data:
+        if isinstance(data, list) and not data:
             raise ValueError("The data list is empty.")
 
-        # Create the directory if it doesn't exist
-        Handler.create_directory(file_path)
-        
-        # Extract headers from keys of the first dictionary
-        headers = data[0].keys()
-        
-        with open(file_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=headers)
-            writer.writeheader()
-            writer.writerows(data)
+        from .writers import CsvWriter
+
+        with CsvWriter(file_path, **kwargs) as writer:
+            written = writer.write_rows(data)
+
+        if not written:
+            raise ValueError("The data list is empty.")
+
+    @staticmethod
+    def list_of_dicts_to_parquet(data: Iterable[dict], file_path: str, **kwargs) -> int:
+        """
+        Writes a list (or any iterable) of dictionaries to a compressed Parquet file.
+
+        Requires the optional `pyarrow` dependency.
+
+        Args:
+            data (Iterable[dict]): Rows to write, e.g. the output of `Client.get_data` or `Client.iter_data`.
+            file_path (str): Path to the output .parquet file.
+            **kwargs: Options of `writers.ParquetWriter` (schema, row_group_size, compression).
+
+        Returns:
+            int: Number of rows written.
+        """
+        from .writers import ParquetWriter
+
+        with ParquetWriter(file_path, **kwargs) as writer:
+            return writer.write_rows(data)
 
     @staticmethod
     def get_distinct_values(data: list[dict], key: str) -> list:
@@ -205,6 +527,39 @@ class Handler:
         """
         return list({record.get(key) for record in data if key in record and record.get(key) is not None})
 
+    @staticmethod
+    def group_by(data: Iterable[Dict[str, Any]], key: str) -> Dict[Any, List[Dict[str, Any]]]:
+        """
+        Buckets dictionaries by the value of a key in a single pass.
+
+        Equivalent to `filter_list_of_dicts(data, key, value)` for every value of
+        `get_distinct_values(data, key)`, without scanning the data once per value.
+
+        Args:
+            data (Iterable[dict]): Dictionaries to bucket.
+            key (str): Key to bucket by.
+
+        Returns:
+            dict: Value to the list of its dictionaries, in order of first appearance
+                (dictionaries without the key or with a None value are skipped).
+        """
+        buckets: Dict[Any, List[Dict[str, Any]]] = {}
+        for record in data:
+            value = record.get(key)
+            if value is not None:
+                bucket = buckets.get(value)
+                if bucket is None:
+                    buckets[value] = bucket = []
+                bucket.append(record)
+        return buckets
+
+    @classmethod
+    def comparator(cls, comparator: str) -> Callable[[Any, Any], bool]:
+        """Returns the function of a comparator string (e.g. '==', '>=', 'in')."""
+        if comparator not in cls.COMPARATORS:
+            raise ValueError(f"Unsupported comparator '{comparator}'. Use one of: {list(cls.COMPARATORS.keys())}")
+        return cls.COMPARATORS[comparator]
+
     @staticmethod
     def filter_list_of_dicts(
         data: List[Dict[str, Any]],
@@ -225,23 +580,7 @@ class Handler:
         Returns:
             list: Filtered list of dictionaries.
         """
-
-        # Supported operators
-        ops: dict[str, Callable] = {
-            '==': operator.eq,
-            '!=': operator.ne,
-            '>': operator.gt,
-            '<': operator.lt,
-            '>=': operator.ge,
-            '<=': operator.le,
-            'in': lambda a, b: a in b,
-            'not in': lambda a, b: a not in b
-        }
-
-        if comparator not in ops:
-            raise ValueError(f"Unsupported comparator '{comparator}'. Use one of: {list(ops.keys())}")
-
-        func = ops[comparator]
+        func = Handler.comparator(comparator)
 
         return [
             item for item in data
@@ -0,0 +1,121 @@
+import bisect
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from .handler import Handler
+
+
+class RowIndex:
+    """
+    Reusable index over a list of rows for one or more attributes.
+
+    Built once in a single pass, it answers the queries of
+    `Handler.filter_list_of_dicts` without scanning all rows again:
+
+    - `==` and `in` through a hash map from value to row positions,
+    - `<`, `<=`, `>`, `>=` through the sorted distinct values and `bisect`,
+    - `!=` and `not in` as the complement of the above.
+
+    Results keep the original row order, exactly like `filter_list_of_dicts`.
+    Range queries skip rows whose value is None (which cannot be ordered).
+    """
+
+    def __init__(self, rows: Sequence[Dict[str, Any]], attributes: Iterable[str]):
+        """
+        Indexes the rows.
+
+        Args:
+            rows (Sequence[dict]): Rows to index (e.g. the output of `Client.get_data`).
+            attributes (Iterable[str]): Attributes to index, e.g. `["date", "territory"]`.
+        """
+        self.rows = rows
+        self._positions: Dict[str, Dict[Any, List[int]]] = {attribute: {} for attribute in attributes}
+        self._sorted_values: Dict[str, List[Any]] = {}
+
+        for position, row in enumerate(rows):
+            for attribute, positions in self._positions.items():
+                if attribute in row:
+                    value = row[attribute]
+                    bucket = positions.get(value)
+                    if bucket is None:
+                        positions[value] = bucket = []
+                    bucket.append(position)
+
+    @property
+    def attributes(self) -> List[str]:
+        """Indexed attributes."""
+        return list(self._positions)
+
+    def values(self, attribute: str) -> List[Any]:
+        """Distinct values of an attribute, in order of first appearance."""
+        return list(self._index(attribute))
+
+    def groups(self, attribute: str) -> Dict[Any, List[Dict[str, Any]]]:
+        """Rows grouped by the value of an attribute, in order of first appearance."""
+        return {
+            value: [self.rows[position] for position in positions]
+            for value, positions in self._index(attribute).items()
+        }
+
+    def query(self, attribute: str, value: Any, comparator: str = '==') -> List[Dict[str, Any]]:
+        """
+        Returns the rows matching `row[attribute] <comparator> value`.
+
+        Args:
+            attribute (str): Indexed attribute to filter on.
+            value (Any): Value to compare against (a collection for `in` / `not in`).
+            comparator (str): One of `Handler.COMPARATORS` ('==', '!=', '>', '<', '>=', '<=', 'in', 'not in').
+
+        Returns:
+            list: Matching rows in their original order.
+        """
+        return [self.rows[position] for position in self.positions(attribute, value, comparator)]
+
+    def positions(self, attribute: str, value: Any, comparator: str = '==') -> List[int]:
+        """Returns the ascending positions of the rows matching a query."""
+        Handler.comparator(comparator)
+        index = self._index(attribute)
+
+        if comparator == '==':
+            return list(index.get(value, ()))
+        if comparator == 'in':
+            if isinstance(value, (set, frozenset, list, tuple, dict)):
+                return self._merge(index[key] for key in set(value) if key in index)
+            # e.g. a substring test against a string
+            return self._merge(positions for key, positions in index.items() if key in value)
+        if comparator == '!=':
+            return self._merge(positions for key, positions in index.items() if key != value)
+        if comparator == 'not in':
+            return self._merge(positions for key, positions in index.items() if key not in value)
+
+        keys = self._sorted(attribute)
+        if comparator == '<':
+            keys = keys[:bisect.bisect_left(keys, value)]
+        elif comparator == '<=':
+            keys = keys[:bisect.bisect_right(keys, value)]
+        elif comparator == '>':
+            keys = keys[bisect.bisect_right(keys, value):]
+        else:
+            keys = keys[bisect.bisect_left(keys, value):]
+        return self._merge(index[key] for key in keys)
+
+    def _index(self, attribute: str) -> Dict[Any, List[int]]:
+        if attribute not in self._positions:
+            raise ValueError(f"Attribute '{attribute}' is not indexed. Indexed: {self.attributes}")
+        return self._positions[attribute]
+
+    def _sorted(self, attribute: str) -> List[Any]:
+        """Sorted distinct non-None values of an attribute (computed on the first range query)."""
+        keys: Optional[List[Any]] = self._sorted_values.get(attribute)
+        if keys is None:
+            try:
+                keys = sorted(key for key in self._index(attribute) if key is not None)
+            except TypeError as e:
+                raise ValueError(f"Values of '{attribute}' cannot be ordered: {e}") from e
+            self._sorted_values[attribute] = keys
+        return keys
+
+    @staticmethod
+    def _merge(position_lists: Iterable[List[int]]) -> List[int]:
+        merged = [position for positions in position_lists for position in positions]
+        merged.sort()
+        return merged
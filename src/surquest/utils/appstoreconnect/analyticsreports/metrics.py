@@ -0,0 +1,241 @@
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+
+class Metrics:
+    """
+    Hook receiving the instrumentation of `Client`.
+
+    The client reports counters (`increment`) and durations in seconds
+    (`observe`), both with optional string labels. Subclass it to forward
+    the measurements to a monitoring system; `RunStats` aggregates them in
+    memory. Measurements reported by the client:
+
+    - `http_requests` (counter; `host`=api|download, `status`) and
+      `http_request_seconds` (timing; `host`) per HTTP request,
+    - `pages` (counter) per page of a paginated listing,
+    - `segments` (counter; `source`=network|store), `segment_bytes` (compressed
+      bytes) and `rows_parsed` (counters) per downloaded segment,
+    - `stage_seconds` (timing; `stage`) of the stages `discovery`, `report_ids`,
+      `instances`, `segments`, `download`, `decompress`, `parse` and `deduplicate`,
+    - `dedup_input_rows` and `rows_emitted` (counters) of `get_data` / `iter_data`.
+
+    Durations of work running in parallel threads are reported per thread, so
+    their sum may exceed the wall time. Implementations must be thread-safe.
+    """
+
+    def increment(self, name: str, value: float = 1, **labels: str) -> None:
+        """Adds `value` to a counter."""
+
+    def observe(self, name: str, seconds: float, **labels: str) -> None:
+        """Records one duration."""
+
+    @contextmanager
+    def time(self, name: str, **labels: str) -> Iterator[None]:
+        """Records the duration of the `with` block (also when it raises)."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+
+class RunStats(Metrics):
+    """
+    Thread-safe in-memory aggregation of the measurements of one run.
+
+    Counters are summed and timings keep their count, total and maximum per
+    name and label set. `summary()` returns the totals per name (labels
+    summed), `dedup_ratio` the share of duplicated rows.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.counters: Dict[Tuple[str, tuple], float] = {}
+        self.timings: Dict[Tuple[str, tuple], list] = {}
+
+    def increment(self, name: str, value: float = 1, **labels: str) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name: str, seconds: float, **labels: str) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            timing = self.timings.get(key)
+            if timing is None:
+                self.timings[key] = [1, seconds, seconds]
+            else:
+                timing[0] += 1
+                timing[1] += seconds
+                timing[2] = max(timing[2], seconds)
+
+    def counter(self, name: str, **labels: str) -> float:
+        """Sum of a counter over all label sets matching `labels`."""
+        with self._lock:
+            return sum(
+                value for (key, key_labels), value in self.counters.items()
+                if key == name and set(labels.items()) <= set(key_labels)
+            )
+
+    def seconds(self, name: str, **labels: str) -> float:
+        """Total duration of a timing over all label sets matching `labels`."""
+        with self._lock:
+            return sum(
+                timing[1] for (key, key_labels), timing in self.timings.items()
+                if key == name and set(labels.items()) <= set(key_labels)
+            )
+
+    @property
+    def dedup_ratio(self) -> Optional[float]:
+        """Share of the rows dropped as duplicates (None before deduplication)."""
+        rows = self.counter("dedup_input_rows")
+        if not rows:
+            return None
+        return (rows - self.counter("rows_emitted")) / rows
+
+    def summary(self) -> Dict[str, Any]:
+        """Totals of the run: counters, stage durations and the dedup ratio."""
+        with self._lock:
+            counters: Dict[str, float] = {}
+            for (name, _), value in self.counters.items():
+                counters[name] = counters.get(name, 0) + value
+            stages: Dict[str, float] = {}
+            for (name, labels), timing in self.timings.items():
+                if name == "stage_seconds":
+                    stage = dict(labels).get("stage")
+                    stages[stage] = stages.get(stage, 0.0) + timing[1]
+        return {
+            "elapsed_seconds": time.time() - self.started,
+            "counters": counters,
+            "stage_seconds": stages,
+            "dedup_ratio": self.dedup_ratio,
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.started = time.time()
+            self.counters.clear()
+            self.timings.clear()
+
+
+class PrometheusTextfileExporter:
+    """
+    Writes `RunStats` in the Prometheus text format for the node_exporter
+    textfile collector.
+
+    Counters become `<prefix>_<name>_total`, timings `<prefix>_<name>_count`,
+    `_sum` and `_max` (the `*_seconds` names keep their unit). The file is
+    replaced atomically so the collector never reads a partial file.
+    """
+
+    def __init__(self, file_path: str, prefix: str = "appstoreconnect_analyticsreports", labels: Optional[Dict[str, str]] = None):
+        """
+        Initializes the exporter.
+
+        Args:
+            file_path (str): Target `.prom` file (in the collector's directory).
+            prefix (str): Prefix of all metric names.
+            labels (Optional[Dict[str, str]]): Labels added to every sample (e.g. `{"app_id": "..."}`).
+        """
+        self.file_path = file_path
+        self.prefix = prefix
+        self.labels = labels or {}
+
+    def render(self, stats: RunStats) -> str:
+        """Returns the exposition text of `stats`."""
+        with stats._lock:
+            counters = sorted(stats.counters.items())
+            timings = sorted(stats.timings.items())
+
+        lines = []
+        for name, samples in self._group(counters):
+            metric = f"{self.prefix}_{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.extend(f"{metric}{self._labels(labels)} {self._number(value)}" for labels, value in samples)
+        for name, samples in self._group(timings):
+            metric = f"{self.prefix}_{name}"
+            lines.append(f"# TYPE {metric} summary")
+            for labels, (count, total, _) in samples:
+                lines.append(f"{metric}_count{self._labels(labels)} {count}")
+                lines.append(f"{metric}_sum{self._labels(labels)} {self._number(total)}")
+            lines.append(f"# TYPE {metric}_max gauge")
+            lines.extend(f"{metric}_max{self._labels(labels)} {self._number(timing[2])}" for labels, timing in samples)
+
+        metric = f"{self.prefix}_last_run_timestamp_seconds"
+        lines.append(f"# TYPE {metric} gauge")
+        lines.append(f"{metric}{self._labels(())} {self._number(time.time())}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, stats: RunStats) -> None:
+        """Atomically writes the exposition text of `stats` to `file_path`."""
+        directory = os.path.dirname(os.path.abspath(self.file_path))
+        os.makedirs(directory, exist_ok=True)
+        handle, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "w", encoding="utf-8") as f:
+                f.write(self.render(stats))
+            os.replace(temp_path, self.file_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    @staticmethod
+    def _group(items: Iterable[tuple]) -> Iterator[tuple]:
+        grouped: Dict[str, list] = {}
+        for (name, labels), value in items:
+            grouped.setdefault(name, []).append((labels, value))
+        return iter(grouped.items())
+
+    def _labels(self, labels: tuple) -> str:
+        merged = dict(self.labels, **dict(labels))
+        if not merged:
+            return ""
+        return "{" + ",".join(f'{key}="{self._escape(value)}"' for key, value in sorted(merged.items())) + "}"
+
+    @staticmethod
+    def _escape(value: Any) -> str:
+        return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    @staticmethod
+    def _number(value: float) -> str:
+        return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class TimedIterator:
+    """
+    Wraps an iterator and accumulates the time spent producing its items.
+
+    Nested wrappers split a lazy pipeline into stages: the time of an outer
+    stage includes the time of the stages it pulls from. With `sized`, the
+    lengths of the items (e.g. bytes of chunks) are summed as well.
+    """
+
+    __slots__ = ("iterator", "seconds", "items", "size", "sized")
+
+    def __init__(self, iterable: Iterable[Any], sized: bool = False):
+        self.iterator = iter(iterable)
+        self.seconds = 0.0
+        self.items = 0
+        self.size = 0
+        self.sized = sized
+
+    def __iter__(self) -> "TimedIterator":
+        return self
+
+    def __next__(self) -> Any:
+        started = time.perf_counter()
+        try:
+            item = next(self.iterator)
+        finally:
+            self.seconds += time.perf_counter() - started
+        self.items += 1
+        if self.sized:
+            self.size += len(item)
+        return item
@@ -0,0 +1,195 @@
+import re
+import time
+import threading
+import weakref
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Mapping, Optional
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket pacing App Store Connect API requests.
+
+    Every request takes one token and tokens refill at the hourly quota spread
+    over the hour. The bucket holds the quota that is left minus
+    `safety_margin` (requests other callers may already have in flight), so
+    requests go out back to back while plenty of the quota is left and are
+    only paced once it runs low. The bucket adapts to the responses:
+
+    - `X-Rate-Limit: user-hour-lim:3600;user-hour-rem:3412;` sets the refill
+      rate from the quota, and the remaining requests (counted down by every
+      request) bound the bucket until the hour window that started with the
+      first reported value ends; once they are used up, callers wait for the
+      window to reset,
+    - a 429 response pauses all callers for its `Retry-After` (or
+      `default_retry_after` seconds when the header is missing).
+
+    One limiter is shared by all clients and threads using the same
+    `Credentials` (see `RateLimiter.shared`), as the quota is per API key.
+    """
+
+    HEADER = "X-Rate-Limit"
+    DEFAULT_HOURLY_LIMIT = 3600
+    DEFAULT_SAFETY_MARGIN = 100
+    WINDOW_SECONDS = 3600.0
+    _HEADER_PATTERN = re.compile(r"([\w-]+)\s*:\s*(\d+)")
+    _shared_lock = threading.Lock()
+    _shared: "weakref.WeakKeyDictionary[Any, RateLimiter]" = weakref.WeakKeyDictionary()
+
+    def __init__(
+        self,
+        hourly_limit: int = DEFAULT_HOURLY_LIMIT,
+        burst: Optional[int] = None,
+        safety_margin: int = DEFAULT_SAFETY_MARGIN,
+        default_retry_after: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Initializes a full bucket.
+
+        Args:
+            hourly_limit (int): Requests allowed per hour until the API reports its quota.
+            burst (Optional[int]): Fixed cap on the requests sent back to back; by default
+                only the remaining quota minus `safety_margin` limits them.
+            safety_margin (int): Requests of the remaining quota kept out of the bucket;
+                below it requests are paced at the hourly rate.
+            default_retry_after (float): Pause in seconds after a 429 without `Retry-After`.
+            clock (Callable): Monotonic clock in seconds.
+            sleep (Callable): Function used to wait.
+        """
+        if hourly_limit < 1 or (burst is not None and burst < 1) or safety_margin < 0:
+            raise ValueError("hourly_limit and burst must be positive and safety_margin non-negative integers.")
+        self.hourly_limit = hourly_limit
+        self.burst = burst
+        self.safety_margin = safety_margin
+        self.default_retry_after = default_retry_after
+        self.remaining: Optional[int] = None
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._paused_until = 0.0
+        self._window_ends_at = 0.0
+        self._tokens = self.capacity
+        self._updated_at = clock()
+
+    @classmethod
+    def shared(cls, credentials: Any) -> "RateLimiter":
+        """Returns the limiter of a `Credentials` object, creating it on first use."""
+        with cls._shared_lock:
+            limiter = cls._shared.get(credentials)
+            if limiter is None:
+                limiter = cls._shared[credentials] = cls()
+            return limiter
+
+    @property
+    def rate(self) -> float:
+        """Refill rate in tokens per second."""
+        return self.hourly_limit / 3600.0
+
+    @property
+    def capacity(self) -> float:
+        """Tokens the bucket holds: the quota left minus the safety margin, at least one."""
+        quota = self.hourly_limit if self.remaining is None else self.remaining
+        capacity = max(quota - self.safety_margin, 1)
+        if self.burst is not None:
+            capacity = min(capacity, self.burst)
+        return float(capacity)
+
+    def acquire(self) -> float:
+        """
+        Takes one token, waiting until one is available.
+
+        Returns:
+            float: Seconds spent waiting.
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._refill(now)
+                wait = self._paused_until - now
+                if wait <= 0:
+                    if self._tokens >= 1:
+                        self._take()
+                        return waited
+                    if self.remaining is not None and self.remaining < 1:
+                        wait = self._window_ends_at - now
+                    else:
+                        wait = (1 - self._tokens) / self.rate
+            self._sleep(wait)
+            waited += wait
+
+    def reserve(self) -> float:
+        """
+        Takes one token without waiting, for callers that wait themselves (asyncio).
+
+        Returns:
+            float: Seconds the caller has to wait before sending its request.
+        """
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self._take()
+            debt = max(-self._tokens, 0.0) / self.rate
+            if self.remaining is not None and self.remaining < 0:
+                debt = max(debt, self._window_ends_at - now)
+            return max(self._paused_until - now, debt, 0.0)
+
+    def update(self, headers: Mapping[str, str], status_code: int) -> None:
+        """Adapts the bucket to the rate-limit headers and status of a response."""
+        quota = self.parse_header(headers.get(self.HEADER))
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            if quota.get("user-hour-lim"):
+                self.hourly_limit = quota["user-hour-lim"]
+            if "user-hour-rem" in quota:
+                if self.remaining is None:
+                    self._window_ends_at = now + self.WINDOW_SECONDS
+                self.remaining = quota["user-hour-rem"]
+                if self.remaining > self.safety_margin:
+                    self._tokens = self.capacity  # plenty left, no pacing
+                else:
+                    self._tokens = min(self._tokens, self.capacity)
+            if status_code == 429:
+                retry_after = self.parse_retry_after(headers.get("Retry-After"))
+                pause = self.default_retry_after if retry_after is None else retry_after
+                self._paused_until = max(self._paused_until, now + pause)
+                self._tokens = 0.0
+
+    @classmethod
+    def parse_header(cls, value: Optional[str]) -> dict:
+        """Parses `user-hour-lim:3600;user-hour-rem:3412;` into `{name: int}`."""
+        if not value:
+            return {}
+        return {name.lower(): int(number) for name, number in cls._HEADER_PATTERN.findall(value)}
+
+    @staticmethod
+    def parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """Parses a `Retry-After` header given in seconds or as an HTTP date."""
+        if not value:
+            return None
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+        try:
+            return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+        except (TypeError, ValueError):
+            return None
+
+    def _take(self) -> None:
+        self._tokens -= 1
+        if self.remaining is not None:
+            self.remaining -= 1
+
+    def _refill(self, now: float) -> None:
+        if self.remaining is not None and now >= self._window_ends_at:
+            self.remaining = None  # the hour window reset, the quota is full again
+        elapsed = max(now - self._updated_at, 0.0)
+        self._updated_at = now
+        ceiling = self.capacity
+        if self.remaining is not None:
+            ceiling = min(ceiling, max(float(self.remaining), 0.0))
+        self._tokens = min(ceiling, self._tokens + elapsed * self.rate)
@@ -0,0 +1,155 @@
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+
+class Header:
+    """
+    Column names of a report shared by all its rows.
+
+    Names are normalized once per report (lower case, spaces and dashes
+    replaced by underscores) instead of once per row.
+    """
+
+    __slots__ = ("names", "index")
+
+    def __init__(self, names: Sequence[str], normalize: bool = True):
+        """
+        Initializes the header.
+
+        Args:
+            names (Sequence[str]): Column names as found in the report.
+            normalize (bool): Normalize the names.
+        """
+        self.names: Tuple[str, ...] = tuple(
+            self.normalize(name) if normalize else name for name in names
+        )
+        self.index: Dict[str, int] = {name: position for position, name in enumerate(self.names)}
+
+    @staticmethod
+    def normalize(name: str) -> str:
+        """Normalizes a column name, e.g. `App Apple Identifier` to `app_apple_identifier`."""
+        return name.lower().replace(" ", "_").replace("-", "_")
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __repr__(self) -> str:
+        return f"Header({list(self.names)})"
+
+
+class Row(Mapping):
+    """
+    Read-only report row backed by a tuple of values and a shared `Header`.
+
+    A row costs one small object and its values tuple instead of a dict with
+    its own keys; it behaves like a read-only dict (`row["date"]`, `row.get`,
+    `keys`, `items`, `==` with dicts) and `to_dict()` builds a plain dict when
+    one is needed (e.g. to modify or serialize the row).
+    """
+
+    # `_values`, not `values`: a slot of that name would hide `Mapping.values()`
+    __slots__ = ("header", "_values")
+
+    def __init__(self, header: Header, values: Tuple[Any, ...]):
+        self.header = header
+        self._values = values
+
+    def __getitem__(self, key: str) -> Any:
+        return self._values[self.header.index[key]]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.header.names)
+
+    def __len__(self) -> int:
+        return len(self.header.names)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.header.index
+
+    def __repr__(self) -> str:
+        return f"Row({self.to_dict()})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the row as a plain dictionary."""
+        return dict(zip(self.header.names, self._values))
+
+
+class ValueDictionary:
+    """
+    Per-column dictionaries of repeated report values.
+
+    Report rows repeat a few strings (territories, devices, platform versions,
+    source types, the app name) millions of times. Parsed through a value
+    dictionary, every distinct value of a column is kept once and all rows
+    share that string object (interning); the position of a value in its
+    dictionary is its categorical code (dictionary encoding).
+
+    A column stops growing once it holds `max_cardinality` values, so
+    high-cardinality columns (e.g. source URLs) do not pile up; its later new
+    values are kept as parsed and the column is no longer `encodable`.
+    """
+
+    DEFAULT_MAX_CARDINALITY = 10_000
+
+    def __init__(
+        self,
+        columns: Optional[Iterable[str]] = None,
+        max_cardinality: int = DEFAULT_MAX_CARDINALITY,
+    ):
+        """
+        Initializes empty dictionaries.
+
+        Args:
+            columns (Optional[Iterable[str]]): Columns to encode (normalized names), all columns by default.
+            max_cardinality (int): Maximum number of distinct values kept per column.
+        """
+        if max_cardinality < 1:
+            raise ValueError("max_cardinality must be a positive integer.")
+        self.columns = set(columns) if columns is not None else None
+        self.max_cardinality = max_cardinality
+        self._values: Dict[str, Dict[str, str]] = {}
+        self._overflowed: set = set()
+
+    def lookups(self, header: Header) -> List[Tuple[int, str, Dict[str, str]]]:
+        """Returns `(position, column, values)` of the encoded columns of a header."""
+        return [
+            (position, name, self._values.setdefault(name, {}))
+            for position, name in enumerate(header.names)
+            if self.columns is None or name in self.columns
+        ]
+
+    def intern_values(self, values: List[Any], lookups: List[Tuple[int, str, Dict[str, str]]]) -> List[Any]:
+        """Replaces the values of one parsed row by their shared instances (in place)."""
+        for position, name, lookup in lookups:
+            value = values[position]
+            shared = lookup.get(value)
+            if shared is not None:
+                values[position] = shared
+            elif value is not None:
+                if len(lookup) < self.max_cardinality:
+                    lookup[value] = value
+                else:
+                    self._overflowed.add(name)
+        return values
+
+    def categories(self, column: str) -> List[str]:
+        """Distinct values of a column, in code order."""
+        return list(self._values.get(column, ()))
+
+    def codes(self, column: str, values: Iterable[Any]) -> List[int]:
+        """
+        Categorical codes of values of an encodable column (-1 for None),
+        e.g. for `pandas.Categorical.from_codes(codes, dictionary.categories(column))`.
+        """
+        if not self.encodable(column):
+            raise ValueError(f"Column '{column}' is not dictionary encoded.")
+        index = {value: code for code, value in enumerate(self._values[column])}
+        return [-1 if value is None else index[value] for value in values]
+
+    def encodable(self, column: str) -> bool:
+        """True if every value of the column seen so far is in its dictionary."""
+        return column in self._values and column not in self._overflowed
+
+    def encoded_columns(self) -> List[str]:
+        """Columns whose values are all in their dictionaries."""
+        return [column for column in self._values if column not in self._overflowed]
@@ -0,0 +1,41 @@
+from typing import Dict, Optional
+
+from .enums.report_name import ReportName
+
+
+class SchemaRegistry:
+    """
+    Registry of known column types per report.
+
+    Column names are the normalized ones produced by the client (lower case,
+    spaces and dashes replaced by underscores). Registered types are used by
+    `Handler.convert_columns` instead of inferring them from a sample; columns
+    that are not registered are still inferred.
+    """
+
+    _schemas: Dict[ReportName, Dict[str, type]] = {}
+
+    @classmethod
+    def register(cls, report_name: ReportName, column_types: Dict[str, type]) -> None:
+        """
+        Registers (or extends) the column types of a report.
+
+        Args:
+            report_name (ReportName): Report the columns belong to.
+            column_types (Dict[str, type]): Column name to `int`, `float` or `str`.
+        """
+        unsupported = {name: type_ for name, type_ in column_types.items() if type_ not in (int, float, str)}
+        if unsupported:
+            raise ValueError(f"Unsupported column types: {unsupported}. Use int, float or str.")
+        cls._schemas.setdefault(report_name, {}).update(column_types)
+
+    @classmethod
+    def get(cls, report_name: ReportName) -> Optional[Dict[str, type]]:
+        """Returns the registered column types of a report, or None."""
+        schema = cls._schemas.get(report_name)
+        return dict(schema) if schema else None
+
+    @classmethod
+    def unregister(cls, report_name: ReportName) -> None:
+        """Removes the registered column types of a report."""
+        cls._schemas.pop(report_name, None)
@@ -0,0 +1,162 @@
+import os
+import re
+import time
+import uuid
+import hashlib
+import threading
+from typing import Iterable, Iterator, Optional
+
+from .logger import logger
+
+
+class SegmentStore:
+    """
+    Content-addressed local store of downloaded report segments.
+
+    Raw gzip bytes are kept on disk under the segment checksum reported by the
+    API, so a segment that was downloaded once is read locally afterwards. The
+    modification time of a file records its last use and drives the LRU eviction
+    applied whenever the store grows over `max_bytes`. The size is tracked as
+    segments are written, so the directory is only scanned when the cap is
+    exceeded. Checksums that cannot be used as file names are not stored.
+    """
+
+    _CHECKSUM_PATTERN = re.compile(r"^[A-Za-z0-9_\-]+$")
+    _MD5_PATTERN = re.compile(r"^[0-9a-fA-F]{32}$")
+
+    def __init__(self, directory: str, max_bytes: Optional[int] = None):
+        """
+        Initializes the store.
+
+        Args:
+            directory (str): Directory holding the segment files (created if needed).
+            max_bytes (Optional[int]): Size cap of the store, unlimited by default.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._size: Optional[int] = None  # scanned lazily, then tracked by writes
+        os.makedirs(directory, exist_ok=True)
+
+    def accepts(self, checksum: Optional[str]) -> bool:
+        """Checks whether a segment with this checksum can be stored."""
+        return bool(checksum) and self._CHECKSUM_PATTERN.match(checksum) is not None
+
+    def path_for(self, checksum: str) -> str:
+        """Returns the file path of a segment."""
+        if not self.accepts(checksum):
+            raise ValueError(f"Invalid segment checksum: {checksum!r}")
+        return os.path.join(self.directory, checksum[:2], f"{checksum}.gz")
+
+    def contains(self, checksum: Optional[str]) -> bool:
+        """Checks whether a segment is stored (never for checksums it cannot store)."""
+        if not self.accepts(checksum):
+            return False
+        return os.path.isfile(self.path_for(checksum))
+
+    def iter_chunks(self, checksum: str, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        """Reads a stored segment chunk by chunk and marks it as recently used."""
+        path = self.path_for(checksum)
+        with open(path, "rb") as f:
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+    def write(self, checksum: str, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """
+        Passes chunks through while saving them under `checksum`.
+
+        The file is published only after the whole stream was consumed and, for
+        MD5 checksums, its digest matched. Interrupted or corrupted downloads
+        leave nothing behind.
+        """
+        path = self.path_for(checksum)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        digest = hashlib.md5()
+        written = 0
+        completed = False
+        try:
+            with open(temp_path, "wb") as f:
+                for chunk in chunks:
+                    f.write(chunk)
+                    digest.update(chunk)
+                    written += len(chunk)
+                    yield chunk
+            completed = True
+        finally:
+            if completed and self._MD5_PATTERN.match(checksum) and digest.hexdigest() != checksum.lower():
+                logger.warning(f"Checksum mismatch for segment {checksum}, not stored")
+                completed = False
+            if completed:
+                os.replace(temp_path, path)
+            else:
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+        if completed and self.max_bytes is not None and self._grow(written) > self.max_bytes:
+            self.prune(max_bytes=self.max_bytes)
+
+    def size(self) -> int:
+        """Returns the total size of stored segments in bytes."""
+        return sum(size for _, size, _ in self._entries())
+
+    def _grow(self, written: int) -> int:
+        """Adds a published segment to the tracked size and returns the new total."""
+        with self._lock:
+            if self._size is None:
+                self._size = self.size()  # already includes the published segment
+            else:
+                self._size += written
+            return self._size
+
+    def prune(
+        self, max_bytes: Optional[int] = None, older_than: Optional[float] = None
+    ) -> int:
+        """
+        Evicts segments and returns how many were removed.
+
+        Args:
+            max_bytes (Optional[int]): Remove least recently used segments until the store fits.
+            older_than (Optional[float]): Remove segments not used for this many seconds.
+        """
+        removed = 0
+        with self._lock:
+            entries = sorted(self._entries(), key=lambda entry: entry[2])
+            total = sum(size for _, size, _ in entries)
+            now = time.time()
+            for path, size, used_at in entries:
+                expired = older_than is not None and now - used_at > older_than
+                oversized = max_bytes is not None and total > max_bytes
+                if not (expired or oversized):
+                    continue
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                removed += 1
+            self._size = total
+        if removed:
+            logger.info(f"Evicted {removed} segments from {self.directory}")
+        return removed
+
+    def _entries(self) -> Iterator[tuple]:
+        """Yields `(path, size, last_used)` of every stored segment."""
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith(".gz"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                yield path, stat.st_size, stat.st_mtime
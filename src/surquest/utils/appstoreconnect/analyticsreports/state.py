@@ -0,0 +1,83 @@
+import os
+import json
+import threading
+from typing import Any, Dict, Iterable, Optional
+
+from .enums.granularity import Granularity
+from .enums.report_name import ReportName
+
+
+class SyncState:
+    """
+    Watermarks of incremental syncs persisted in a local JSON file.
+
+    For every `(app_id, report_name, granularity, access_type)` the state keeps
+    the last processed processing date and the ids of the instances already
+    processed for that date, so the next sync only fetches newer instances.
+    """
+
+    def __init__(self, path: str):
+        """
+        Loads the state file if it exists.
+
+        Args:
+            path (str): Path to the JSON state file.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self._entries = json.load(f)
+
+    @staticmethod
+    def make_key(
+        app_id: str,
+        report_name: ReportName,
+        granularity: Granularity,
+        access_type: str,
+    ) -> str:
+        """Builds the state key of a report stream."""
+        return f"{app_id}|{report_name.name}|{granularity.value}|{access_type}"
+
+    def get(self, key: str) -> Dict[str, Any]:
+        """
+        Returns the watermark of a report stream.
+
+        Returns:
+            dict: `last_processing_date` (str or None) and `instance_ids` (list of str).
+        """
+        with self._lock:
+            entry = self._entries.get(key, {})
+            return {
+                "last_processing_date": entry.get("last_processing_date"),
+                "instance_ids": list(entry.get("instance_ids", [])),
+            }
+
+    def update(
+        self, key: str, last_processing_date: Optional[str], instance_ids: Iterable[str]
+    ) -> None:
+        """Sets the watermark of a report stream (call `save` to persist it)."""
+        with self._lock:
+            self._entries[key] = {
+                "last_processing_date": last_processing_date,
+                "instance_ids": sorted(set(instance_ids)),
+            }
+
+    def reset(self, key: Optional[str] = None) -> None:
+        """Forgets one report stream, or all of them when called without a key."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def save(self) -> None:
+        """Atomically writes the state file."""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with self._lock:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f, indent=2, sort_keys=True)
+            os.replace(temp_path, self.path)
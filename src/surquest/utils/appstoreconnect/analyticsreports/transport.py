@@ -0,0 +1,213 @@
+import abc
+import json
+import time
+from typing import Any, Dict, Iterator, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+
+class Transport(abc.ABC):
+    """
+    HTTP transport used by `Client`.
+
+    A transport mirrors the subset of `requests.Session` the client uses:
+    `get(url, headers=, params=, timeout=, stream=)` and `post(url, headers=,
+    json=, timeout=)` return response objects with `status_code`, `headers`,
+    `text`, `json()`, `raise_for_status()` (raising `requests.HTTPError`),
+    `iter_content(chunk_size)` and context manager support, and failures are
+    raised as `requests.RequestException`. `TransportResponse` implements such
+    a response, so an offline fake only needs to implement `get` / `post`.
+    """
+
+    @abc.abstractmethod
+    def get(self, url: str, **kwargs) -> Any:
+        """Sends a GET request."""
+
+    @abc.abstractmethod
+    def post(self, url: str, **kwargs) -> Any:
+        """Sends a POST request."""
+
+    def derive(self, settings: Any) -> "Transport":
+        """
+        Returns a transport of the same kind for another host.
+
+        `Client` calls it to build the download transport when only the API
+        transport is given. The default shares this transport (e.g. an offline
+        fake serving both hosts); network transports open their own pool.
+
+        Args:
+            settings (ConnectionSettings): Pool size, timeouts and retries of the other host.
+        """
+        return self
+
+    def close(self) -> None:
+        """Releases the connections of the transport."""
+
+
+class TransportResponse:
+    """Minimal in-memory HTTP response, e.g. for fake transports."""
+
+    def __init__(
+        self,
+        status_code: int = 200,
+        headers: Optional[Dict[str, str]] = None,
+        content: bytes = b"",
+        url: str = "",
+    ):
+        self.status_code = status_code
+        self.headers = requests.structures.CaseInsensitiveDict(headers or {})
+        self.content = content
+        self.url = url
+
+    @classmethod
+    def from_json(cls, data: Any, status_code: int = 200, **kwargs) -> "TransportResponse":
+        """Builds a JSON response."""
+        return cls(status_code, {"Content-Type": "application/json"}, json.dumps(data).encode("utf-8"), **kwargs)
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} Error for url: {self.url}", response=self)
+
+    def iter_content(self, chunk_size: int = 1) -> Iterator[bytes]:
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "TransportResponse":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+class RequestsTransport(requests.Session, Transport):
+    """Default transport: a `requests.Session` with a sized connection pool and retry policy."""
+
+    def __init__(self, settings: Optional[Any] = None):
+        """
+        Initializes the session.
+
+        Args:
+            settings (Optional[ConnectionSettings]): Pool size and retry policy (requests defaults otherwise).
+        """
+        super().__init__()
+        if settings is not None:
+            adapter = HTTPAdapter(max_retries=settings.retry(), pool_maxsize=settings.pool_size)
+            self.mount("https://", adapter)
+            self.mount("http://", adapter)
+
+    def derive(self, settings: Any) -> "RequestsTransport":
+        return RequestsTransport(settings)
+
+
+class HttpxResponse(TransportResponse):
+    """Adapts an `httpx.Response` to the `Transport` response interface."""
+
+    def __init__(self, response: "httpx.Response", streamed: bool = False):
+        super().__init__(response.status_code, dict(response.headers), url=str(response.url))
+        self._response = response
+        self._streamed = streamed
+        if not streamed:
+            self.content = response.content
+
+    def iter_content(self, chunk_size: int = 1) -> Iterator[bytes]:
+        if not self._streamed:
+            yield from super().iter_content(chunk_size)
+            return
+        try:
+            yield from self._response.iter_bytes(chunk_size)
+        except httpx.HTTPError as e:
+            raise requests.exceptions.ConnectionError(str(e)) from e
+
+    def close(self) -> None:
+        self._response.close()
+
+
+class HttpxTransport(Transport):
+    """
+    Optional transport on `httpx` that multiplexes requests over HTTP/2.
+
+    Many concurrent metadata pages and segment downloads share a few
+    connections instead of opening one TCP/TLS connection each. Requires
+    `httpx[http2]` (the `http2` extra). Responses with a status in the retry
+    list of the settings are retried with exponential backoff; connection
+    errors are retried by httpx.
+    """
+
+    def __init__(self, settings: Optional[Any] = None, http2: bool = True):
+        """
+        Initializes the client.
+
+        Args:
+            settings (Optional[ConnectionSettings]): Pool size, timeouts and retry policy.
+                                                      Defaults to `ConnectionSettings.for_api()`,
+                                                      which leaves 429 responses to the rate limiter.
+            http2 (bool): Negotiate HTTP/2 (falls back to HTTP/1.1 when the server does not support it).
+        """
+        if httpx is None:
+            raise ImportError(
+                "httpx is required for HttpxTransport: "
+                "pip install surquest-utils-appstoreconnect-analyticsreports[http2]"
+            )
+        from .connection import ConnectionSettings
+
+        self.settings = settings or ConnectionSettings.for_api()
+        self.http2 = http2
+        self.client = httpx.Client(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=self.settings.pool_size,
+                max_keepalive_connections=self.settings.pool_size,
+            ),
+            timeout=self._timeout(self.settings.timeout),
+            transport=httpx.HTTPTransport(http2=http2, retries=self.settings.retries),
+        )
+
+    def get(self, url: str, headers=None, params=None, timeout=None, stream: bool = False, **kwargs) -> HttpxResponse:
+        return self._send("GET", url, headers=headers, params=params, timeout=timeout, stream=stream)
+
+    def post(self, url: str, headers=None, json=None, timeout=None, **kwargs) -> HttpxResponse:
+        return self._send("POST", url, headers=headers, json=json, timeout=timeout, retry=False)
+
+    def derive(self, settings: Any) -> "HttpxTransport":
+        return HttpxTransport(settings, http2=self.http2)
+
+    def close(self) -> None:
+        self.client.close()
+
+    def _send(self, method: str, url: str, timeout=None, stream: bool = False, retry: bool = True, **kwargs) -> HttpxResponse:
+        request = self.client.build_request(
+            method, url, timeout=self._timeout(timeout) if timeout is not None else httpx.USE_CLIENT_DEFAULT, **kwargs
+        )
+        retries = self.settings.retries if retry else 0
+        for attempt in range(retries + 1):
+            try:
+                response = self.client.send(request, stream=stream)
+            except httpx.HTTPError as e:
+                raise requests.exceptions.ConnectionError(str(e)) from e
+            if response.status_code not in self.settings.status_forcelist or attempt == retries:
+                return HttpxResponse(response, streamed=stream)
+            response.close()
+            time.sleep(self.settings.backoff_factor * 2 ** attempt)
+
+    @staticmethod
+    def _timeout(timeout: Any) -> "httpx.Timeout":
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            return httpx.Timeout(read, connect=connect)
+        return httpx.Timeout(timeout)
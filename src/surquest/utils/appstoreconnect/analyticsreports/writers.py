@@ -0,0 +1,551 @@
+import io
+import os
+import abc
+import csv
+import gzip
+import json
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+from urllib.parse import quote
+
+from .handler import Handler
+from .logger import logger
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    pq = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+
+class ParquetWriter:
+    """
+    Writes report rows to a compressed Parquet file through Apache Arrow record batches.
+
+    Rows are buffered up to `row_group_size` and every full buffer becomes one
+    record batch (and one Parquet row group), so memory is bounded by the row
+    group size whether the input is a list or a stream of rows.
+
+    Column types come from `schema` when given, otherwise they are inferred from
+    the first row group: columns holding any string are strings, numeric columns
+    are `int64` or `float64` and columns without values default to strings.
+    Later row groups widen inferred types: `int64` columns receiving floats
+    become `float64`, columns without values so far take the type of their first
+    values and new columns are added. Parquet fixes the schema of a file, so
+    the rows written so far are rewritten (streamed row group by row group) on
+    every widening. An explicit `schema` is never widened; rows that do not fit
+    it, or strings in inferred numeric columns, raise a ValueError.
+
+    String columns listed in `dictionary_columns` are written as Arrow dictionary
+    (categorical) columns, e.g. `ValueDictionary.encoded_columns()`; pandas reads
+    them back as `category` dtype.
+    """
+
+    DEFAULT_ROW_GROUP_SIZE = 128 * 1024
+    TYPE_NAMES = {
+        "string": "string",
+        "str": "string",
+        "int": "int64",
+        "int64": "int64",
+        "float": "float64",
+        "float64": "float64",
+        "bool": "bool",
+    }
+
+    def __init__(
+        self,
+        file_path: str,
+        schema: Optional[Union["pa.Schema", Dict[str, Any]]] = None,
+        row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+        compression: str = "zstd",
+        convert_values: bool = True,
+        dictionary_columns: Optional[Iterable[str]] = None,
+    ):
+        """
+        Initializes the writer; the file is created with the first row group.
+
+        Args:
+            file_path (str): Path to the output .parquet file.
+            schema (pa.Schema | dict, optional): Arrow schema, or a mapping of column name to a
+                type name (`string`, `int64`, `float64`, `bool`) or Arrow type.
+            row_group_size (int): Number of rows per record batch / row group.
+            compression (str): Parquet compression codec (`zstd`, `snappy`, `gzip`, `none`, ...).
+            convert_values (bool): Convert numeric strings of raw TSV rows (types inferred from the first row group).
+            dictionary_columns (Optional[Iterable[str]]): String columns to dictionary encode.
+        """
+        if pa is None:
+            raise ImportError(
+                "pyarrow is required for Parquet output: "
+                "pip install surquest-utils-appstoreconnect-analyticsreports[parquet]"
+            )
+        if row_group_size < 1:
+            raise ValueError("row_group_size must be a positive integer.")
+
+        self.file_path = file_path
+        self.schema = self._to_schema(schema) if schema is not None else None
+        self.row_group_size = row_group_size
+        self.compression = compression
+        self.convert_values = convert_values
+        self.dictionary_columns = set(dictionary_columns or ())
+        self.rows_written = 0
+        self._writer = None
+        self._column_types = None
+        self._widenable = self.schema is None
+        self._null_columns: set = set()  # inferred columns without any value so far
+
+    def __enter__(self) -> "ParquetWriter":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def write_rows(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """
+        Writes rows from a list or any iterable.
+
+        Args:
+            rows (Iterable[dict]): Rows to write.
+
+        Returns:
+            int: Number of rows written by this call.
+        """
+        written = 0
+        for batch in Handler.batched(rows, self.row_group_size):
+            self.write_batch(batch)
+            written += len(batch)
+        return written
+
+    def write_batch(self, rows: List[Dict[str, Any]]) -> None:
+        """Writes one list of rows as a record batch; the rows themselves are left unchanged."""
+        if not rows:
+            return
+        columns = self._to_columns(rows)
+        if self.convert_values:
+            if self._column_types is None:
+                self._column_types = Handler.infer_column_types(rows)
+                self._column_types.update(self._schema_column_types())
+            converters = Handler.column_converters(self._column_types)
+            for name, values in columns.items():
+                convert = converters.get(name, Handler.convert_value)
+                columns[name] = [convert(value) for value in values]
+        if self._writer is None:
+            if self.schema is None:
+                kinds = self._column_kinds(columns)
+                self.schema = pa.schema([pa.field(name, self._arrow_type(k)) for name, k in kinds.items()])
+                self._null_columns = {name for name, k in kinds.items() if not k}
+            self.schema = self._with_dictionary_columns(self.schema)
+            Handler.create_directory(self.file_path)
+            self._writer = pq.ParquetWriter(
+                self.file_path, self.schema, compression=self.compression
+            )
+        elif self._widenable:
+            schema = self._widened_schema(columns)
+            if schema is not None:
+                self._rewrite(schema)
+
+        arrays = [
+            self._coerce_column(field, columns[field.name] if field.name in columns else [None] * len(rows))
+            for field in self.schema
+        ]
+        batch = pa.RecordBatch.from_arrays(arrays, schema=self.schema)
+        self._writer.write_batch(batch, row_group_size=self.row_group_size)
+        self.rows_written += len(rows)
+
+    def close(self) -> None:
+        """Finalizes the Parquet file."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+            logger.info(f"Written {self.rows_written} rows to {self.file_path}")
+
+    def _schema_column_types(self) -> Dict[str, type]:
+        """Python types of the numeric and string columns of an explicit schema."""
+        column_types = {}
+        for field in self.schema or []:
+            if pa.types.is_integer(field.type):
+                column_types[field.name] = int
+            elif pa.types.is_floating(field.type):
+                column_types[field.name] = float
+            elif pa.types.is_string(field.type) or pa.types.is_dictionary(field.type):
+                column_types[field.name] = str
+        return column_types
+
+    def _with_dictionary_columns(self, schema: "pa.Schema") -> "pa.Schema":
+        """Turns the string fields listed in `dictionary_columns` into dictionary fields."""
+        for position, field in enumerate(schema):
+            if field.name in self.dictionary_columns and pa.types.is_string(field.type):
+                schema = schema.set(position, field.with_type(pa.dictionary(pa.int32(), pa.string())))
+        return schema
+
+    @classmethod
+    def _to_schema(cls, schema: Union["pa.Schema", Dict[str, Any]]) -> "pa.Schema":
+        if isinstance(schema, pa.Schema):
+            return schema
+        fields = []
+        for name, type_ in schema.items():
+            if isinstance(type_, type):
+                type_ = type_.__name__
+            if isinstance(type_, str):
+                if type_ not in cls.TYPE_NAMES:
+                    raise ValueError(f"Unsupported column type '{type_}' for column '{name}'.")
+                type_ = pa.type_for_alias(cls.TYPE_NAMES[type_])
+            fields.append(pa.field(name, type_))
+        return pa.schema(fields)
+
+    def _widened_schema(self, columns: Dict[str, List[Any]]) -> Optional["pa.Schema"]:
+        """Returns the inferred schema widened to fit `columns`, or None when they already fit."""
+        schema = self.schema
+        for name, kinds in self._column_kinds(columns).items():
+            if not kinds:
+                if name not in schema.names:
+                    schema = schema.append(pa.field(name, pa.string()))
+                    self._null_columns.add(name)
+                continue
+            if name not in schema.names or name in self._null_columns:
+                field = pa.field(name, self._arrow_type(kinds))
+                if name in schema.names:
+                    schema = schema.set(schema.get_field_index(name), field)
+                else:
+                    schema = schema.append(field)
+                self._null_columns.discard(name)
+            elif pa.types.is_int64(schema.field(name).type) and float in kinds and kinds <= {int, float, bool}:
+                schema = schema.set(schema.get_field_index(name), pa.field(name, pa.float64()))
+        schema = self._with_dictionary_columns(schema)
+        return None if schema.equals(self.schema) else schema
+
+    def _rewrite(self, schema: "pa.Schema") -> None:
+        """Reopens the file with a wider schema, copying the row groups written so far."""
+        logger.info(f"Widening the schema of {self.file_path}, rewriting {self.rows_written} rows")
+        self._writer.close()
+        previous = f"{self.file_path}.{uuid.uuid4().hex}.tmp"
+        os.replace(self.file_path, previous)
+        try:
+            self._writer = pq.ParquetWriter(self.file_path, schema, compression=self.compression)
+            for batch in pq.ParquetFile(previous).iter_batches(batch_size=self.row_group_size):
+                columns = [
+                    batch.column(field.name).cast(field.type)
+                    if field.name in batch.schema.names
+                    else pa.nulls(batch.num_rows, field.type)
+                    for field in schema
+                ]
+                self._writer.write_batch(
+                    pa.RecordBatch.from_arrays(columns, schema=schema), row_group_size=self.row_group_size
+                )
+        finally:
+            os.remove(previous)
+        self.schema = schema
+
+    @staticmethod
+    def _to_columns(rows: List[Dict[str, Any]]) -> Dict[str, List[Any]]:
+        """Values of every column (None where a row lacks it), columns in first-seen order."""
+        names = list(dict.fromkeys(key for row in rows for key in row))
+        return {name: [row.get(name) for row in rows] for name in names}
+
+    @staticmethod
+    def _column_kinds(columns: Dict[str, List[Any]]) -> Dict[str, set]:
+        """Python types of the non-null values of every column."""
+        return {
+            name: {type(value) for value in values if value is not None}
+            for name, values in columns.items()
+        }
+
+    @staticmethod
+    def _arrow_type(kinds: set) -> "pa.DataType":
+        if not kinds or str in kinds or len(kinds - {int, float, bool}) > 0:
+            return pa.string()
+        if kinds == {bool}:
+            return pa.bool_()
+        if float in kinds:
+            return pa.float64()
+        return pa.int64()
+
+    @staticmethod
+    def _coerce_column(field: "pa.Field", values: List[Any]) -> "pa.Array":
+        if pa.types.is_dictionary(field.type):
+            values = [value if value is None or isinstance(value, str) else str(value) for value in values]
+            return pa.array(values, type=field.type.value_type).dictionary_encode().cast(field.type)
+        if pa.types.is_string(field.type):
+            values = [value if value is None or isinstance(value, str) else str(value) for value in values]
+        elif pa.types.is_integer(field.type):
+            values = [
+                int(value) if isinstance(value, float) and value.is_integer() else value
+                for value in values
+            ]
+        try:
+            if pa.types.is_integer(field.type) and any(isinstance(value, float) for value in values):
+                # pyarrow would silently truncate them
+                raise pa.ArrowInvalid("fractional values in an integer column")
+            return pa.array(values, type=field.type)
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+            raise ValueError(
+                f"Column '{field.name}' does not match its {field.type} type: {e}. "
+                "Pass an explicit `schema` to the writer."
+            ) from e
+
+
+class RowFileWriter(abc.ABC):
+    """
+    Base of the streaming text writers (`CsvWriter`, `JsonlWriter`).
+
+    Rows are accepted from any iterable and written through large buffers,
+    optionally gzip or zstd compressed. With `partition_by`, rows are split
+    Hive-style into one file per value of a column:
+    `<directory>/<column>=<value>/<file name>` (e.g. `date=2025-07-27`).
+    At most `max_open_files` partition files are kept open; a partition
+    written again after being closed is appended to.
+    """
+
+    DEFAULT_BUFFER_SIZE = 1024 * 1024
+    DEFAULT_MAX_OPEN_FILES = 64
+    COMPRESSIONS = (None, "gzip", "zstd")
+    NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+
+    def __init__(
+        self,
+        file_path: str,
+        compression: Optional[str] = None,
+        partition_by: Optional[str] = None,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        max_open_files: int = DEFAULT_MAX_OPEN_FILES,
+        compression_level: Optional[int] = None,
+    ):
+        """
+        Initializes the writer; files are created with their first row.
+
+        Args:
+            file_path (str): Path of the output file, or the file name inside every partition directory.
+            compression (Optional[str]): `gzip`, `zstd` (requires `zstandard`) or None.
+            partition_by (Optional[str]): Column to partition the output by, e.g. `date`.
+            buffer_size (int): Write buffer size in bytes.
+            max_open_files (int): Maximum number of partition files kept open at once.
+            compression_level (Optional[int]): Codec specific level (codec default otherwise).
+        """
+        if compression not in self.COMPRESSIONS:
+            raise ValueError(f"Unsupported compression '{compression}'. Use one of: {list(self.COMPRESSIONS)}")
+        if compression == "zstd" and zstandard is None:
+            raise ImportError(
+                "zstandard is required for zstd output: "
+                "pip install surquest-utils-appstoreconnect-analyticsreports[zstd]"
+            )
+        if buffer_size < 1 or max_open_files < 1:
+            raise ValueError("buffer_size and max_open_files must be positive integers.")
+
+        self.file_path = file_path
+        self.compression = compression
+        self.partition_by = partition_by
+        self.buffer_size = buffer_size
+        self.max_open_files = max_open_files
+        self.compression_level = compression_level
+        self.rows_written = 0
+        self.files_written: List[str] = []
+        self._created: set = set()
+        self._sinks: "OrderedDict[str, tuple]" = OrderedDict()  # path -> (file, sink)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def write_rows(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """
+        Writes rows from a list or any iterable.
+
+        Args:
+            rows (Iterable[dict]): Rows to write.
+
+        Returns:
+            int: Number of rows written by this call.
+        """
+        written = 0
+        for row in rows:
+            self.write_row(row)
+            written += 1
+        return written
+
+    def write_row(self, row: Dict[str, Any]) -> None:
+        """Writes one row."""
+        self._write(self._sink(self.partition_path(row)), row)
+        self.rows_written += 1
+
+    def partition_path(self, row: Dict[str, Any]) -> str:
+        """Path of the file a row belongs to."""
+        if self.partition_by is None:
+            return self.file_path
+        value = row.get(self.partition_by)
+        directory = f"{self.partition_by}={self.NULL_PARTITION if value is None else quote(str(value), safe='')}"
+        return os.path.join(os.path.dirname(self.file_path), directory, os.path.basename(self.file_path))
+
+    def close(self) -> None:
+        """Flushes and closes all files."""
+        while self._sinks:
+            _, (handle, _) = self._sinks.popitem(last=False)
+            handle.close()
+        if self.files_written:
+            logger.info(f"Written {self.rows_written} rows to {len(self.files_written)} file(s)")
+
+    def _sink(self, path: str) -> Any:
+        """Returns the open sink of a file, opening (or reopening) the file if needed."""
+        entry = self._sinks.get(path)
+        if entry is not None:
+            self._sinks.move_to_end(path)
+            return entry[1]
+
+        if len(self._sinks) >= self.max_open_files:
+            _, (oldest, _) = self._sinks.popitem(last=False)
+            oldest.close()
+
+        created = path not in self._created
+        if created:
+            if os.path.dirname(path):
+                Handler.create_directory(path)
+            self._created.add(path)
+            self.files_written.append(path)
+        handle = self._open(path, append=not created)
+        sink = self._make_sink(handle)
+        self._sinks[path] = (handle, sink)
+        if created:
+            self._start(sink)
+        return sink
+
+    def _open(self, path: str, append: bool) -> io.TextIOWrapper:
+        """Opens a buffered text stream, compressed if configured."""
+        raw = open(path, "ab" if append else "wb", buffering=0)
+        if self.compression == "gzip":
+            level = 6 if self.compression_level is None else self.compression_level
+            binary = gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=level)
+            binary = _ClosingGzipFile(binary, raw)
+        elif self.compression == "zstd":
+            level = 3 if self.compression_level is None else self.compression_level
+            binary = zstandard.ZstdCompressor(level=level).stream_writer(raw)
+        else:
+            binary = raw
+        return io.TextIOWrapper(
+            io.BufferedWriter(binary, buffer_size=self.buffer_size),
+            encoding="utf-8",
+            newline="",
+            write_through=True,
+        )
+
+    def _make_sink(self, handle: io.TextIOWrapper) -> Any:
+        """Wraps an open file into the object rows are written to."""
+        return handle
+
+    def _start(self, sink: Any) -> None:
+        """Writes what precedes the rows of a new file (e.g. a header)."""
+
+    @abc.abstractmethod
+    def _write(self, sink: Any, row: Dict[str, Any]) -> None:
+        """Writes one row to the sink of its file."""
+
+
+class _ClosingGzipFile(io.RawIOBase):
+    """Gzip stream that also closes the file it writes to."""
+
+    def __init__(self, gzip_file: gzip.GzipFile, raw: Any):
+        self._gzip_file = gzip_file
+        self._raw = raw
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        return self._gzip_file.write(data)
+
+    def close(self) -> None:
+        if not self.closed:
+            self._gzip_file.close()
+            self._raw.close()
+        super().close()
+
+
+class JsonlWriter(RowFileWriter):
+    """Streams rows to JSON Lines files (see `RowFileWriter` for buffering, compression and partitioning)."""
+
+    def _write(self, sink: io.TextIOWrapper, row: Dict[str, Any]) -> None:
+        sink.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+
+class CsvWriter(RowFileWriter):
+    """
+    Streams rows to CSV files (see `RowFileWriter` for buffering, compression and partitioning).
+
+    The header comes from `fieldnames` when given; otherwise the first
+    `lookahead` rows are buffered and the header is the union of their keys in
+    order of first appearance. Missing values are written as empty cells; keys
+    outside the header raise a ValueError (or are dropped with
+    `extrasaction="ignore"`).
+    """
+
+    DEFAULT_LOOKAHEAD = 1000
+
+    def __init__(
+        self,
+        file_path: str,
+        fieldnames: Optional[Sequence[str]] = None,
+        lookahead: int = DEFAULT_LOOKAHEAD,
+        extrasaction: str = "raise",
+        delimiter: str = ",",
+        **kwargs,
+    ):
+        """
+        Initializes the writer.
+
+        Args:
+            file_path (str): Path of the output file, or the file name inside every partition directory.
+            fieldnames (Optional[Sequence[str]]): Header, e.g. the columns of a `SchemaRegistry` schema.
+            lookahead (int): Number of rows inspected to build the header when `fieldnames` is not given.
+            extrasaction (str): `raise` or `ignore` keys that are not in the header.
+            delimiter (str): Field delimiter.
+            **kwargs: Options of `RowFileWriter` (compression, partition_by, buffer_size, ...).
+        """
+        super().__init__(file_path, **kwargs)
+        if lookahead < 1:
+            raise ValueError("lookahead must be a positive integer.")
+        self.fieldnames = list(fieldnames) if fieldnames is not None else None
+        self.lookahead = lookahead
+        self.extrasaction = extrasaction
+        self.delimiter = delimiter
+        self._pending: List[Dict[str, Any]] = []
+
+    def write_row(self, row: Dict[str, Any]) -> None:
+        """Writes one row (buffered until the header is known)."""
+        if self.fieldnames is None:
+            self._pending.append(row)
+            if len(self._pending) >= self.lookahead:
+                self._flush_pending()
+            return
+        super().write_row(row)
+
+    def close(self) -> None:
+        """Writes buffered rows, then flushes and closes all files."""
+        if self.fieldnames is None and self._pending:
+            self._flush_pending()
+        super().close()
+
+    def _flush_pending(self) -> None:
+        fieldnames: Dict[str, None] = {}
+        for row in self._pending:
+            fieldnames.update(dict.fromkeys(row))
+        self.fieldnames = list(fieldnames)
+        pending, self._pending = self._pending, []
+        for row in pending:
+            super().write_row(row)
+
+    def _make_sink(self, handle: io.TextIOWrapper) -> csv.DictWriter:
+        return csv.DictWriter(
+            handle, fieldnames=self.fieldnames, extrasaction=self.extrasaction, delimiter=self.delimiter
+        )
+
+    def _start(self, sink: csv.DictWriter) -> None:
+        sink.writeheader()
+
+    def _write(self, sink: csv.DictWriter, row: Dict[str, Any]) -> None:
+        sink.writerow(row)
@@ -1,13 +1,23 @@
 import jwt
-from datetime import datetime, timedelta
+import time
+import threading
 from typing import Optional
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
 
 class Credentials:
     """Handles creation and signing of JWT tokens for the App Store Connect API."""
 
     MAX_EXPIRATION_MINUTES = 20
+    DEFAULT_REFRESH_MARGIN_SECONDS = 60
 
-    def __init__(self, issuer_id: str, key_id: str, private_key: str):
+    def __init__(
+        self,
+        issuer_id: str,
+        key_id: str,
+        private_key: str,
+        refresh_margin_seconds: int = DEFAULT_REFRESH_MARGIN_SECONDS,
+    ):
         """
         Initialize the Credentials object.
 
@@ -15,17 +25,53 @@ class Credentials:
             issuer_id (str): The issuer ID from App Store Connect.
             key_id (str): The key ID for the API key.
             private_key (str): The private key (P8 format) used for signing the token.
+                It is parsed once here; a malformed or non-EC key raises ValueError.
+            refresh_margin_seconds (int, optional): How many seconds before expiry a cached
+                token is considered stale and gets re-signed. Defaults to 60.
         """
         if not issuer_id or not key_id or not private_key:
             raise ValueError("issuer_id, key_id, and private_key are all required.")
-        
+        if not (0 <= refresh_margin_seconds < self.MAX_EXPIRATION_MINUTES * 60):
+            raise ValueError(
+                f"Refresh margin must be between 0 and {self.MAX_EXPIRATION_MINUTES * 60 - 1} seconds."
+            )
+
         self.issuer_id = issuer_id
         self.key_id = key_id
         self.private_key = private_key
+        self.signing_key = self.load_private_key(private_key)
+        self.refresh_margin_seconds = refresh_margin_seconds
+
+        self._token: Optional[str] = None
+        self._token_expires_at: float = 0.0
+        self._token_lifetime_minutes: Optional[int] = None
+        self._token_lock = threading.Lock()
+
+    @staticmethod
+    def load_private_key(private_key: str) -> ec.EllipticCurvePrivateKey:
+        """
+        Parse a PEM encoded (.p8) private key into a reusable EC key object.
+
+        Args:
+            private_key (str): The private key in PEM (P8) format.
+
+        Returns:
+            ec.EllipticCurvePrivateKey: The loaded signing key.
+
+        Raises:
+            ValueError: If the key cannot be parsed or is not an EC key.
+        """
+        try:
+            key = serialization.load_pem_private_key(private_key.encode("utf-8"), password=None)
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"Invalid private key: {e}") from e
+        if not isinstance(key, ec.EllipticCurvePrivateKey):
+            raise ValueError("Invalid private key: ES256 signing requires an EC private key.")
+        return key
 
     def generate_token(self, expiration_minutes: int = 20) -> str:
         """
-        Generate a signed JWT token.
+        Generate a freshly signed JWT token.
 
         Args:
             expiration_minutes (int, optional): Token lifetime in minutes (max 20). Defaults to 20.
@@ -36,16 +82,62 @@ class Credentials:
         Raises:
             ValueError: If expiration exceeds the allowed maximum.
         """
+        token, _ = self._sign_token(expiration_minutes)
+        return token
+
+    def get_token(self, expiration_minutes: int = 20) -> str:
+        """
+        Return a cached JWT token, re-signing it only when it is close to expiry.
+
+        The token is shared by all threads using this object; when it goes stale
+        exactly one caller signs a new one while the others wait for it. A call
+        asking for another lifetime than the cached token's signs a new token.
+
+        Args:
+            expiration_minutes (int, optional): Lifetime of newly signed tokens in minutes (max 20). Defaults to 20.
+
+        Returns:
+            str: A signed JWT token string valid for at least `refresh_margin_seconds`.
+
+        Raises:
+            ValueError: If the lifetime is out of range or not longer than `refresh_margin_seconds`
+                (every call would sign a new token).
+        """
+        if not (0 < expiration_minutes <= self.MAX_EXPIRATION_MINUTES):
+            raise ValueError(f"Token expiration must be between 1 and {self.MAX_EXPIRATION_MINUTES} minutes.")
+        if expiration_minutes * 60 <= self.refresh_margin_seconds:
+            raise ValueError(
+                f"Token expiration of {expiration_minutes} minutes must be longer than "
+                f"the refresh margin of {self.refresh_margin_seconds} seconds."
+            )
+        with self._token_lock:
+            if (
+                self._token is None
+                or expiration_minutes != self._token_lifetime_minutes
+                or time.time() >= self._token_expires_at - self.refresh_margin_seconds
+            ):
+                self._token, self._token_expires_at = self._sign_token(expiration_minutes)
+                self._token_lifetime_minutes = expiration_minutes
+            return self._token
+
+    def invalidate_token(self) -> None:
+        """Drop the cached token so that the next `get_token` call signs a new one."""
+        with self._token_lock:
+            self._token = None
+            self._token_expires_at = 0.0
+
+    def _sign_token(self, expiration_minutes: int) -> tuple[str, int]:
+        """Signs a token and returns it together with its expiration timestamp."""
         if not (0 < expiration_minutes <= self.MAX_EXPIRATION_MINUTES):
             raise ValueError(f"Token expiration must be between 1 and {self.MAX_EXPIRATION_MINUTES} minutes.")
 
-        now = datetime.utcnow()
-        exp_time = now + timedelta(minutes=expiration_minutes)
+        now = int(time.time())
+        exp_time = now + expiration_minutes * 60
 
         payload = {
             "iss": self.issuer_id,
-            "iat": int(now.timestamp()),
-            "exp": int(exp_time.timestamp()),
+            "iat": now,
+            "exp": exp_time,
             "aud": "appstoreconnect-v1"
         }
 
@@ -55,9 +147,10 @@ class Credentials:
             "typ": "JWT"
         }
 
-        return jwt.encode(
+        token = jwt.encode(
             payload=payload,
-            key=self.private_key,
+            key=self.signing_key,
             algorithm="ES256",
             headers=headers
         )
+        return token, exp_time
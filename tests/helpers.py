@@ -0,0 +1,76 @@
+"""Shared helpers of the test suite."""
+import gzip
+from typing import Iterable, Sequence
+from urllib.parse import urlparse
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+
+from surquest.utils.appstoreconnect.analyticsreports.enums.report_name import ReportName
+from surquest.utils.appstoreconnect.analyticsreports.transport import Transport, TransportResponse
+
+
+def generate_pem() -> str:
+    """Generates a throwaway ES256 private key in PEM format."""
+    key = ec.generate_private_key(ec.SECP256R1())
+    return key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode("utf-8")
+
+
+# Generated once per test session, never read from disk
+PRIVATE_KEY = generate_pem()
+
+ISSUER_ID = "69a6de80-fd44-47e3-e053-5b8c7c11a4d1"
+KEY_ID = "5WDUV3USAU"
+APP_ID = "950949627"
+REPORT_NAME = ReportName.APP_STORE_INSTALLATION_AND_DELETION_STANDARD
+
+
+def make_segment(rows: Iterable[Sequence[str]], header: Sequence[str] = ("Date", "App Name", "Counts")) -> bytes:
+    """Builds a gzipped TSV report segment."""
+    lines = ["\t".join(header)] + ["\t".join(row) for row in rows]
+    return gzip.compress(("\n".join(lines) + "\n").encode("utf-8"))
+
+
+SEGMENT = make_segment([("2025-07-26", "App", "1"), ("2025-07-26", "App", "1"), ("2025-07-27", "App", "2")])
+
+
+class FakeTransport(Transport):
+    """
+    Serves the report graph of one app from memory.
+
+    The report has `instances` instances of the same date; only `instance-0`
+    lists a segment (`SEGMENT`), listing the segments of the others fails.
+    """
+
+    def __init__(self, instances: int = 1):
+        self.routes = {
+            f"/v1/apps/{APP_ID}/analyticsReportRequests": [{"id": "request-0"}],
+            "/v1/analyticsReportRequests/request-0/reports": [{"id": "report-0"}],
+            "/v1/analyticsReports/report-0/instances": [
+                {"id": f"instance-{n}", "attributes": {"processingDate": "2025-07-27"}} for n in range(instances)
+            ],
+            "/v1/analyticsReportInstances/instance-0/segments": [
+                {"id": "segment-0", "attributes": {"url": "https://download.example/segment-0.gz", "checksum": "x"}}
+            ],
+        }
+        self.calls = []
+        self.closed = False
+
+    def get(self, url, headers=None, **kwargs):
+        path = urlparse(url).path
+        self.calls.append((path, (headers or {}).get("Authorization")))
+        if path == "/segment-0.gz":
+            return TransportResponse(200, content=SEGMENT, url=url)
+        if path in self.routes:
+            return TransportResponse.from_json({"data": self.routes[path], "links": {}}, url=url)
+        return TransportResponse(404, url=url)
+
+    def post(self, url, **kwargs):
+        return TransportResponse(405, url=url)
+
+    def close(self):
+        self.closed = True
@@ -0,0 +1,197 @@
+import unittest
+import time
+import queue
+from unittest.mock import patch
+from helpers import APP_ID, ISSUER_ID, KEY_ID, PRIVATE_KEY, REPORT_NAME, make_segment
+from surquest.utils.appstoreconnect.credentials import Credentials
+from surquest.utils.appstoreconnect.analyticsreports.rate_limit import RateLimiter
+
+try:
+    from aiohttp import web
+    from aiohttp.test_utils import TestServer
+    from surquest.utils.appstoreconnect.analyticsreports.async_client import AsyncClient
+    from surquest.utils.appstoreconnect.analyticsreports.errors import IncompleteListingError
+except ImportError:
+    web = None
+
+
+SEGMENTS = {
+    "instance-2025-07-26": [("2025-07-26", "App", "1"), ("2025-07-27", "App", "2"), ("2025-07-26", "App", "1")],
+    "instance-2025-07-27": [("2025-07-27", "App", "5"), ("2025-07-28", "App", "")],
+}
+
+
+def create_app(requests):
+    """Local stand-in of the App Store Connect report graph and the segment download host."""
+
+    def page(request, data, next_url=None):
+        requests.append((request.path, request.headers.get("Authorization")))
+        return web.json_response({"data": data, "links": {"next": next_url} if next_url else {}})
+
+    async def report_requests(request):
+        return page(request, [{"id": "request-0"}])
+
+    async def reports(request):
+        return page(request, [{"id": "report-0"}])
+
+    async def instances(request):
+        # Two pages to exercise pagination
+        if request.query.get("page") == "2":
+            return page(request, [{"id": "instance-2025-07-27", "attributes": {"processingDate": "2025-07-27"}}])
+        next_url = str(request.url.with_query({"page": "2"}))
+        return page(request, [{"id": "instance-2025-07-26", "attributes": {"processingDate": "2025-07-26"}}], next_url)
+
+    async def segments(request):
+        instance_id = request.match_info["instance_id"]
+        url = str(request.url.with_path(f"/download/{instance_id}.gz").with_query({"sig": "1"}))
+        return page(request, [{"id": f"segment-{instance_id}", "attributes": {"url": url, "checksum": "x"}}])
+
+    async def download(request):
+        requests.append((request.path, request.headers.get("Authorization")))
+        return web.Response(body=make_segment(SEGMENTS[request.match_info["instance_id"]]))
+
+    async def reviews(request):
+        if request.query.get("cursor") == "2":
+            return page(request, [{"id": "review-3", "attributes": {"rating": 5}}])
+        next_url = str(request.url.with_query({"cursor": "2"}))
+        return page(request, [{"id": "review-1", "attributes": {"rating": 4}}, {"id": "review-2", "attributes": {}}], next_url)
+
+    app = web.Application()
+    app.router.add_get("/v1/apps/{app_id}/analyticsReportRequests", report_requests)
+    app.router.add_get("/v1/analyticsReportRequests/{request_id}/reports", reports)
+    app.router.add_get("/v1/analyticsReports/{report_id}/instances", instances)
+    app.router.add_get("/v1/analyticsReportInstances/{instance_id}/segments", segments)
+    app.router.add_get("/v1/apps/{app_id}/customerReviews", reviews)
+    app.router.add_get("/download/{instance_id}.gz", download)
+    return app
+
+
+@unittest.skipIf(web is None, "aiohttp is not installed")
+class TestAsyncClient(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.requests = []
+        self.server = TestServer(create_app(self.requests))
+        await self.server.start_server()
+        credentials = Credentials(issuer_id=ISSUER_ID, key_id=KEY_ID, private_key=PRIVATE_KEY)
+        self.client = AsyncClient(
+            credentials,
+            max_concurrency=4,
+            base_url=str(self.server.make_url("/v1")),
+            rate_limiter=RateLimiter(hourly_limit=3_600_000, burst=100),
+        )
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        await self.server.close()
+
+    async def test_list_report_dates_follows_pages(self):
+        dates = await self.client.list_report_dates(REPORT_NAME, app_id=APP_ID)
+        assert dates == ["2025-07-26", "2025-07-27"]
+
+    async def test_get_data_keeps_newest_segment_per_date(self):
+        data = await self.client.get_data(APP_ID, REPORT_NAME)
+        assert data == [
+            {"date": "2025-07-26", "app_name": "App", "counts": 1},
+            {"date": "2025-07-27", "app_name": "App", "counts": 5},
+            {"date": "2025-07-28", "app_name": "App", "counts": None},
+        ]
+        downloads = [auth for path, auth in self.requests if path.startswith("/download/")]
+        api_calls = [auth for path, auth in self.requests if path.startswith("/v1/")]
+        assert downloads == [None, None]
+        assert all(auth and auth.startswith("Bearer ") for auth in api_calls)
+
+    async def test_fetch_customer_reviews(self):
+        reviews = await self.client.fetch_customer_reviews(APP_ID)
+        assert [review["id"] for review in reviews] == ["review-1", "review-2", "review-3"]
+
+    async def test_download_failure_returns_none(self):
+        assert await self.client.download_report_to_dicts(str(self.server.make_url("/missing.gz"))) is None
+
+    async def test_segments_are_parsed_while_downloading(self):
+        self.client.DOWNLOAD_CHUNK_SIZE = 7
+        received = []
+        parse = AsyncClient._parse_chunks
+
+        def parse_chunks(chunks, normalize):
+            received.append(chunks)
+            return parse(chunks, normalize)
+
+        url = str(self.server.make_url("/download/instance-2025-07-27.gz"))
+        with patch.object(AsyncClient, "_parse_chunks", side_effect=parse_chunks):
+            rows = await self.client.download_report_to_dicts(url)
+        assert rows == [
+            {"date": "2025-07-27", "app_name": "App", "counts": "5"},
+            {"date": "2025-07-28", "app_name": "App", "counts": ""},
+        ]
+        assert len(received) == 1 and not isinstance(received[0], list)
+
+    async def test_download_waits_for_a_slow_parser(self):
+        self.client.DOWNLOAD_CHUNK_SIZE = 7
+        self.client.PARSE_QUEUE_CHUNKS = 1
+        sizes = []
+
+        class RecordingQueue(queue.Queue):
+            def put(self, item, block=True, timeout=None):
+                super().put(item, block, timeout)
+                sizes.append(self.qsize())
+
+            def put_nowait(self, item):
+                super().put_nowait(item)
+                sizes.append(self.qsize())
+
+        parse = AsyncClient._parse_chunks
+
+        def slow_parse_chunks(chunks, normalize):
+            def slow():
+                for chunk in chunks:
+                    time.sleep(0.005)
+                    yield chunk
+            return parse(slow(), normalize)
+
+        url = str(self.server.make_url("/download/instance-2025-07-26.gz"))
+        with patch.object(queue, "Queue", RecordingQueue), \
+                patch.object(AsyncClient, "_parse_chunks", side_effect=slow_parse_chunks):
+            rows = await self.client.download_report_to_dicts(url)
+        assert len(rows) == 3
+        assert len(sizes) > 3 and max(sizes) == 1
+
+    async def test_parser_failure_does_not_block_the_download(self):
+        self.client.DOWNLOAD_CHUNK_SIZE = 7
+        self.client.PARSE_QUEUE_CHUNKS = 1
+        url = str(self.server.make_url(f"/v1/apps/{APP_ID}/customerReviews"))  # not gzip
+        assert await self.client.download_report_to_dicts(url) is None
+
+    async def test_parsers_run_on_an_executor_sized_to_the_concurrency(self):
+        url = str(self.server.make_url("/download/instance-2025-07-27.gz"))
+        assert await self.client.download_report_to_dicts(url)
+        assert self.client._executor._max_workers == self.client.max_concurrency
+        await self.client.close()
+        assert self.client._executor is None
+
+    async def test_failing_later_page_raises(self):
+        pages = [{"data": [{"id": "report-0"}], "links": {"next": "https://example.com/page-2"}}, None]
+        with patch.object(self.client, "_get_request", side_effect=pages):
+            with self.assertRaises(IncompleteListingError):
+                await self.client.read_report_for_specific_request("request-0")
+
+    async def test_rate_limiter_is_awaited_before_taking_a_slot(self):
+        assert self.client._semaphore is None  # created inside the running loop
+        held = []
+        reserve = self.client.rate_limiter.reserve
+
+        def reserve_and_record():
+            semaphore = self.client._semaphore
+            held.append(semaphore is not None and semaphore.locked())
+            return reserve()
+
+        client = AsyncClient(
+            self.client.credentials,
+            max_concurrency=1,
+            base_url=self.client.base_url,
+            rate_limiter=self.client.rate_limiter,
+        )
+        self.client = client  # closed by asyncTearDown
+        with patch.object(client.rate_limiter, "reserve", side_effect=reserve_and_record):
+            await client.read_report_requests(APP_ID)
+        assert held == [False]
@@ -0,0 +1,65 @@
+import unittest
+import tempfile
+import shutil
+import os
+from unittest.mock import patch
+from surquest.utils.appstoreconnect.analyticsreports.cache import MetadataCache
+
+
+class TestMetadataCache(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "metadata.sqlite")
+        self.cache = MetadataCache(self.path)
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_make_key_is_stable(self):
+        first = MetadataCache.make_key("apps/1/analyticsReportRequests", {"b": 1, "a": 2})
+        second = MetadataCache.make_key("apps/1/analyticsReportRequests", {"a": 2, "b": 1})
+        assert first == second
+        assert MetadataCache.make_key("x") == MetadataCache.make_key("x", {})
+
+    def test_set_and_get(self):
+        self.cache.set("reports", "key", [{"id": "1"}])
+        assert self.cache.get("reports", "key") == [{"id": "1"}]
+        assert self.cache.get("reports", "missing") is None
+        assert self.cache.get("instances", "key") is None
+
+    def test_entries_persist_across_connections(self):
+        self.cache.set("report_requests", "key", [{"id": "1"}])
+        self.cache.close()
+        self.cache = MetadataCache(self.path)
+        assert self.cache.get("report_requests", "key") == [{"id": "1"}]
+
+    def test_ttl_per_level(self):
+        self.cache.set("instances", "key", [{"id": "1"}])
+        self.cache.set("segments", "key", [{"id": "2"}])
+        later = self.cache._connection.execute("SELECT MAX(fetched_at) FROM metadata").fetchone()[0] + 2 * 60 * 60
+        with patch("surquest.utils.appstoreconnect.analyticsreports.cache.time.time", return_value=later):
+            assert self.cache.get("instances", "key") is None
+            assert self.cache.get("segments", "key") == [{"id": "2"}]
+            assert self.cache.get("segments", "key", max_age=60) is None
+            assert self.cache.prune() == 1
+        assert self.cache.get("segments", "key") == [{"id": "2"}]
+
+    def test_invalidate(self):
+        self.cache.set("reports", "a", [{"id": "1"}])
+        self.cache.set("reports", "b", [{"id": "2"}])
+        self.cache.set("instances", "a", [{"id": "3"}])
+        self.cache.invalidate("reports", "a")
+        assert self.cache.get("reports", "a") is None
+        assert self.cache.get("reports", "b") is not None
+        self.cache.invalidate("reports")
+        assert self.cache.get("reports", "b") is None
+        self.cache.invalidate()
+        assert self.cache.get("instances", "a") is None
+
+    def test_unknown_level(self):
+        with self.assertRaises(ValueError):
+            MetadataCache(":memory:", ttls={"unknown": 1})
+        with self.assertRaises(ValueError):
+            self.cache.set("unknown", "key", [])
@@ -1,23 +1,81 @@
 import unittest
-from pathlib import Path
+import gzip
+import csv
+import io
+from unittest.mock import patch
+from helpers import APP_ID, ISSUER_ID, KEY_ID, PRIVATE_KEY, REPORT_NAME, make_segment
 from surquest.utils.appstoreconnect.credentials import Credentials
 from surquest.utils.appstoreconnect.analyticsreports.client import Client
+from surquest.utils.appstoreconnect.analyticsreports.rows import ValueDictionary
+from surquest.utils.appstoreconnect.analyticsreports.rate_limit import RateLimiter
 from surquest.utils.appstoreconnect.analyticsreports.enums.granularity import (
     Granularity,
 )
-from surquest.utils.appstoreconnect.analyticsreports.enums.report_name import ReportName
 
 
-ISSUER_ID = "69a6de80-fd44-47e3-e053-5b8c7c11a4d1"
-KEY_ID = "5WDUV3USAU"
-PRIVATE_KEY_PATH = Path.cwd() / "credentials" / "key.p8"
-PRIVATE_KEY = PRIVATE_KEY_PATH.read_text()
-APP_ID = "950949627"
-REPORT_NAME = ReportName.APP_STORE_INSTALLATION_AND_DELETION_STANDARD
 GRANULARITY = Granularity.DAILY
 DATE = "2025-07-27"
 
 
+class FakeResponse:
+    """Minimal stand-in for a streamed `requests.Response`."""
+
+    def __init__(self, body: bytes = b"", status_code: int = 200, json_data=None):
+        self.body = body
+        self.status_code = status_code
+        self.json_data = json_data
+        self.headers = {}
+        self.text = ""
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            import requests
+
+            raise requests.exceptions.HTTPError(response=self)
+
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self.body), chunk_size):
+            yield self.body[start:start + chunk_size]
+
+    def json(self):
+        return self.json_data
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def fake_graph_paginate(calls, dates=("2025-07-26", "2025-07-27")):
+    """Builds a `_paginate` replacement serving a small report graph and recording calls."""
+
+    def paginate(resource_path, params=None):
+        calls.append(resource_path)
+        if resource_path.endswith("/analyticsReportRequests"):
+            return [{"id": "request-0"}]
+        if resource_path.endswith("/reports"):
+            return [{"id": "report-0"}]
+        if resource_path.endswith("/instances"):
+            return [{"id": f"instance-{date}", "attributes": {"processingDate": date}} for date in dates]
+        if resource_path.endswith("/segments"):
+            instance_id = resource_path.split("/")[1]
+            return [{
+                "id": f"segment-{instance_id}",
+                "attributes": {
+                    "url": f"https://example.com/{instance_id}?sig={len(calls)}",
+                    "checksum": f"checksum-{instance_id}",
+                    "sizeInBytes": 1,
+                },
+            }]
+        raise AssertionError(f"Unexpected resource: {resource_path}")
+
+    return paginate
+
+
 class TestClientIntegration(unittest.TestCase):
 
     @classmethod
@@ -116,4 +174,513 @@ class TestClientIntegration(unittest.TestCase):
         if reviews:
             first = reviews[0]
             assert isinstance(first, dict), f"Expected dict, got {type(first)}"
-            assert "id" in first, "Each review should contain an 'id' field"
\ No newline at end of file
+            assert "id" in first, "Each review should contain an 'id' field"
+
+
+class TestClientStreaming(unittest.TestCase):
+
+    def setUp(self):
+        self.client = Client(
+            credentials=Credentials(
+                issuer_id=ISSUER_ID, key_id=KEY_ID, private_key=PRIVATE_KEY
+            )
+        )
+        self.client.DOWNLOAD_CHUNK_SIZE = 7  # force rows to span several chunks
+
+    def test_iter_report_rows_streams_normalized_rows(self):
+        body = make_segment([("2025-07-27", "App ñ", "1"), ("2025-07-28", "App ñ", "2")])
+        with patch.object(self.client.download_session, "get", return_value=FakeResponse(body)):
+            rows = self.client.iter_report_rows("https://example.com/segment.gz")
+            assert next(rows) == {"date": "2025-07-27", "app_name": "App ñ", "counts": "1"}
+            assert list(rows) == [{"date": "2025-07-28", "app_name": "App ñ", "counts": "2"}]
+
+    def test_iter_report_rows_compact_rows_share_header(self):
+        body = make_segment([("2025-07-27", "App", "1"), ("2025-07-28", "App", "2")])
+        with patch.object(self.client.download_session, "get", return_value=FakeResponse(body)):
+            rows = list(self.client.iter_report_rows("https://example.com/segment.gz", compact=True))
+        assert rows[0].header is rows[1].header
+        assert rows[1]["counts"] == "2"
+        assert rows[0].to_dict() == {"date": "2025-07-27", "app_name": "App", "counts": "1"}
+
+    def test_iter_report_rows_interns_values_through_dictionary(self):
+        body = make_segment([("2025-07-27", "App", "1"), ("2025-07-28", "App", "2")])
+        self.client.value_dictionary = ValueDictionary(columns=["app_name"])
+        with patch.object(self.client.download_session, "get", return_value=FakeResponse(body)):
+            rows = list(self.client.iter_report_rows("https://example.com/segment.gz"))
+        assert rows[0]["app_name"] is rows[1]["app_name"]
+        assert self.client.value_dictionary.categories("app_name") == ["App"]
+
+    def test_iter_csv_rows_matches_dict_reader(self):
+        text = "Date\tApp Name\n2025-07-27\tApp\n\n2025-07-28\n2025-07-29\tApp\textra\n"
+        expected = [
+            {key.lower().replace(" ", "_") if key else key: value for key, value in row.items()}
+            for row in csv.DictReader(io.StringIO(text), delimiter="\t")
+        ]
+        assert list(Client._iter_csv_rows(io.StringIO(text), normalize=True)) == expected
+        compact = list(Client._iter_csv_rows(io.StringIO(text), normalize=True, compact=True))
+        assert [tuple(row.values()) for row in compact] == [("2025-07-27", "App"), ("2025-07-28", None), ("2025-07-29", "App")]
+
+    def test_iter_decompressed_lines_handles_multiple_members(self):
+        body = gzip.compress(b"a\tb\n1\t") + gzip.compress(b"2\n3\t4")
+        chunks = [body[i:i + 5] for i in range(0, len(body), 5)]
+        lines = list(Client._iter_decompressed_lines(chunks))
+        assert lines == ["a\tb\n", "1\t2\n", "3\t4"]
+
+    def test_iter_decompressed_lines_truncated_stream_raises(self):
+        body = make_segment([("2025-07-27", "App", "1")] * 50)
+        with self.assertRaises(EOFError):
+            list(Client._iter_decompressed_lines([body[:-10]]))
+
+    def test_download_report_to_dicts_collects_stream(self):
+        body = make_segment([("2025-07-27", "App", "1")], header=("Date", "App-Name", "Counts"))
+        with patch.object(self.client.download_session, "get", return_value=FakeResponse(body)):
+            rows = self.client.download_report_to_dicts("https://example.com/segment.gz", normalize=False)
+        assert rows == [{"Date": "2025-07-27", "App-Name": "App", "Counts": "1"}]
+
+    def test_downloads_use_their_own_session_without_authorization(self):
+        body = make_segment([("2025-07-27", "App", "1")])
+        with patch.object(self.client.download_session, "get", return_value=FakeResponse(body)) as get, \
+                patch.object(self.client.session, "get") as api_get:
+            self.client.download_report_to_dicts("https://example.com/segment.gz")
+        api_get.assert_not_called()
+        assert "Authorization" not in get.call_args.kwargs["headers"]
+        assert "Authorization" not in self.client.download_session.headers
+        assert get.call_args.kwargs["timeout"] == self.client.download_settings.timeout
+
+    def test_api_requests_share_a_rate_limiter_and_retry_429(self):
+        other = Client(self.client.credentials)
+        assert other.rate_limiter is self.client.rate_limiter
+
+        sleeps = []
+        client = Client(self.client.credentials, rate_limiter=RateLimiter(sleep=sleeps.append))
+        limited = FakeResponse(status_code=429)
+        limited.headers = {"Retry-After": "0", "X-Rate-Limit": "user-hour-lim:3600000;user-hour-rem:10;"}
+        ok = FakeResponse(json_data={"data": []})
+        with patch.object(client.session, "get", side_effect=[limited, ok]) as get:
+            assert client._get_request("https://example.com/v1/apps") == {"data": []}
+        assert get.call_count == 2
+        assert sleeps
+        assert client.rate_limiter.hourly_limit == 3600000
+
+    def test_download_report_to_dicts_returns_none_on_http_error(self):
+        with patch.object(self.client.download_session, "get", return_value=FakeResponse(status_code=403)):
+            assert self.client.download_report_to_dicts("https://example.com/segment.gz") is None
+
+    def _serve_segments(self, segments):
+        urls = {f"https://example.com/{name}": {"url": f"https://example.com/{name}?sig=1"} for name in segments}
+        bodies = {f"https://example.com/{name}?sig=1": make_segment(rows) for name, rows in segments.items()}
+        discover = patch.object(self.client, "_discover_segments", return_value=urls)
+        get = patch.object(self.client.download_session, "get", side_effect=lambda url, **kwargs: FakeResponse(bodies[url]))
+        return discover, get
+
+    def test_iter_data_matches_get_data_for_ongoing_reports(self):
+        segments = {
+            "older": [("2025-07-26", "App", "1"), ("2025-07-27", "App", "2"), ("2025-07-26", "App", "1")],
+            "newer": [("2025-07-27", "App", "5"), ("2025-07-28", "App", "")],
+        }
+        discover, get = self._serve_segments(segments)
+        with discover, get:
+            expected = self.client.get_data(APP_ID, REPORT_NAME, dates={DATE})
+        discover, get = self._serve_segments(segments)
+        with discover, get:
+            streamed = list(self.client.iter_data(APP_ID, REPORT_NAME, dates={DATE}))
+
+        assert streamed == expected
+        assert streamed == [
+            {"date": "2025-07-26", "app_name": "App", "counts": 1},
+            {"date": "2025-07-27", "app_name": "App", "counts": 5},
+            {"date": "2025-07-28", "app_name": "App", "counts": None},
+        ]
+
+    def test_iter_data_snapshot_in_batches(self):
+        segments = {
+            "first": [("2025-07-26", "App", "1"), ("2025-07-27", "App", "2")],
+            "second": [("2025-07-27", "App", "2"), ("2025-07-27", "App", "3")],
+        }
+        discover, get = self._serve_segments(segments)
+        with discover, get:
+            batches = list(self.client.iter_data(
+                APP_ID, REPORT_NAME, dates={DATE}, access_type="ONE_TIME_SNAPSHOT", batch_size=2
+            ))
+
+        assert [len(batch) for batch in batches] == [2, 1]
+        assert [row["counts"] for batch in batches for row in batch] == [1, 2, 3]
+
+    def test_iter_data_without_deduplication(self):
+        segments = {
+            "first": [("2025-07-26", "App", "1"), ("2025-07-27", "App", "2")],
+            "second": [("2025-07-27", "App", "2")],
+        }
+        discover, get = self._serve_segments(segments)
+        with discover, get:
+            rows = list(self.client.iter_data(
+                APP_ID, REPORT_NAME, dates={DATE}, access_type="ONE_TIME_SNAPSHOT", deduplicate=False
+            ))
+
+        assert [row["counts"] for row in rows] == [1, 2, 2]
+
+    def test_get_data_parallel_downloads_keep_url_order(self):
+        import time
+
+        client = Client(credentials=self.client.credentials, max_workers=4)
+        assert client.download_session.get_adapter("https://example.com")._pool_maxsize == 10
+        sized = Client(self.client.credentials, max_workers=32, max_metadata_workers=16)
+        assert sized.download_session.get_adapter("https://example.com")._pool_maxsize == 32
+        assert sized.session.get_adapter("https://example.com")._pool_maxsize == 16
+
+        segments = {
+            f"segment-{i}": [(f"2025-07-{20 + i // 2}", "App", str(i))] for i in range(8)
+        }
+        urls = {f"https://example.com/{name}": {"url": f"https://example.com/{name}?sig=1"} for name in segments}
+        bodies = {f"https://example.com/{name}?sig=1": make_segment(rows) for name, rows in segments.items()}
+
+        def slow_get(url, **kwargs):
+            time.sleep(0.05 if url.endswith("0?sig=1") else 0)  # the oldest segment arrives last
+            return FakeResponse(bodies[url])
+
+        with patch.object(client, "_discover_segments", return_value=urls), \
+                patch.object(client.download_session, "get", side_effect=slow_get):
+            data = client.get_data(APP_ID, REPORT_NAME, dates={DATE})
+
+        assert sorted((row["date"], row["counts"]) for row in data) == [
+            ("2025-07-20", 1), ("2025-07-21", 3), ("2025-07-22", 5), ("2025-07-23", 7)
+        ]
+
+    def test_parallel_downloads_are_bounded_by_max_workers(self):
+        import time
+
+        client = Client(credentials=self.client.credentials, max_workers=2)
+        segments = {f"https://example.com/{i}": {"url": f"https://example.com/{i}?sig=1"} for i in range(8)}
+        started = []
+        seen_while_first_pending = []
+
+        def download(segment):
+            started.append(segment["url"])
+            if segment["url"].startswith("https://example.com/0?"):
+                time.sleep(0.1)  # the others finish meanwhile but must not all be fetched
+                seen_while_first_pending.append(len(started))
+            return [{"url": segment["url"]}]
+
+        with patch.object(client, "_download_segment", side_effect=download):
+            results = list(client._download_segments(segments))
+
+        assert [url_key for url_key, _ in results] == list(segments)
+        assert seen_while_first_pending == [2]
+        assert len(started) == 8
+
+
+class TestClientMetadataFanOut(unittest.TestCase):
+
+    def setUp(self):
+        self.credentials = Credentials(
+            issuer_id=ISSUER_ID, key_id=KEY_ID, private_key=PRIVATE_KEY
+        )
+
+    @staticmethod
+    def _patch_graph(client):
+        import random
+        import time
+
+        def jitter():
+            time.sleep(random.random() / 200)
+
+        def instances(report_id, params=None):
+            jitter()
+            return [
+                {"id": f"{report_id}-{date}-{n}", "attributes": {"processingDate": date}}
+                for date in ("2025-07-27", "2025-07-26", "2025-07-25", "2025-07-24")
+                for n in range(2)
+            ]
+
+        def segments(instance_id, params=None):
+            jitter()
+            return [{"attributes": {"url": f"https://example.com/{instance_id}/{n}?sig=1"}} for n in range(2)]
+
+        def reports(request_id, params=None):
+            jitter()
+            return [{"id": f"{request_id}-report-{n}"} for n in range(3)]
+
+        return (
+            patch.object(client, "read_report_requests", return_value=[{"id": f"request-{n}"} for n in range(4)]),
+            patch.object(client, "read_report_for_specific_request", side_effect=reports),
+            patch.object(client, "read_list_of_instances_of_report", side_effect=instances),
+            patch.object(client, "read_segments_for_report", side_effect=segments),
+        )
+
+    def _discover(self, client, dates):
+        requests_, reports, instances, segments = self._patch_graph(client)
+        with requests_, reports, instances, segments:
+            report_ids = client._fetch_report_ids(APP_ID, REPORT_NAME)
+            instance_ids = client._fetch_instance_ids(report_ids, GRANULARITY, dates)
+            return report_ids, instance_ids, client._fetch_segment_urls(instance_ids)
+
+    def test_parallel_discovery_matches_serial(self):
+        dates = ["2025-07-25", "2025-07-26", "2025-07-27"]
+        serial = self._discover(Client(self.credentials), dates)
+        parallel = self._discover(Client(self.credentials, max_metadata_workers=8), dates)
+        assert parallel == serial
+        assert list(parallel[2].keys()) == list(serial[2].keys())
+        assert len(parallel[2]) == 4 * 3 * 3 * 2 * 2
+
+    def test_instances_are_listed_once_per_report(self):
+        client = Client(self.credentials)
+        requests_, reports, instances, segments = self._patch_graph(client)
+        with requests_, reports, instances as listing, segments:
+            report_ids = client._fetch_report_ids(APP_ID, REPORT_NAME)
+            all_instances = client._list_instances(report_ids, GRANULARITY)
+            dates = client._instance_dates(all_instances)
+            instance_ids = client._select_instance_ids(all_instances, {"2025-07-27", "2025-07-25"})
+
+        assert listing.call_count == len(report_ids) == 12
+        assert dates == ["2025-07-24", "2025-07-25", "2025-07-26", "2025-07-27"]
+        assert instance_ids[:4] == [
+            "request-0-report-0-2025-07-25-0", "request-0-report-0-2025-07-25-1",
+            "request-0-report-0-2025-07-27-0", "request-0-report-0-2025-07-27-1",
+        ]
+
+    def test_missing_date_raises(self):
+        from surquest.utils.appstoreconnect.analyticsreports.errors import NoValidIdsError
+
+        instances = {"report": [{"id": "1", "attributes": {"processingDate": "2025-07-27"}}]}
+        with self.assertRaises(NoValidIdsError):
+            Client._select_instance_ids(instances, {"2025-07-28"})
+
+    def test_parallel_discovery_raises_first_error_in_input_order(self):
+        from surquest.utils.appstoreconnect.analyticsreports.errors import NoValidIdsError
+
+        client = Client(self.credentials, max_metadata_workers=8)
+
+        def instances(report_id, params=None):
+            if report_id in ("report-1", "report-3"):
+                raise NoValidIdsError(report_id)
+            return [{"id": report_id}]
+
+        with patch.object(client, "read_list_of_instances_of_report", side_effect=instances):
+            with self.assertRaises(NoValidIdsError) as error:
+                client._fetch_instance_ids([f"report-{n}" for n in range(5)], GRANULARITY, ["2025-07-27"])
+        assert str(error.exception) == "report-1"
+
+
+class TestClientMetadataCache(unittest.TestCase):
+
+    def setUp(self):
+        from surquest.utils.appstoreconnect.analyticsreports.cache import MetadataCache
+
+        self.credentials = Credentials(
+            issuer_id=ISSUER_ID, key_id=KEY_ID, private_key=PRIVATE_KEY
+        )
+        self.cache = MetadataCache(":memory:")
+
+    def tearDown(self):
+        self.cache.close()
+
+    def _discover(self, client, calls):
+        with patch.object(client, "_paginate", side_effect=fake_graph_paginate(calls)):
+            return client._discover_segments(APP_ID, REPORT_NAME, GRANULARITY, None, "ONGOING")
+
+    def test_rerun_only_lists_segments(self):
+        from surquest.utils.appstoreconnect.analyticsreports.cache import MetadataCache
+
+        first_calls, second_calls = [], []
+        first = self._discover(Client(self.credentials, cache=self.cache), first_calls)
+        second = self._discover(Client(self.credentials, cache=self.cache), second_calls)
+
+        assert len(first_calls) == 5
+        # Segment URLs are signed and expire, they are never served from the cache
+        assert [call.rsplit("/", 1)[-1] for call in second_calls] == ["segments", "segments"]
+        assert list(first.keys()) == list(second.keys())
+        assert first != second  # freshly signed URLs
+        assert self.cache.get("segments", MetadataCache.make_key(Client._segments_path("instance-2025-07-26"))) is None
+
+    def test_incomplete_listing_is_not_cached(self):
+        from surquest.utils.appstoreconnect.analyticsreports.cache import MetadataCache
+        from surquest.utils.appstoreconnect.analyticsreports.errors import IncompleteListingError
+
+        client = Client(self.credentials, cache=self.cache)
+        pages = [
+            FakeResponse(json_data={"data": [{"id": "report-0"}], "links": {"next": "https://example.com/page-2"}}),
+            FakeResponse(status_code=500),
+        ]
+        with patch.object(client.session, "get", side_effect=pages):
+            with self.assertRaises(IncompleteListingError):
+                client.read_list_of_instances_of_report("report-0")
+
+        assert self.cache.get("instances", MetadataCache.make_key("analyticsReports/report-0/instances")) is None
+
+    def test_without_cache_every_run_fetches(self):
+        calls = []
+        self._discover(Client(self.credentials), calls)
+        self._discover(Client(self.credentials), calls)
+        assert len(calls) == 10
+
+
+class TestClientSegmentStore(unittest.TestCase):
+
+    def setUp(self):
+        import tempfile
+        from surquest.utils.appstoreconnect.analyticsreports.cache import MetadataCache
+        from surquest.utils.appstoreconnect.analyticsreports.segment_store import SegmentStore
+
+        self.temp_dir = tempfile.mkdtemp()
+        self.credentials = Credentials(
+            issuer_id=ISSUER_ID, key_id=KEY_ID, private_key=PRIVATE_KEY
+        )
+        self.cache = MetadataCache(":memory:")
+        self.store = SegmentStore(self.temp_dir)
+        self.bodies = {
+            "instance-2025-07-26": make_segment([("2025-07-26", "App", "1")]),
+            "instance-2025-07-27": make_segment([("2025-07-27", "App", "2")]),
+        }
+
+    def tearDown(self):
+        import shutil
+
+        self.cache.close()
+        shutil.rmtree(self.temp_dir)
+
+    def _run(self, client, calls, downloads):
+        import hashlib
+
+        paginate = fake_graph_paginate(calls)
+
+        def paginate_with_md5(resource_path, params=None):
+            result = paginate(resource_path, params)
+            if resource_path.endswith("/segments"):
+                instance_id = resource_path.split("/")[1]
+                result[0]["attributes"]["checksum"] = hashlib.md5(self.bodies[instance_id]).hexdigest()
+            return result
+
+        def get(url, **kwargs):
+            downloads.append(url)
+            return FakeResponse(self.bodies[url.split("/")[-1].split("?")[0]])
+
+        with patch.object(client, "_paginate", side_effect=paginate_with_md5), \
+                patch.object(client.download_session, "get", side_effect=get):
+            return client.get_data(APP_ID, REPORT_NAME)
+
+    def test_stored_segments_skip_the_network(self):
+        client = Client(self.credentials, cache=self.cache, segment_store=self.store)
+        first_calls, first_downloads = [], []
+        second_calls, second_downloads = [], []
+        first = self._run(client, first_calls, first_downloads)
+        second = self._run(client, second_calls, second_downloads)
+
+        assert len(first_downloads) == 2
+        assert second_downloads == []
+        # The cached listing stands in for the segment listing: every checksum is stored locally
+        assert not any(call.endswith("/segments") for call in second_calls)
+        assert first == second == [
+            {"date": "2025-07-26", "app_name": "App", "counts": 1},
+            {"date": "2025-07-27", "app_name": "App", "counts": 2},
+        ]
+
+    def test_unstorable_checksums_are_streamed_as_is(self):
+        client = Client(self.credentials, segment_store=self.store)
+        body = self.bodies["instance-2025-07-26"]
+        with patch.object(client.download_session, "get", return_value=FakeResponse(body)) as get:
+            for _ in range(2):
+                rows = list(client.iter_report_rows("https://example.com/segment.gz", checksum="ab+cd/ef=="))
+                assert [row["counts"] for row in rows] == ["1"]
+        assert get.call_count == 2
+        assert self.store.size() == 0
+
+    def test_store_without_cache_still_skips_downloads(self):
+        client = Client(self.credentials, segment_store=self.store)
+        calls, first_downloads, second_downloads = [], [], []
+        self._run(client, calls, first_downloads)
+        self._run(client, calls, second_downloads)
+        assert len(first_downloads) == 2
+        assert second_downloads == []
+
+
+class TestClientSync(unittest.TestCase):
+
+    def setUp(self):
+        import tempfile
+        from surquest.utils.appstoreconnect.analyticsreports.state import SyncState
+
+        self.temp_dir = tempfile.mkdtemp()
+        self.state = SyncState(f"{self.temp_dir}/sync.json")
+        self.client = Client(
+            credentials=Credentials(
+                issuer_id=ISSUER_ID, key_id=KEY_ID, private_key=PRIVATE_KEY
+            )
+        )
+
+    def tearDown(self):
+        import shutil
+
+        shutil.rmtree(self.temp_dir)
+
+    def _sync(self, dates, calls=None, downloads=None, failing=()):
+        calls = [] if calls is None else calls
+        downloads = [] if downloads is None else downloads
+        paginate = fake_graph_paginate(calls, dates)
+
+        def get(url, **kwargs):
+            downloads.append(url)
+            date = url.split("instance-")[1].split("?")[0]
+            return FakeResponse(make_segment([(date, "App", date[-2:])]))
+
+        def paginate_or_fail(resource_path, params=None):
+            if resource_path.split("/")[1] in failing:
+                # Listings of failing instances go through the real HTTP error handling
+                with patch.object(self.client.session, "get", return_value=FakeResponse(status_code=500)):
+                    return Client._paginate(self.client, resource_path, params)
+            return paginate(resource_path, params)
+
+        with patch.object(self.client, "_paginate", side_effect=paginate_or_fail), \
+                patch.object(self.client.download_session, "get", side_effect=get):
+            return list(self.client.sync_data(APP_ID, REPORT_NAME, self.state))
+
+    def test_sync_only_fetches_new_instances(self):
+        from surquest.utils.appstoreconnect.analyticsreports.state import SyncState
+
+        first = self._sync(("2025-07-27", "2025-07-26"))
+        assert [row["date"] for row in first] == ["2025-07-26", "2025-07-27"]
+
+        key = SyncState.make_key(APP_ID, REPORT_NAME, GRANULARITY, "ONGOING")
+        assert SyncState(self.state.path).get(key) == {
+            "last_processing_date": "2025-07-27", "instance_ids": ["instance-2025-07-27"]
+        }
+
+        calls, downloads = [], []
+        assert self._sync(("2025-07-27", "2025-07-26"), calls, downloads) == []
+        assert downloads == []
+        assert not any(call.endswith("/segments") for call in calls)
+
+        downloads = []
+        third = self._sync(("2025-07-28", "2025-07-27", "2025-07-26"), downloads=downloads)
+        assert third == [{"date": "2025-07-28", "app_name": "App", "counts": 28}]
+        assert len(downloads) == 1
+
+    def test_failed_segment_listing_is_synced_again(self):
+        from surquest.utils.appstoreconnect.analyticsreports.errors import NoValidUrlsError
+        from surquest.utils.appstoreconnect.analyticsreports.state import SyncState
+
+        dates = ("2025-07-27", "2025-07-26")
+        with self.assertRaises(NoValidUrlsError):
+            self._sync(dates, failing={"instance-2025-07-26"})
+
+        key = SyncState.make_key(APP_ID, REPORT_NAME, GRANULARITY, "ONGOING")
+        assert self.state.get(key)["last_processing_date"] is None
+
+        rows = self._sync(dates)
+        assert [row["date"] for row in rows] == ["2025-07-26", "2025-07-27"]
+        assert self.state.get(key)["last_processing_date"] == "2025-07-27"
+
+    def test_interrupted_sync_keeps_watermark(self):
+        from surquest.utils.appstoreconnect.analyticsreports.state import SyncState
+
+        def get(url, **kwargs):
+            date = url.split("instance-")[1].split("?")[0]
+            return FakeResponse(make_segment([(date, "App", "1")]))
+
+        with patch.object(self.client, "_paginate", side_effect=fake_graph_paginate([])), \
+                patch.object(self.client.download_session, "get", side_effect=get):
+            rows = self.client.sync_data(APP_ID, REPORT_NAME, self.state)
+            next(rows)
+            rows.close()
+
+        key = SyncState.make_key(APP_ID, REPORT_NAME, GRANULARITY, "ONGOING")
+        assert self.state.get(key)["last_processing_date"] is None
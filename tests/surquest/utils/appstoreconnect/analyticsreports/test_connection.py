@@ -0,0 +1,23 @@
+import unittest
+from surquest.utils.appstoreconnect.analyticsreports.connection import ConnectionSettings
+
+
+class TestConnectionSettings(unittest.TestCase):
+
+    def test_session_uses_pool_size_and_retry_policy(self):
+        settings = ConnectionSettings(pool_size=24, retries=5, backoff_factor=0.5, read_timeout=120)
+        adapter = settings.create_session().get_adapter("https://api.appstoreconnect.apple.com")
+        assert adapter._pool_maxsize == 24
+        assert adapter.max_retries.total == 5
+        assert adapter.max_retries.backoff_factor == 0.5
+        assert 429 in adapter.max_retries.status_forcelist
+        assert settings.timeout == (10.0, 120)
+
+    def test_download_defaults_allow_longer_reads(self):
+        assert ConnectionSettings.for_downloads().read_timeout > ConnectionSettings.for_api().read_timeout
+
+    def test_invalid_settings(self):
+        with self.assertRaises(ValueError):
+            ConnectionSettings(pool_size=0)
+        with self.assertRaises(ValueError):
+            ConnectionSettings(retries=-1)
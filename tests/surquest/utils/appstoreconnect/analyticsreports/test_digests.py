@@ -0,0 +1,41 @@
+import unittest
+import hashlib
+from surquest.utils.appstoreconnect.analyticsreports.digests import DigestSet
+
+
+class TestDigestSet(unittest.TestCase):
+
+    @staticmethod
+    def digest(value) -> bytes:
+        return hashlib.blake2b(str(value).encode(), digest_size=16).digest()
+
+    def test_add_and_contains(self):
+        digests = DigestSet()
+        assert digests.add(self.digest(1)) is True
+        assert digests.add(self.digest(1)) is False
+        assert self.digest(1) in digests
+        assert self.digest(2) not in digests
+        assert len(digests) == 1
+
+    def test_grows_and_keeps_entries(self):
+        digests = DigestSet(capacity=4)
+        for n in range(5000):
+            assert digests.add(self.digest(n))
+        assert len(digests) == 5000
+        assert all(self.digest(n) in digests for n in range(5000))
+        assert digests.nbytes <= 16 * 5000 * 2 / DigestSet.MAX_LOAD
+
+    def test_all_zero_digest(self):
+        digests = DigestSet()
+        zero = bytes(16)
+        assert zero not in digests
+        assert digests.add(zero) is True
+        assert digests.add(zero) is False
+        assert zero in digests
+        assert len(digests) == 1
+
+    def test_invalid_digest_size(self):
+        with self.assertRaises(ValueError):
+            DigestSet(digest_size=4)
+        with self.assertRaises(ValueError):
+            DigestSet().add(b"short")
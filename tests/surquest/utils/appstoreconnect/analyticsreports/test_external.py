@@ -0,0 +1,125 @@
+import os
+import copy
+import heapq
+import random
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from surquest.utils.appstoreconnect.analyticsreports.external import ExternalDeduplicator
+from surquest.utils.appstoreconnect.analyticsreports.handler import Handler
+from surquest.utils.appstoreconnect.analyticsreports.errors import SpillLimitError
+
+
+class TestExternalDeduplicator(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        rng = random.Random(7)
+        self.rows = [
+            {
+                "date": f"2025-07-{rng.randint(20, 27)}",
+                "app_name": rng.choice(["App", "Other App"]),
+                "counts": str(rng.randint(0, 30)),
+            }
+            for _ in range(2000)
+        ]
+        self.rows[5].pop("counts")  # missing keys are filled with None
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def expected(self):
+        return Handler.deduplicate_data(copy.deepcopy(self.rows))
+
+    def test_matches_in_memory_deduplication(self):
+        engine = ExternalDeduplicator(max_rows_in_memory=100, partitions=4, temp_dir=self.temp_dir)
+        result = list(engine.deduplicate(copy.deepcopy(self.rows)))
+        assert result == self.expected()
+        assert os.listdir(self.temp_dir) == []
+
+    def test_small_input_stays_in_memory(self):
+        engine = ExternalDeduplicator(max_rows_in_memory=10_000, temp_dir=self.temp_dir)
+        assert list(engine.deduplicate(copy.deepcopy(self.rows))) == self.expected()
+
+    def test_resplits_large_partitions(self):
+        rows = [{"date": "2025-07-26", "counts": str(n)} for n in range(500)] * 2
+        engine = ExternalDeduplicator(max_rows_in_memory=20, partitions=2, temp_dir=self.temp_dir)
+        result = list(engine.deduplicate(rows, convert_types=False))
+        assert result == [{"date": "2025-07-26", "counts": str(n)} for n in range(500)]
+
+    def test_merges_runs_in_bounded_passes(self):
+        rows = [{"date": f"2025-07-{20 + n % 8}", "counts": str(n)} for n in range(600)] * 2
+        engine = ExternalDeduplicator(
+            max_rows_in_memory=10, partitions=3, temp_dir=self.temp_dir, sort_by="date"
+        )
+        merged = []
+        original = heapq.merge
+
+        def merge(*iterables, **kwargs):
+            merged.append(len(iterables))
+            return original(*iterables, **kwargs)
+
+        with patch("surquest.utils.appstoreconnect.analyticsreports.external.heapq.merge", merge):
+            result = list(engine.deduplicate(rows, convert_types=False))
+
+        expected = sorted(rows[:600], key=lambda row: row["date"])
+        assert result == expected
+        assert len(merged) > 1, "expected intermediate merge passes"
+        assert max(merged) <= 3
+        assert os.listdir(self.temp_dir) == []
+
+    def test_sort_by_date(self):
+        expected = sorted(self.expected(), key=lambda row: row["date"])
+        for limit in (100, 10_000):
+            engine = ExternalDeduplicator(
+                max_rows_in_memory=limit, partitions=3, temp_dir=self.temp_dir, sort_by="date"
+            )
+            assert list(engine.deduplicate(copy.deepcopy(self.rows))) == expected
+
+    def test_temp_space_limit(self):
+        engine = ExternalDeduplicator(max_rows_in_memory=100, temp_dir=self.temp_dir, max_temp_bytes=1024)
+        with self.assertRaises(SpillLimitError):
+            list(engine.deduplicate(copy.deepcopy(self.rows)))
+        assert os.listdir(self.temp_dir) == []
+
+    def test_temp_space_limit_counts_only_live_files(self):
+        import pickle
+
+        key_order = list(self.rows[0].keys())
+        spilled = sum(
+            len(pickle.dumps((seq, tuple(row.get(k) for k in key_order)), protocol=pickle.HIGHEST_PROTOCOL))
+            for seq, row in enumerate(self.rows)
+        )
+        # Consumed partitions are deleted, so the files on disk stay below one full
+        # spill plus the partition being split again, although about four times
+        # the spill is written in total (split, two re-splits and the runs)
+        engine = ExternalDeduplicator(
+            max_rows_in_memory=100, partitions=4, temp_dir=self.temp_dir, max_temp_bytes=int(spilled * 1.5)
+        )
+        rows = copy.deepcopy(self.rows)
+        assert list(engine.deduplicate(rows, convert_types=False)) == Handler.deduplicate_data(
+            copy.deepcopy(self.rows), convert_types=False
+        )
+
+    def test_temp_space_limit_is_checked_while_writing(self):
+        import pickle
+
+        engine = ExternalDeduplicator(max_rows_in_memory=100, temp_dir=self.temp_dir, max_temp_bytes=1024)
+        written = []
+        original = engine._write
+
+        def write(handle, record):
+            original(handle, record)
+            written.append(len(pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL)))
+
+        engine._write = write
+        with self.assertRaises(SpillLimitError):
+            list(engine.deduplicate(copy.deepcopy(self.rows)))
+        assert 0 < sum(written) <= 1024
+
+    def test_invalid_limits(self):
+        with self.assertRaises(ValueError):
+            ExternalDeduplicator(max_rows_in_memory=0)
+        with self.assertRaises(ValueError):
+            ExternalDeduplicator(partitions=1)
@@ -6,6 +6,7 @@ import json
 import csv
 import warnings
 from surquest.utils.appstoreconnect.analyticsreports.handler import Handler
+from surquest.utils.appstoreconnect.analyticsreports.rows import Header, Row
 from surquest.utils.appstoreconnect.analyticsreports.errors import (
     PayloadFormatError,
     NoValidIdsError,
@@ -162,6 +163,21 @@ class TestHandler(unittest.TestCase):
         result = Handler.get_distinct_values(data, 'country')
         assert sorted(result) == sorted(['USA', 'UK'])
 
+    def test_group_by_matches_filtering_per_value(self):
+
+        data = [
+            {'id': 1, 'country': 'USA'},
+            {'id': 2, 'country': 'UK'},
+            {'id': 3, 'country': 'USA'},
+            {'id': 4, 'country': None},
+            {'id': 5},
+        ]
+
+        result = Handler.group_by(data, 'country')
+        assert list(result) == ['USA', 'UK']
+        for value, rows in result.items():
+            assert rows == Handler.filter_list_of_dicts(data, 'country', value)
+
     def test_filter_list_of_dicts(self):
 
         data = [
@@ -181,4 +197,101 @@ class TestHandler(unittest.TestCase):
             value='UK'
         )
         
-        assert result == expected
\ No newline at end of file
+        assert result == expected
+
+    def test_iter_deduplicated_is_lazy(self):
+        data = iter([{"a": 1, "b": 2}, {"a": 1, "b": 2}, {"b": 3, "a": 1}])
+        result = Handler.iter_deduplicated(data)
+        assert next(result) == {"a": 1, "b": 2}
+        assert list(result) == [{"a": 1, "b": 3}]
+
+    def test_batched(self):
+        assert list(Handler.batched(range(5), 2)) == [[0, 1], [2, 3], [4]]
+
+    def test_infer_column_types(self):
+        data = [
+            {"date": "2025-07-27", "territory": "US", "counts": "1", "ratio": "0.5", "empty": ""},
+            {"date": "2025-07-28", "territory": "CZ", "counts": "2", "ratio": "1", "empty": None},
+        ]
+        assert Handler.infer_column_types(data) == {
+            "date": str, "territory": str, "counts": int, "ratio": float, "empty": None
+        }
+
+    def test_convert_columns(self):
+        data = [
+            {"territory": "US", "counts": "1", "ratio": "0.5", "version": "1.2"},
+            {"territory": "", "counts": "", "ratio": "2", "version": "1.2.3"},
+        ]
+        Handler.convert_columns(data)
+        assert data == [
+            {"territory": "US", "counts": 1, "ratio": 0.5, "version": "1.2"},
+            {"territory": None, "counts": None, "ratio": 2.0, "version": "1.2.3"},
+        ]
+
+    def test_convert_columns_with_known_types_and_outliers(self):
+        data = [{"counts": "1"}, {"counts": "n/a"}, {"counts": "2.5"}]
+        Handler.convert_columns(data, column_types={"counts": int}, sample_size=1)
+        assert data == [{"counts": 1}, {"counts": "n/a"}, {"counts": 2.5}]
+
+    def test_columns_unsettled_by_the_sample_are_converted_per_value(self):
+        data = [
+            {"counts": "1", "late": ""},
+            {"counts": "2", "late": "7", "new": "0.5"},
+            {"counts": "3", "late": "n/a", "new": "x"},
+        ]
+        Handler.convert_columns(data, sample_size=1)
+        assert data == [
+            {"counts": 1, "late": None},
+            {"counts": 2, "late": 7, "new": 0.5},
+            {"counts": 3, "late": "n/a", "new": "x"},
+        ]
+
+        rows = [{"counts": "1"}, {"counts": "2", "late": "3"}]
+        assert list(Handler.iter_converted(iter(rows), sample_size=1)) == [
+            {"counts": 1}, {"counts": 2, "late": 3}
+        ]
+
+    def test_convert_value(self):
+        assert [Handler.convert_value(v) for v in ("1", "2.5", "", "1.2.3", "US", None, 4)] == [
+            1, 2.5, None, "1.2.3", "US", None, 4
+        ]
+
+    def test_iter_converted_streams_after_sample(self):
+        rows = iter([{"counts": str(n)} for n in range(5)])
+        result = Handler.iter_converted(rows, sample_size=2)
+        assert [row["counts"] for row in result] == [0, 1, 2, 3, 4]
+
+    def test_compact_rows_are_converted_into_new_rows(self):
+        header = Header(["Date", "Counts"])
+        rows = [Row(header, ("2025-07-27", "3")), Row(header, ("2025-07-28", ""))]
+        converted = list(Handler.iter_converted(rows))
+        assert converted == [{"date": "2025-07-27", "counts": 3}, {"date": "2025-07-28", "counts": None}]
+        assert all(isinstance(row, Row) and row.header is header for row in converted)
+        assert rows[0]["counts"] == "3"
+
+        data = list(rows)
+        assert Handler.convert_columns(data) == converted
+        assert Handler.deduplicate_data(list(rows)) == converted
+
+    def test_deduplicate_data_without_type_conversion(self):
+        data = [{"id": "1"}, {"id": "1"}, {"id": ""}]
+        assert Handler.deduplicate_data(data, convert_types=False) == [{"id": "1"}, {"id": ""}]
+
+    def test_digest_deduplication_matches_exact(self):
+        data = [
+            {"id": 1, "name": "Alice", "score": 2.0},
+            {"id": 1, "name": "Alice", "score": 2},
+            {"id": 1, "name": "Alice", "score": None},
+            {"id": 2, "name": "1", "score": 2.5},
+            {"id": 2, "name": 1, "score": 2.5},
+            {"name": "Alice", "id": 1, "score": 2.0},
+        ]
+        exact = list(Handler.iter_deduplicated(data))
+        digested = list(Handler.iter_deduplicated(data, digest_size=16))
+        assert digested == exact
+        assert len(exact) == 4
+
+    def test_row_digest_is_fixed_size(self):
+        assert len(Handler.row_digest(["a" * 1000, 1, None])) == 16
+        assert Handler.row_digest([1, "a"]) == Handler.row_digest([1.0, "a"])
+        assert Handler.row_digest(["ab", "c"]) != Handler.row_digest(["a", "bc"])
@@ -0,0 +1,52 @@
+import unittest
+from surquest.utils.appstoreconnect.analyticsreports.handler import Handler
+from surquest.utils.appstoreconnect.analyticsreports.index import RowIndex
+
+
+class TestRowIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.rows = [
+            {"date": f"2025-07-{20 + n % 7}", "territory": ["US", "GB", "CZ"][n % 3], "counts": n}
+            for n in range(30)
+        ]
+        self.rows.append({"date": None, "territory": "US", "counts": 99})
+        self.rows.append({"territory": "DE", "counts": 100})
+        self.index = RowIndex(self.rows, ["date", "territory", "counts"])
+
+    def test_queries_match_filter_list_of_dicts(self):
+        queries = [
+            ("date", "2025-07-22", "=="),
+            ("date", "2025-07-22", "!="),
+            ("date", "2025-07-22", "<"),
+            ("date", "2025-07-22", "<="),
+            ("date", "2025-07-22", ">"),
+            ("date", "2025-07-22", ">="),
+            ("territory", ["US", "CZ", "XX"], "in"),
+            ("territory", {"US"}, "not in"),
+            ("territory", "USA", "in"),
+            ("counts", 10, ">="),
+            ("counts", 3.5, "<"),
+        ]
+        for attribute, value, comparator in queries:
+            with self.subTest(attribute=attribute, comparator=comparator):
+                assert self.index.query(attribute, value, comparator) == Handler.filter_list_of_dicts(
+                    [row for row in self.rows if attribute not in row or row[attribute] is not None]
+                    if comparator in ("<", "<=", ">", ">=") else self.rows,
+                    attribute, value, comparator,
+                )
+
+    def test_groups_and_values(self):
+        groups = self.index.groups("territory")
+        assert list(groups) == ["US", "GB", "CZ", "DE"]
+        assert groups["DE"] == [self.rows[-1]]
+        assert self.index.values("date")[:2] == ["2025-07-20", "2025-07-21"]
+
+    def test_invalid_queries(self):
+        with self.assertRaises(ValueError):
+            self.index.query("app_name", "App")
+        with self.assertRaises(ValueError):
+            self.index.query("date", "2025-07-22", "~")
+        mixed = RowIndex([{"value": 1}, {"value": "a"}], ["value"])
+        with self.assertRaises(ValueError):
+            mixed.query("value", 0, ">")
@@ -0,0 +1,111 @@
+import unittest
+import tempfile
+from pathlib import Path
+from helpers import APP_ID, ISSUER_ID, KEY_ID, PRIVATE_KEY, REPORT_NAME, SEGMENT, FakeTransport
+from surquest.utils.appstoreconnect.credentials import Credentials
+from surquest.utils.appstoreconnect.analyticsreports.client import Client
+from surquest.utils.appstoreconnect.analyticsreports.metrics import (
+    Metrics,
+    PrometheusTextfileExporter,
+    RunStats,
+    TimedIterator,
+)
+from surquest.utils.appstoreconnect.analyticsreports.rate_limit import RateLimiter
+
+
+class TestRunStats(unittest.TestCase):
+
+    def test_aggregates_counters_and_timings_per_labels(self):
+        stats = RunStats()
+        stats.increment("http_requests", host="api", status="200")
+        stats.increment("http_requests", 2, host="download", status="200")
+        stats.observe("stage_seconds", 0.5, stage="parse")
+        stats.observe("stage_seconds", 1.5, stage="parse")
+        with stats.time("stage_seconds", stage="deduplicate"):
+            pass
+
+        assert stats.counter("http_requests") == 3
+        assert stats.counter("http_requests", host="download") == 2
+        assert stats.seconds("stage_seconds", stage="parse") == 2.0
+        assert stats.timings[("stage_seconds", (("stage", "parse"),))] == [2, 2.0, 1.5]
+        summary = stats.summary()
+        assert summary["counters"] == {"http_requests": 3}
+        assert set(summary["stage_seconds"]) == {"parse", "deduplicate"}
+        assert summary["dedup_ratio"] is None
+
+    def test_base_metrics_ignore_measurements(self):
+        metrics = Metrics()
+        metrics.increment("pages")
+        with metrics.time("stage_seconds", stage="parse"):
+            pass
+
+    def test_timed_iterator_counts_items_and_sizes(self):
+        chunks = TimedIterator([b"ab", b"cde"], sized=True)
+        assert list(chunks) == [b"ab", b"cde"]
+        assert (chunks.items, chunks.size) == (2, 5)
+        assert chunks.seconds >= 0
+
+
+class TestPrometheusTextfileExporter(unittest.TestCase):
+
+    def test_writes_counters_and_summaries(self):
+        stats = RunStats()
+        stats.increment("http_requests", host="api", status="200")
+        stats.observe("stage_seconds", 0.25, stage="parse")
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "asc.prom"
+            PrometheusTextfileExporter(str(path), prefix="asc", labels={"app_id": 'a"1'}).write(stats)
+            text = path.read_text()
+            assert [p.name for p in Path(directory).iterdir()] == ["asc.prom"]
+
+        assert "# TYPE asc_http_requests_total counter" in text
+        assert 'asc_http_requests_total{app_id="a\\"1",host="api",status="200"} 1' in text
+        assert "# TYPE asc_stage_seconds summary" in text
+        assert 'asc_stage_seconds_count{app_id="a\\"1",stage="parse"} 1' in text
+        assert 'asc_stage_seconds_sum{app_id="a\\"1",stage="parse"} 0.25' in text
+        assert 'asc_stage_seconds_max{app_id="a\\"1",stage="parse"} 0.25' in text
+        assert "asc_last_run_timestamp_seconds" in text
+
+
+class TestClientMetrics(unittest.TestCase):
+
+    def setUp(self):
+        self.stats = RunStats()
+        self.client = Client(
+            Credentials(issuer_id=ISSUER_ID, key_id=KEY_ID, private_key=PRIVATE_KEY),
+            transport=FakeTransport(instances=2),
+            rate_limiter=RateLimiter(hourly_limit=3_600_000, burst=100),
+            metrics=self.stats,
+        )
+
+    def test_get_data_reports_requests_segments_and_stages(self):
+        data = self.client.get_data(APP_ID, REPORT_NAME)
+
+        assert len(data) == 2
+        stats = self.stats
+        assert stats.counter("http_requests", host="api", status="200") == 4
+        assert stats.counter("http_requests", host="api", status="404") == 1
+        assert stats.counter("http_requests", host="download", status="200") == 1
+        assert stats.counter("pages") == 4
+        assert stats.counter("segments", source="network") == 1
+        assert stats.counter("segment_bytes") == len(SEGMENT)
+        assert stats.counter("rows_parsed") == 3
+        assert stats.counter("dedup_input_rows") == 3
+        assert stats.counter("rows_emitted") == 2
+        assert stats.dedup_ratio == 1 / 3
+        assert set(stats.summary()["stage_seconds"]) == {
+            "discovery", "report_ids", "instances", "segments",
+            "download", "decompress", "parse", "deduplicate",
+        }
+
+    def test_iter_data_counts_streamed_rows(self):
+        rows = list(self.client.iter_data(APP_ID, REPORT_NAME))
+
+        assert len(rows) == 2
+        assert self.stats.counter("dedup_input_rows") == 3
+        assert self.stats.counter("rows_emitted") == 2
+        assert self.stats.counter("rows_parsed") == 3
+
+    def test_metrics_do_not_change_the_rows(self):
+        plain = Client(self.client.credentials, transport=FakeTransport(instances=2), rate_limiter=self.client.rate_limiter)
+        assert self.client.get_data(APP_ID, REPORT_NAME) == plain.get_data(APP_ID, REPORT_NAME)
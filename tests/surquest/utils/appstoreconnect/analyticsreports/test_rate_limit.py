@@ -0,0 +1,98 @@
+import unittest
+import threading
+from surquest.utils.appstoreconnect.analyticsreports.rate_limit import RateLimiter
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.limiter = RateLimiter(
+            hourly_limit=3600, burst=2, safety_margin=0, clock=self.clock, sleep=self.clock.sleep
+        )
+
+    def test_burst_then_refill_rate(self):
+        assert self.limiter.acquire() == 0
+        assert self.limiter.acquire() == 0
+        assert self.limiter.acquire() == 1.0  # 3600 requests per hour -> one per second
+        assert self.clock.sleeps == [1.0]
+
+    def test_reserve_returns_wait_without_sleeping(self):
+        assert [self.limiter.reserve() for _ in range(4)] == [0, 0, 1.0, 2.0]
+        assert self.clock.sleeps == []
+
+    def test_adapts_to_rate_limit_header(self):
+        self.limiter.update({"X-Rate-Limit": "user-hour-lim:7200;user-hour-rem:100;"}, 200)
+        assert self.limiter.hourly_limit == 7200
+        assert self.limiter.remaining == 100
+        assert [self.limiter.acquire() for _ in range(3)] == [0, 0, 0.5]
+        assert self.limiter.remaining == 97
+
+    def test_remaining_quota_caps_refills_until_the_window_resets(self):
+        self.clock.now = 100.0
+        self.limiter.update({"X-Rate-Limit": "user-hour-lim:3600;user-hour-rem:1;"}, 200)
+        assert self.limiter.acquire() == 0
+        self.clock.now = 1000.0  # refilling at the hourly rate would allow 900 more requests
+        assert self.limiter.acquire() == 2700.0  # waits until the hour window ends at 3700
+        assert self.limiter.remaining is None
+        assert self.limiter.acquire() == 0  # a new window starts with a full burst
+
+    def test_reserve_waits_for_the_window_when_the_quota_is_used(self):
+        self.limiter.update({"X-Rate-Limit": "user-hour-rem:1;"}, 200)
+        assert [self.limiter.reserve() for _ in range(2)] == [0, 3600.0]
+
+    def test_default_bucket_does_not_pace_while_quota_is_left(self):
+        limiter = RateLimiter(clock=self.clock, sleep=self.clock.sleep)
+        assert sum(limiter.acquire() for _ in range(200)) == 0
+        limiter.update({"X-Rate-Limit": "user-hour-lim:3600;user-hour-rem:3500;"}, 200)
+        assert sum(limiter.acquire() for _ in range(100)) == 0
+        assert self.clock.sleeps == []
+
+    def test_paces_once_the_quota_runs_low(self):
+        limiter = RateLimiter(safety_margin=10, clock=self.clock, sleep=self.clock.sleep)
+        limiter.update({"X-Rate-Limit": "user-hour-lim:3600;user-hour-rem:13;"}, 200)
+        assert [limiter.acquire() for _ in range(5)] == [0, 0, 0, 1.0, 1.0]
+        assert limiter.remaining == 8
+
+    def test_429_pauses_for_retry_after(self):
+        self.limiter.update({"Retry-After": "30"}, 429)
+        assert self.limiter.acquire() == 30.0
+        self.limiter.update({}, 429)
+        assert self.limiter.acquire() == self.limiter.default_retry_after
+
+    def test_parse_headers(self):
+        assert RateLimiter.parse_header("user-hour-lim:3500;user-hour-rem:3499;") == {
+            "user-hour-lim": 3500, "user-hour-rem": 3499,
+        }
+        assert RateLimiter.parse_header(None) == {}
+        assert RateLimiter.parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+        assert RateLimiter.parse_retry_after("soon") is None
+
+    def test_shared_per_credentials(self):
+        class Credentials:
+            pass
+
+        first, second = Credentials(), Credentials()
+        limiters = []
+        threads = [threading.Thread(target=lambda: limiters.append(RateLimiter.shared(first))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert all(limiter is limiters[0] for limiter in limiters)
+        assert RateLimiter.shared(second) is not limiters[0]
+        assert not hasattr(first, "rate_limiter")
@@ -0,0 +1,54 @@
+import unittest
+from surquest.utils.appstoreconnect.analyticsreports.rows import Header, Row, ValueDictionary
+
+
+class TestRows(unittest.TestCase):
+
+    def setUp(self):
+        self.header = Header(["Date", "App Name", "Page-Type"])
+
+    def test_header_normalizes_names_once(self):
+        assert self.header.names == ("date", "app_name", "page_type")
+        assert Header(["App Name"], normalize=False).names == ("App Name",)
+
+    def test_row_behaves_like_read_only_dict(self):
+        row = Row(self.header, ("2025-07-27", "App", "Store"))
+        assert row["app_name"] == "App"
+        assert row.get("missing") is None
+        assert "date" in row and "missing" not in row
+        assert list(row.items()) == [("date", "2025-07-27"), ("app_name", "App"), ("page_type", "Store")]
+        assert list(row.values()) == ["2025-07-27", "App", "Store"]
+        assert list(row.keys()) == ["date", "app_name", "page_type"]
+        assert dict(row) == {"date": "2025-07-27", "app_name": "App", "page_type": "Store"}
+        assert row == {"date": "2025-07-27", "app_name": "App", "page_type": "Store"}
+        assert type(row.to_dict()) is dict
+        with self.assertRaises(TypeError):
+            row["date"] = "2025-07-28"
+
+    def test_row_has_no_instance_dict(self):
+        assert not hasattr(Row(self.header, ()), "__dict__")
+
+
+class TestValueDictionary(unittest.TestCase):
+
+    def setUp(self):
+        self.header = Header(["Territory", "Source Info"])
+
+    def parse(self, dictionary, rows):
+        lookups = dictionary.lookups(self.header)
+        return [dictionary.intern_values(["".join(value) for value in row], lookups) for row in rows]
+
+    def test_repeated_values_share_one_instance(self):
+        dictionary = ValueDictionary(columns=["territory"])
+        first, second = self.parse(dictionary, [(["U", "S"], ["a"]), (["U", "S"], ["b"])])
+        assert first[0] is second[0]
+        assert dictionary.categories("territory") == ["US"]
+        assert dictionary.categories("source_info") == []
+
+    def test_codes_and_cardinality_limit(self):
+        dictionary = ValueDictionary(max_cardinality=2)
+        self.parse(dictionary, [(["US"], ["a"]), (["GB"], ["b"]), (["US"], ["c"])])
+        assert dictionary.codes("territory", ["GB", None, "US"]) == [1, -1, 0]
+        assert dictionary.encoded_columns() == ["territory"]
+        with self.assertRaises(ValueError):
+            dictionary.codes("source_info", ["a"])
@@ -0,0 +1,24 @@
+import unittest
+from surquest.utils.appstoreconnect.analyticsreports.schemas import SchemaRegistry
+from surquest.utils.appstoreconnect.analyticsreports.enums.report_name import ReportName
+
+
+class TestSchemaRegistry(unittest.TestCase):
+
+    def tearDown(self):
+        SchemaRegistry.unregister(ReportName.APP_SESSIONS_STANDARD)
+
+    def test_register_and_get(self):
+        assert SchemaRegistry.get(ReportName.APP_SESSIONS_STANDARD) is None
+        SchemaRegistry.register(ReportName.APP_SESSIONS_STANDARD, {"counts": int})
+        SchemaRegistry.register(ReportName.APP_SESSIONS_STANDARD, {"territory": str})
+        assert SchemaRegistry.get(ReportName.APP_SESSIONS_STANDARD) == {"counts": int, "territory": str}
+
+    def test_get_returns_a_copy(self):
+        SchemaRegistry.register(ReportName.APP_SESSIONS_STANDARD, {"counts": int})
+        SchemaRegistry.get(ReportName.APP_SESSIONS_STANDARD)["counts"] = str
+        assert SchemaRegistry.get(ReportName.APP_SESSIONS_STANDARD) == {"counts": int}
+
+    def test_unsupported_type(self):
+        with self.assertRaises(ValueError):
+            SchemaRegistry.register(ReportName.APP_SESSIONS_STANDARD, {"counts": list})
@@ -0,0 +1,86 @@
+import unittest
+import tempfile
+import shutil
+import hashlib
+import os
+import time
+from surquest.utils.appstoreconnect.analyticsreports.segment_store import SegmentStore
+
+
+class TestSegmentStore(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = SegmentStore(self.temp_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _put(self, store, payload: bytes) -> str:
+        checksum = hashlib.md5(payload).hexdigest()
+        assert b"".join(store.write(checksum, [payload[:3], payload[3:]])) == payload
+        return checksum
+
+    def test_write_and_read(self):
+        checksum = self._put(self.store, b"segment-bytes")
+        assert self.store.contains(checksum)
+        assert b"".join(self.store.iter_chunks(checksum, chunk_size=4)) == b"segment-bytes"
+        assert self.store.size() == len(b"segment-bytes")
+
+    def test_checksum_mismatch_is_not_stored(self):
+        checksum = hashlib.md5(b"expected").hexdigest()
+        list(self.store.write(checksum, [b"corrupted"]))
+        assert not self.store.contains(checksum)
+
+    def test_interrupted_write_is_not_stored(self):
+        checksum = hashlib.md5(b"abcdef").hexdigest()
+        chunks = self.store.write(checksum, [b"abc", b"def"])
+        next(chunks)
+        chunks.close()
+        assert not self.store.contains(checksum)
+        assert self.store.size() == 0
+
+    def test_lru_eviction_over_size_cap(self):
+        store = SegmentStore(self.temp_dir, max_bytes=25)
+        first = self._put(store, b"a" * 10)
+        second = self._put(store, b"b" * 10)
+        past = time.time() - 60
+        os.utime(store.path_for(first), (past, past))
+        os.utime(store.path_for(second), (past - 60, past - 60))
+        list(store.iter_chunks(second))  # reading marks the segment as recently used
+        third = self._put(store, b"c" * 10)
+        assert not store.contains(first)
+        assert store.contains(second)
+        assert store.contains(third)
+
+    def test_prune_older_than(self):
+        old = self._put(self.store, b"old")
+        new = self._put(self.store, b"new")
+        past = time.time() - 3600
+        os.utime(self.store.path_for(old), (past, past))
+        assert self.store.prune(older_than=60) == 1
+        assert not self.store.contains(old)
+        assert self.store.contains(new)
+        assert self.store.prune(max_bytes=0) == 1
+        assert self.store.size() == 0
+
+    def test_size_is_only_scanned_over_the_cap(self):
+        from unittest.mock import patch
+
+        store = SegmentStore(self.temp_dir, max_bytes=25)
+        with patch.object(store, "_entries", wraps=store._entries) as entries:
+            self._put(store, b"a" * 10)  # first write scans the existing store
+            self._put(store, b"b" * 10)
+            assert entries.call_count == 1
+            self._put(store, b"c" * 10)  # over the cap: scanned again and pruned
+            assert entries.call_count == 2
+        assert store.size() == 20
+        assert store._size == 20
+
+    def test_invalid_checksum(self):
+        with self.assertRaises(ValueError):
+            self.store.path_for("../etc/passwd")
+        assert not self.store.contains(None)
+        assert not self.store.accepts("../etc/passwd")
+        assert not self.store.contains("../etc/passwd")
+        assert not self.store.contains("ab+cd/ef==")
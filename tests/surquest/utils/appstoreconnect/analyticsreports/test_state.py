@@ -0,0 +1,46 @@
+import unittest
+import tempfile
+import shutil
+import os
+from surquest.utils.appstoreconnect.analyticsreports.state import SyncState
+from surquest.utils.appstoreconnect.analyticsreports.enums.granularity import Granularity
+from surquest.utils.appstoreconnect.analyticsreports.enums.report_name import ReportName
+
+
+class TestSyncState(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "state", "sync.json")
+        self.key = SyncState.make_key(
+            "123", ReportName.APP_SESSIONS_STANDARD, Granularity.DAILY, "ONGOING"
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_make_key(self):
+        assert self.key == "123|APP_SESSIONS_STANDARD|DAILY|ONGOING"
+
+    def test_missing_entry(self):
+        state = SyncState(self.path)
+        assert state.get(self.key) == {"last_processing_date": None, "instance_ids": []}
+
+    def test_update_save_and_reload(self):
+        state = SyncState(self.path)
+        state.update(self.key, "2025-07-27", ["b", "a", "a"])
+        state.save()
+
+        reloaded = SyncState(self.path)
+        assert reloaded.get(self.key) == {"last_processing_date": "2025-07-27", "instance_ids": ["a", "b"]}
+        assert not os.path.exists(f"{self.path}.tmp")
+
+    def test_reset(self):
+        state = SyncState(self.path)
+        state.update(self.key, "2025-07-27", ["a"])
+        state.update("other", "2025-07-26", ["b"])
+        state.reset(self.key)
+        assert state.get(self.key)["last_processing_date"] is None
+        assert state.get("other")["last_processing_date"] == "2025-07-26"
+        state.reset()
+        assert state.get("other")["last_processing_date"] is None
@@ -0,0 +1,165 @@
+import unittest
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import requests
+from helpers import APP_ID, ISSUER_ID, KEY_ID, PRIVATE_KEY, REPORT_NAME, SEGMENT, FakeTransport
+from surquest.utils.appstoreconnect.credentials import Credentials
+from surquest.utils.appstoreconnect.analyticsreports.client import Client
+from surquest.utils.appstoreconnect.analyticsreports.connection import ConnectionSettings
+from surquest.utils.appstoreconnect.analyticsreports.rate_limit import RateLimiter
+from surquest.utils.appstoreconnect.analyticsreports.transport import (
+    HttpxTransport,
+    RequestsTransport,
+    Transport,
+    TransportResponse,
+    httpx,
+)
+
+
+class TestTransport(unittest.TestCase):
+
+    def setUp(self):
+        self.credentials = Credentials(issuer_id=ISSUER_ID, key_id=KEY_ID, private_key=PRIVATE_KEY)
+        self.transport = FakeTransport()
+        self.client = Client(
+            self.credentials,
+            transport=self.transport,
+            rate_limiter=RateLimiter(hourly_limit=3_600_000, burst=100),
+        )
+
+    def test_client_runs_offline_on_a_fake_transport(self):
+        data = self.client.get_data(APP_ID, REPORT_NAME)
+        assert data == [
+            {"date": "2025-07-26", "app_name": "App", "counts": 1},
+            {"date": "2025-07-27", "app_name": "App", "counts": 2},
+        ]
+        downloads = [auth for path, auth in self.transport.calls if path == "/segment-0.gz"]
+        api_calls = [auth for path, auth in self.transport.calls if path.startswith("/v1/")]
+        assert downloads == [None]
+        assert len(api_calls) == 4 and all(auth.startswith("Bearer ") for auth in api_calls)
+
+    def test_base_url_points_the_client_to_another_host(self):
+        client = Client(self.credentials, transport=self.transport, base_url="http://localhost:8080/v1/")
+        client.read_report_requests(APP_ID)
+        assert client.base_url == "http://localhost:8080/v1"
+        assert self.transport.calls[-1][0] == f"/v1/apps/{APP_ID}/analyticsReportRequests"
+
+    def test_fake_transport_serves_both_hosts(self):
+        # Transport.derive shares an offline fake, which is closed once
+        assert self.client.download_session is self.transport
+        self.client.close()
+        assert self.transport.closed
+
+    def test_transport_requires_get_and_post(self):
+        class GetOnly(Transport):
+            def get(self, url, **kwargs):
+                return TransportResponse(url=url)
+
+        with self.assertRaises(TypeError):
+            GetOnly()
+
+    def test_requests_transport_derives_a_download_session(self):
+        transport = RequestsTransport(ConnectionSettings.for_api(4))
+        client = Client(self.credentials, max_workers=16, transport=transport)
+        assert client.session is transport
+        assert isinstance(client.download_session, RequestsTransport)
+        assert client.download_session is not transport
+        assert client.download_session.get_adapter("https://example.com")._pool_maxsize == 16
+
+    def test_default_transport_is_a_requests_session(self):
+        client = Client(self.credentials)
+        assert isinstance(client.session, RequestsTransport)
+        assert isinstance(client.session, requests.Session)
+        assert client.session is not client.download_session
+
+    def test_response_raises_requests_errors(self):
+        response = TransportResponse(503, url="https://api.example")
+        with self.assertRaises(requests.exceptions.HTTPError) as raised:
+            response.raise_for_status()
+        assert raised.exception.response is response
+        assert list(TransportResponse(content=b"abcde").iter_content(2)) == [b"ab", b"cd", b"e"]
+
+
+class SegmentHandler(BaseHTTPRequestHandler):
+    """Answers JSON, gzip bodies and one transient 503 per path."""
+
+    failed = set()
+
+    def do_GET(self):
+        if self.path == "/flaky" and self.path not in self.failed:
+            self.failed.add(self.path)
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = SEGMENT if self.path == "/segment.gz" else json.dumps({"path": self.path}).encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@unittest.skipIf(httpx is None, "httpx is not installed")
+class TestHttpxTransport(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), SegmentHandler)
+        cls.url = f"http://127.0.0.1:{cls.server.server_port}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.transport = HttpxTransport(ConnectionSettings(retries=2, backoff_factor=0))
+
+    def tearDown(self):
+        self.transport.close()
+
+    def test_get_json_and_stream(self):
+        response = self.transport.get(f"{self.url}/v1/apps", params={"limit": 200}, timeout=(5, 5))
+        assert response.json() == {"path": "/v1/apps?limit=200"}
+        with self.transport.get(f"{self.url}/segment.gz", stream=True) as response:
+            assert b"".join(response.iter_content(4)) == SEGMENT
+
+    def test_retries_transient_statuses(self):
+        response = self.transport.get(f"{self.url}/flaky")
+        assert response.status_code == 200
+
+    def test_connection_errors_are_requests_errors(self):
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            HttpxTransport(ConnectionSettings(retries=0)).get("http://127.0.0.1:1/unreachable")
+
+    def test_defaults_leave_429_to_the_rate_limiter(self):
+        transport = HttpxTransport()
+        assert 429 not in transport.settings.status_forcelist
+        transport.close()
+
+    def test_api_transport_gets_a_separate_download_transport(self):
+        client = Client(
+            Credentials(issuer_id=ISSUER_ID, key_id=KEY_ID, private_key=PRIVATE_KEY),
+            max_workers=16,
+            transport=self.transport,
+        )
+        download = client.download_session
+        assert isinstance(download, HttpxTransport) and download is not self.transport
+        assert download.settings is client.download_settings
+        assert download.settings.read_timeout == ConnectionSettings.for_downloads().read_timeout
+        assert download.settings.pool_size == 16
+        client.close()
+        assert download.client.is_closed
+
+    def test_streamed_segments_parse_through_the_client(self):
+        client = Client(
+            Credentials(issuer_id=ISSUER_ID, key_id=KEY_ID, private_key=PRIVATE_KEY),
+            download_transport=self.transport,
+        )
+        rows = list(client.iter_report_rows(f"{self.url}/segment.gz"))
+        assert rows[-1] == {"date": "2025-07-27", "app_name": "App", "counts": "2"}
@@ -0,0 +1,223 @@
+import unittest
+import tempfile
+import shutil
+import os
+import csv
+import gzip
+import json
+from surquest.utils.appstoreconnect.analyticsreports.handler import Handler
+from surquest.utils.appstoreconnect.analyticsreports.rows import Header, Row
+from surquest.utils.appstoreconnect.analyticsreports.writers import CsvWriter, JsonlWriter, ParquetWriter, RowFileWriter
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+@unittest.skipIf(pa is None, "pyarrow is not installed")
+class TestParquetWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.temp_dir, "out", "report.parquet")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_streamed_rows_get_typed_columns_and_row_groups(self):
+        rows = (
+            {"date": "2025-07-27", "territory": "US", "counts": str(n), "ratio": f"{n}.5", "empty": ""}
+            for n in range(10)
+        )
+        with ParquetWriter(self.file_path, row_group_size=4) as writer:
+            assert writer.write_rows(rows) == 10
+
+        parquet_file = pq.ParquetFile(self.file_path)
+        assert parquet_file.metadata.num_row_groups == 3
+        assert parquet_file.metadata.row_group(0).column(0).compression == "ZSTD"
+        schema = parquet_file.schema_arrow
+        assert schema.field("date").type == pa.string()
+        assert schema.field("counts").type == pa.int64()
+        assert schema.field("ratio").type == pa.float64()
+        assert schema.field("empty").type == pa.string()
+
+        table = parquet_file.read()
+        assert table.column("counts").to_pylist() == list(range(10))
+        assert table.column("empty").null_count == 10
+
+    def test_dictionary_columns_are_categorical(self):
+        rows = [{"territory": ["US", "GB"][n % 2], "counts": str(n)} for n in range(10)]
+        with ParquetWriter(self.file_path, row_group_size=4, dictionary_columns=["territory"]) as writer:
+            writer.write_rows(rows)
+
+        table = pq.read_table(self.file_path)
+        assert pa.types.is_dictionary(table.schema.field("territory").type)
+        assert table.column("territory").to_pylist() == [["US", "GB"][n % 2] for n in range(10)]
+        assert table.column("counts").to_pylist() == list(range(10))
+
+    def test_list_of_dicts_to_parquet_accepts_get_data_output(self):
+        data = [
+            {"date": "2025-07-27", "counts": 1, "app_version": "1.0.1"},
+            {"date": "2025-07-28", "counts": 2, "app_version": 2.1},
+        ]
+        assert Handler.list_of_dicts_to_parquet(data, self.file_path, compression="snappy") == 2
+        table = pq.read_table(self.file_path)
+        assert table.column("app_version").to_pylist() == ["1.0.1", "2.1"]
+
+    def test_input_rows_are_left_unchanged(self):
+        header = Header(["Date", "Counts"])
+        rows = [
+            {"date": "2025-07-27", "counts": "1"},
+            {"date": "2025-07-28", "counts": "", "extra": "x"},
+            Row(header, ("2025-07-29", "3")),
+        ]
+        snapshot = [dict(row) for row in rows]
+        with ParquetWriter(self.file_path) as writer:
+            writer.write_rows(rows)
+
+        assert [dict(row) for row in rows] == snapshot
+        table = pq.read_table(self.file_path)
+        assert table.column("counts").to_pylist() == [1, None, 3]
+        assert table.column("extra").to_pylist() == [None, "x", None]
+
+    def test_explicit_schema(self):
+        rows = [{"date": "2025-07-27", "counts": None}, {"date": "2025-07-28", "counts": "3"}]
+        Handler.list_of_dicts_to_parquet(
+            rows, self.file_path, schema={"date": "string", "counts": int}, row_group_size=1
+        )
+        table = pq.read_table(self.file_path)
+        assert table.schema.field("counts").type == pa.int64()
+        assert table.column("counts").to_pylist() == [None, 3]
+
+    def test_later_row_groups_widen_inferred_types(self):
+        rows = [
+            {"territory": "US", "counts": "1", "ratio": "", "late": None},
+            {"territory": "GB", "counts": "2", "ratio": "", "late": None},
+            {"territory": "US", "counts": "2.5", "ratio": "", "late": None},
+            {"territory": "CZ", "counts": "3", "ratio": "0.5", "late": "7", "extra": "x"},
+        ]
+        with ParquetWriter(self.file_path, row_group_size=2, dictionary_columns=["territory"]) as writer:
+            writer.write_rows(rows)
+
+        parquet_file = pq.ParquetFile(self.file_path)
+        assert parquet_file.metadata.num_row_groups == 2
+        schema = parquet_file.schema_arrow
+        assert schema.field("counts").type == pa.float64()
+        assert schema.field("ratio").type == pa.float64()
+        assert schema.field("late").type == pa.int64()
+        assert schema.field("extra").type == pa.string()
+        assert pa.types.is_dictionary(schema.field("territory").type)
+        table = parquet_file.read()
+        assert table.column("counts").to_pylist() == [1.0, 2.0, 2.5, 3.0]
+        assert table.column("ratio").to_pylist() == [None, None, None, 0.5]
+        assert table.column("late").to_pylist() == [None, None, None, 7]
+        assert table.column("extra").to_pylist() == [None, None, None, "x"]
+        assert table.column("territory").to_pylist() == ["US", "GB", "US", "CZ"]
+        assert os.listdir(os.path.dirname(self.file_path)) == ["report.parquet"]
+
+    def test_explicit_schema_is_not_widened(self):
+        rows = [{"counts": "1"}, {"counts": "2.5"}]
+        with self.assertRaises(ValueError):
+            with ParquetWriter(self.file_path, schema={"counts": "int64"}, row_group_size=1) as writer:
+                writer.write_rows(rows)
+
+    def test_incompatible_later_batch_raises(self):
+        rows = [{"counts": 1}, {"counts": "not a number"}]
+        with self.assertRaises(ValueError):
+            with ParquetWriter(self.file_path, row_group_size=1) as writer:
+                writer.write_rows(rows)
+
+
+class TestRowFileWriters(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.rows = [
+            {"date": f"2025-07-2{n % 3}", "territory": "US", "counts": n}
+            for n in range(9)
+        ]
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def read_csv(self, path, opener=open):
+        with opener(path, "rt", encoding="utf-8", newline="") as f:
+            return list(csv.DictReader(f))
+
+    def test_csv_header_from_lookahead_window(self):
+        rows = [{"date": "2025-07-27"}, {"date": "2025-07-28", "counts": 2}]
+        path = os.path.join(self.temp_dir, "report.csv")
+        with CsvWriter(path) as writer:
+            assert writer.write_rows(iter(rows)) == 2
+        assert self.read_csv(path) == [
+            {"date": "2025-07-27", "counts": ""},
+            {"date": "2025-07-28", "counts": "2"},
+        ]
+
+    def test_csv_fieldnames_and_extra_keys(self):
+        path = os.path.join(self.temp_dir, "report.csv")
+        with self.assertRaises(ValueError):
+            with CsvWriter(path, fieldnames=["date"]) as writer:
+                writer.write_rows(self.rows)
+        with CsvWriter(path, fieldnames=["date"], extrasaction="ignore") as writer:
+            writer.write_rows(self.rows)
+        assert self.read_csv(path)[0] == {"date": "2025-07-20"}
+
+    def test_gzip_partitioned_jsonl_reopens_closed_partitions(self):
+        path = os.path.join(self.temp_dir, "out", "report.jsonl.gz")
+        with JsonlWriter(path, compression="gzip", partition_by="date", max_open_files=1) as writer:
+            writer.write_rows(self.rows)
+        assert sorted(os.listdir(os.path.join(self.temp_dir, "out"))) == [
+            "date=2025-07-20", "date=2025-07-21", "date=2025-07-22",
+        ]
+        partition = os.path.join(self.temp_dir, "out", "date=2025-07-21", "report.jsonl.gz")
+        with gzip.open(partition, "rt", encoding="utf-8") as f:
+            assert [json.loads(line) for line in f] == [row for row in self.rows if row["date"] == "2025-07-21"]
+
+    def test_partitioned_csv_writes_header_once_per_file(self):
+        path = os.path.join(self.temp_dir, "report.csv.gz")
+        with CsvWriter(path, compression="gzip", partition_by="date", max_open_files=1, lookahead=2) as writer:
+            writer.write_rows(self.rows)
+        rows = self.read_csv(os.path.join(self.temp_dir, "date=2025-07-22", "report.csv.gz"), gzip.open)
+        assert rows == [{"date": "2025-07-22", "territory": "US", "counts": str(n)} for n in (2, 5, 8)]
+
+    @unittest.skipIf(zstandard is None, "zstandard is not installed")
+    def test_zstd_output(self):
+        path = os.path.join(self.temp_dir, "report.jsonl.zst")
+        with JsonlWriter(path, compression="zstd") as writer:
+            writer.write_rows(self.rows)
+        with open(path, "rb") as f:
+            text = zstandard.ZstdDecompressor().stream_reader(f).read().decode("utf-8")
+        assert [json.loads(line) for line in text.splitlines()] == self.rows
+
+    def test_row_writers_must_implement_write(self):
+        path = os.path.join(self.temp_dir, "report.txt")
+        with self.assertRaises(TypeError):
+            RowFileWriter(path)
+
+        class LineWriter(RowFileWriter):
+            def _write(self, sink, row):
+                sink.write(f"{row['date']}\n")
+
+        with LineWriter(path) as writer:
+            writer.write_rows(self.rows[:2])
+        with open(path, encoding="utf-8") as f:
+            assert f.read() == "2025-07-20\n2025-07-21\n"
+
+    def test_invalid_compression(self):
+        with self.assertRaises(ValueError):
+            JsonlWriter(os.path.join(self.temp_dir, "report.jsonl"), compression="lz4")
+
+    def test_handler_csv_accepts_iterables(self):
+        path = os.path.join(self.temp_dir, "report.csv")
+        Handler.list_of_dicts_to_csv((row for row in self.rows), path)
+        assert len(self.read_csv(path)) == 9
+        with self.assertRaises(ValueError):
+            Handler.list_of_dicts_to_csv(iter([]), path)